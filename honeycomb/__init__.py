@@ -1 +1 @@
-from .engine import Engine
\ No newline at end of file
+from .engine import PASS_MOVE, Board, Engine, Move
@@ -1,8 +1,41 @@
-from .cli import EngineCLI
+import argparse
+import sys
 
+from .cli import BenchCLI, BookCLI, EngineCLI, SelfPlayCLI, TuneCLI
 
-def main():
-    EngineCLI().run()
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="honeycomb", description="UHP compliant Hive game engine."
+    )
+    parser.add_argument(
+        "--weights", default=None, help="JSON file of the evaluation weights."
+    )
+    parser.add_argument(
+        "--ponder",
+        action="store_true",
+        help="Search the expected reply on the opponent's time.",
+    )
+    parser.add_argument(
+        "--book", default=None, help="Opening book file played by bestmove."
+    )
+    commands = parser.add_subparsers(dest="command")
+    SelfPlayCLI.add_parser(commands)
+    BenchCLI.add_parser(commands)
+    TuneCLI.add_parser(commands)
+    BookCLI.add_parser(commands)
+
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "selfplay":
+        SelfPlayCLI(args).run()
+    elif args.command == "bench":
+        BenchCLI(args).run()
+    elif args.command == "tune":
+        TuneCLI(args).run()
+    elif args.command == "book":
+        BookCLI(args).run()
+    else:
+        EngineCLI(args.weights, args.ponder, args.book).run()
 
 
 if __name__ == "__main__":
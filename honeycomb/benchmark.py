@@ -0,0 +1,79 @@
+"""Fixed-position benchmark of the alpha-beta search."""
+
+from typing import Callable
+
+from honeycomb.engine.alphabeta import AlphaBetaSearch
+from honeycomb.engine.game import Game
+from honeycomb.engine.search import SearchLimits, SearchResult
+
+POSITIONS = (
+    ("opening", "Base;InProgress;White[3];wS1;bG1 -wS1;wA1 wS1/;bG2 /bG1"),
+    (
+        "early",
+        "Base;InProgress;White[6];wQ;bG1 -wQ;wG1 wQ\\;bQ \\bG1;wB1 /wG1;bA1 /bG1;"
+        "wB2 wG1-;bA2 /bQ;wA1 \\wB2;bA1 wB1\\",
+    ),
+    (
+        "middle",
+        "Base;InProgress;White[9];wG1;bS1 wG1-;wB1 -wG1;bA1 bS1-;wB2 \\wG1;"
+        "bG1 bA1\\;wQ wB2/;bQ \\bA1;wS1 -wB2;bS2 bQ/;wB1 /wG1;bG2 bG1-;"
+        "wG2 /wS1;bB1 /bA1;wB1 wG1;bA1 /bB1",
+    ),
+    (
+        "late",
+        "Base;InProgress;White[13];wS1;bQ \\wS1;wB1 /wS1;bS1 bQ/;wG1 wB1-;"
+        "bG1 bS1/;wQ /wG1;bG1 /bQ;wA1 wG1-;bS2 bS1/;wB1 -wQ;bB1 bS1-;wA1 /wB1;"
+        "bG2 -bS2;wA1 bS2/;bA1 -bG2;wS2 -wB1;bA1 wA1/;wB2 wQ-;bA2 -bG2;"
+        "wB2 wQ\\;bA3 -bA2;wA2 /wB2;bA1 /wQ",
+    ),
+)
+
+
+class BenchmarkRow:
+    """Result of one completed depth: nodes and time since the search start."""
+
+    __slots__ = "position", "result"
+
+    def __init__(self, position: str, result: SearchResult) -> None:
+        self.position = position
+        self.result = result
+
+    def __str__(self) -> str:
+        result = self.result
+        return (
+            f"{self.position:<8} depth {result.depth:>2} "
+            f"nodes {result.nodes:>9} time {result.elapsed:>7.3f}s "
+            f"nps {result.nodes_per_second:>8.0f} "
+            f"score {result.score:>7} move {result.move_str}"
+        )
+
+
+def run_benchmark(
+    depth: int,
+    pvs: bool = True,
+    aspiration: bool = True,
+    lmr: bool = True,
+    futility: bool = False,
+    positions: tuple[tuple[str, str], ...] = POSITIONS,
+    report: Callable[[BenchmarkRow], None] | None = None,
+) -> list[BenchmarkRow]:
+    """Searches every position to the depth with a new table.
+
+    Returns a row for every completed depth of every position.
+    """
+    rows = []
+    for name, gamestring in positions:
+        game = Game()
+        game.load_game(gamestring)
+        search = AlphaBetaSearch(
+            pvs=pvs, aspiration=aspiration, lmr=lmr, futility=futility
+        )
+
+        def add_row(result: SearchResult) -> None:
+            row = BenchmarkRow(name, result)
+            rows.append(row)
+            if report is not None:
+                report(row)
+
+        search.search(game, SearchLimits(depth=depth), on_iteration=add_row)
+    return rows
@@ -1,9 +1,28 @@
-from honeycomb.engine import Engine
+import argparse
+import sys
+import time
+
+from honeycomb import benchmark, records, selfplay
+from honeycomb.engine import Engine, book, staticeval
+from honeycomb.engine.search import SearchLimits
 
 
 class EngineCLI:
-    def __init__(self) -> None:
-        self.engine = Engine()
+    def __init__(
+        self,
+        weights_path: str | None = None,
+        ponder: bool = False,
+        book_path: str | None = None,
+    ) -> None:
+        weights = None
+        if weights_path is not None:
+            weights = staticeval.load_weights(weights_path)
+        opening_book = None
+        if book_path is not None:
+            opening_book = book.OpeningBook(book_path)
+        self.engine = Engine(weights, output=self._print_progress, book=opening_book)
+        if ponder:
+            self.engine.execute("options set Ponder True")
 
     def run(self) -> None:
         command = "info"
@@ -17,3 +36,228 @@ class EngineCLI:
     def stop(self) -> None:
         print("Engine stopped.")
         raise SystemExit
+
+    def _print_progress(self, line: str) -> None:
+        print(line, flush=True)
+
+
+class SelfPlayCLI:
+    """Runs `honeycomb selfplay` printing the progress to stderr."""
+
+    _report_interval = 1.0
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self._last_report = 0.0
+
+    @classmethod
+    def add_parser(cls, commands: argparse._SubParsersAction) -> None:
+        parser = commands.add_parser(
+            "selfplay", help="Generate games with the engine playing itself."
+        )
+        parser.add_argument("output", help="Directory of the output shards.")
+        parser.add_argument(
+            "-n", "--games", type=int, default=100, help="Games per worker."
+        )
+        parser.add_argument(
+            "-w", "--workers", type=int, default=None, help="Default: CPU count."
+        )
+        parser.add_argument("--policy", choices=selfplay.POLICIES, default="random")
+        parser.add_argument("--depth", type=int, default=None, help="Search depth.")
+        parser.add_argument(
+            "--time", type=float, default=None, help="Search time per move [s]."
+        )
+        parser.add_argument("--gametype", default="Base")
+        parser.add_argument("--max-turns", type=int, default=100)
+        parser.add_argument("--format", choices=selfplay.FORMATS, default="text")
+        parser.add_argument("--seed", type=int, default=None)
+
+    def run(self) -> None:
+        args = self.args
+        limits = None
+        if args.depth is not None or args.time is not None:
+            limits = SearchLimits(depth=args.depth, time=args.time)
+
+        stats = selfplay.selfplay(
+            args.output,
+            args.games,
+            workers=args.workers,
+            policy=args.policy,
+            limits=limits,
+            gametype=args.gametype,
+            max_turns=args.max_turns,
+            fmt=args.format,
+            seed=args.seed,
+            report=self._report,
+        )
+        print(
+            f"{stats.games} games, {stats.moves} moves in {stats.elapsed:.1f}s "
+            f"({stats.games_per_second:.2f} games/s)",
+            file=sys.stderr,
+        )
+
+    def _report(self, finished: int, total: int, elapsed: float) -> None:
+        if elapsed - self._last_report < self._report_interval and finished < total:
+            return
+        self._last_report = elapsed
+        print(
+            f"{finished}/{total} games, {finished / elapsed:.2f} games/s",
+            file=sys.stderr,
+        )
+
+
+class BenchCLI:
+    """Runs `honeycomb bench` printing a row for every searched depth."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+
+    @classmethod
+    def add_parser(cls, commands: argparse._SubParsersAction) -> None:
+        parser = commands.add_parser(
+            "bench", help="Search fixed positions and report nodes and times."
+        )
+        parser.add_argument("-d", "--depth", type=int, default=4)
+        for feature, default in (
+            ("pvs", True),
+            ("aspiration", True),
+            ("lmr", True),
+            ("futility", False),
+        ):
+            parser.add_argument(
+                f"--{feature}",
+                action=argparse.BooleanOptionalAction,
+                default=default,
+            )
+
+    def run(self) -> None:
+        args = self.args
+        rows = benchmark.run_benchmark(
+            args.depth,
+            pvs=args.pvs,
+            aspiration=args.aspiration,
+            lmr=args.lmr,
+            futility=args.futility,
+            report=print,
+        )
+        nodes = sum(row.result.nodes for row in rows if row.result.depth == args.depth)
+        elapsed = sum(
+            row.result.elapsed for row in rows if row.result.depth == args.depth
+        )
+        print(f"total nodes {nodes} time {elapsed:.3f}s")
+
+
+class TuneCLI:
+    """Runs `honeycomb tune` printing the progress to stderr."""
+
+    _report_interval = 1.0
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self._last_report = 0.0
+        self._start = 0.0
+
+    @classmethod
+    def add_parser(cls, commands: argparse._SubParsersAction) -> None:
+        parser = commands.add_parser(
+            "tune", help="Fit the evaluation weights to the results of games."
+        )
+        parser.add_argument(
+            "corpus", nargs="+", help="Record files or files of GameStrings."
+        )
+        parser.add_argument("-o", "--output", default="weights.json")
+        parser.add_argument(
+            "--initial", default=None, help="Weights file to start from."
+        )
+        parser.add_argument(
+            "--sample", type=float, default=0.25, help="Share of positions used."
+        )
+        parser.add_argument("--skip-plies", type=int, default=8)
+        parser.add_argument("--epochs", type=int, default=500)
+        parser.add_argument("--learning-rate", type=float, default=1.0)
+        parser.add_argument("--l2", type=float, default=0.0)
+        parser.add_argument(
+            "-w", "--workers", type=int, default=None, help="Default: CPU count."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--unique",
+            action="store_true",
+            help="Merge the symmetric positions, averaging their results.",
+        )
+
+    def run(self) -> None:
+        from honeycomb import tune
+
+        args = self.args
+        initial = None
+        if args.initial is not None:
+            initial = staticeval.load_weights(args.initial)
+
+        self._start = time.perf_counter()
+        result = tune.tune(
+            args.corpus,
+            args.output,
+            initial=initial,
+            sample=args.sample,
+            skip_plies=args.skip_plies,
+            epochs=args.epochs,
+            learning_rate=args.learning_rate,
+            l2=args.l2,
+            workers=args.workers,
+            seed=args.seed,
+            report=self._report,
+            unique=args.unique,
+        )
+        print(
+            f"{result.positions} positions, scale {result.scale:.1f}, "
+            f"loss {result.initial_loss:.4f} -> {result.loss:.4f}",
+            file=sys.stderr,
+        )
+        for name, weight in result.weights.items():
+            print(f"{name} {weight}")
+
+    def _report(self, games: int, positions: int) -> None:
+        elapsed = time.perf_counter() - self._start
+        if elapsed - self._last_report < self._report_interval:
+            return
+        self._last_report = elapsed
+        print(
+            f"{games} games, {positions} positions, {positions / elapsed:.0f}/s",
+            file=sys.stderr,
+        )
+
+
+class BookCLI:
+    """Runs `honeycomb book` printing the number of written entries."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+
+    @classmethod
+    def add_parser(cls, commands: argparse._SubParsersAction) -> None:
+        parser = commands.add_parser(
+            "book", help="Build an opening book from the moves of finished games."
+        )
+        parser.add_argument(
+            "corpus", nargs="+", help="Record files or files of GameStrings."
+        )
+        parser.add_argument("-o", "--output", default="book.hcb")
+        parser.add_argument("--gametype", default="Base")
+        parser.add_argument(
+            "--plies", type=int, default=book.DEFAULT_MAX_PLIES, help="Moves per game."
+        )
+        parser.add_argument("--min-games", type=int, default=1)
+
+    def run(self) -> None:
+        args = self.args
+        start = time.perf_counter()
+        entries = book.build_book(
+            records.read_corpus(args.corpus),
+            args.output,
+            gametype=args.gametype,
+            max_plies=args.plies,
+            min_games=args.min_games,
+        )
+        elapsed = time.perf_counter() - start
+        print(f"{entries} book moves written to {args.output} in {elapsed:.1f}s")
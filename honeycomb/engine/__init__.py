@@ -1 +1,3 @@
+from .board import Board
 from .engine import Engine
+from .logic import PASS_MOVE, Move
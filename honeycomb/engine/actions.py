@@ -0,0 +1,78 @@
+import functools
+
+import numpy as np
+
+from honeycomb.engine import hive as h
+from honeycomb.engine import logic, notation, planes
+from honeycomb.engine.game import Game
+
+
+class ActionSpace:
+    """Fixed index space of the moves for learning.
+
+    An action is a piece id and a destination cell of the size x size grid
+    of `planes`, centred on the hive, or the pass: index
+    `piece_id * size * size + row * size + col`, with the pass last. Moves
+    to cells outside of the grid have no action.
+    """
+
+    __slots__ = "_cells", "_half", "pass_action", "size"
+
+    def __init__(self, size: int = planes.DEFAULT_SIZE) -> None:
+        self._cells = size * size
+        self._half = size // 2
+        self.pass_action = len(notation.PIECES_STR) * self._cells
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.pass_action + 1
+
+    def index(self, move: logic.Move, center: tuple[int, int]) -> int | None:
+        """Returns the action of the move, None if it is outside of the grid.
+
+        `center` is the axial center of the hive, see `planes.hive_center`.
+        """
+        if move.piece_str is None:
+            return self.pass_action
+        assert move.destination is not None
+        q, r = h.axial(move.destination)
+        row = r - center[1] + self._half
+        col = q - center[0] + self._half
+        if 0 <= row < self.size and 0 <= col < self.size:
+            piece_id = notation.PieceString.id(move.piece_str)
+            return piece_id * self._cells + row * self.size + col
+        return None
+
+    def move(self, action: int, center: tuple[int, int]) -> logic.Move:
+        if action == self.pass_action:
+            return logic.PASS_MOVE
+        piece_id, cell = divmod(action, self._cells)
+        row, col = divmod(cell, self.size)
+        q = col - self._half + center[0]
+        r = row - self._half + center[1]
+        return logic.Move(notation.PieceString.from_id(piece_id), h.offset((q, r)))
+
+    def legal_mask(self, game: Game, out: np.ndarray | None = None) -> np.ndarray:
+        """Returns the bool mask of the legal actions, written into `out` if given."""
+        if out is None:
+            out = np.zeros(len(self), dtype=bool)
+        else:
+            out.fill(False)
+        center = planes.hive_center(game.hive)
+        for move in game.iter_moves():
+            action = self.index(move, center)
+            if action is not None:
+                out[action] = True
+        return out
+
+    def play(self, game: Game, action: int, validate: bool = True) -> logic.Move:
+        """Plays the move of the action and returns it."""
+        move = self.move(action, planes.hive_center(game.hive))
+        game.push(move, validate)
+        return move
+
+
+@functools.cache
+def action_space(size: int = planes.DEFAULT_SIZE) -> ActionSpace:
+    """Returns the action space of the size shared by all the games."""
+    return ActionSpace(size)
@@ -0,0 +1,491 @@
+import random
+import time
+from threading import Event
+
+from honeycomb.engine import logic, notation
+from honeycomb.engine.game import Game, GameTerminatedError
+from honeycomb.engine.ordering import (
+    MoveOrderer,
+    is_tactical,
+    opponent_bee_neighbours,
+)
+from honeycomb.engine.search import (
+    ProgressCallback,
+    SearchLimits,
+    SearchResult,
+    line_str,
+)
+from honeycomb.engine.staticeval import StaticEvaluator
+from honeycomb.engine.transposition import (
+    Bound,
+    SharedTranspositionTable,
+    TranspositionTable,
+)
+
+MATE_SCORE = 100000
+MAX_DEPTH = 64
+_MATE_BOUND = MATE_SCORE - 1000
+_TIME_CHECK_NODES = 256
+ASPIRATION_WINDOW = 50
+FUTILITY_MARGIN = 100
+LMR_MIN_DEPTH = 3
+LMR_FULL_MOVES = 3
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search to unwind it when the time is up or it was stopped."""
+
+
+class AlphaBetaSearch:
+    """Iterative deepening negamax search with alpha-beta pruning.
+
+    The transposition table can be shared with other searches, and the move
+    ordering can be perturbed with a random generator so that parallel
+    searchers explore the tree differently.
+
+    The selectivity can be switched on and off: principal variation search
+    (null windows after the first move), aspiration windows around the
+    previous score at the root, late move reductions of quiet moves and
+    futility pruning of quiet moves at the last ply. The leaves are scored
+    by the static evaluator.
+    """
+
+    __slots__ = (
+        "_deadline",
+        "_next_report",
+        "_nodes",
+        "_on_iteration",
+        "_progress_interval",
+        "_result",
+        "_rng",
+        "_start",
+        "_stop",
+        "_tt_hits",
+        "_tt_probes",
+        "aspiration",
+        "evaluator",
+        "futility",
+        "lmr",
+        "ordering",
+        "pvs",
+        "tt",
+    )
+
+    def __init__(
+        self,
+        tt: TranspositionTable | SharedTranspositionTable | None = None,
+        rng: random.Random | None = None,
+        ordering: MoveOrderer | None = None,
+        pvs: bool = True,
+        aspiration: bool = True,
+        lmr: bool = True,
+        futility: bool = False,
+        evaluator: StaticEvaluator | None = None,
+    ) -> None:
+        self.aspiration = aspiration
+        self.evaluator = evaluator if evaluator is not None else StaticEvaluator()
+        self.futility = futility
+        self.lmr = lmr
+        self.pvs = pvs
+        self.ordering = ordering if ordering is not None else MoveOrderer()
+        self.tt = tt if tt is not None else TranspositionTable()
+        self._rng = rng
+        self._deadline: float | None = None
+        self._next_report: float | None = None
+        self._nodes = 0
+        self._on_iteration: ProgressCallback | None = None
+        self._progress_interval: float | None = None
+        self._result: SearchResult | None = None
+        self._start = 0.0
+        self._stop: Event | None = None
+        self._tt_hits = 0
+        self._tt_probes = 0
+
+    def configure(self, pvs: bool, aspiration: bool, lmr: bool, futility: bool) -> None:
+        self.pvs = pvs
+        self.aspiration = aspiration
+        self.lmr = lmr
+        self.futility = futility
+
+    def search(
+        self,
+        game: Game,
+        limits: SearchLimits,
+        start_depth: int = 1,
+        stop: Event | None = None,
+        on_iteration: ProgressCallback | None = None,
+        progress_interval: float | None = None,
+    ) -> SearchResult:
+        """Searches deeper until a limit is reached and returns the deepest result.
+
+        `on_iteration` is called with the result of every completed depth and,
+        with a `progress_interval`, every that many seconds with the last one
+        updated with the nodes searched so far.
+
+        Raises:
+            GameTerminatedError: If the game is over.
+        """
+        if game.is_over:
+            raise GameTerminatedError
+        start = self._begin(limits, stop, on_iteration, progress_interval)
+        max_depth = min(limits.depth or MAX_DEPTH, MAX_DEPTH)
+        moves = game.legal_moves()
+        result = SearchResult(move=moves[0], move_str=game.move_str(moves[0]))
+        self._result = result
+
+        score = None
+        for depth in range(min(start_depth, max_depth), max_depth + 1):
+            try:
+                score, move = self._search_root(game, moves, depth, score)
+            except SearchTimeout:
+                break
+            now = time.perf_counter()
+            result = self._progress(now - start)
+            result.move = move
+            result.move_str = game.move_str(move)
+            result.score = score
+            result.depth = depth
+            line = principal_variation(self.tt, game, depth)
+            if not line or line[0] != move:
+                line = [move]
+            result.pv = line_str(game, line)
+            self._result = result
+            if on_iteration is not None:
+                on_iteration(result)
+                self._schedule_report(now)
+            if len(moves) == 1 or abs(score) >= _MATE_BOUND:
+                break
+
+        result.nodes = self._nodes
+        result.elapsed = time.perf_counter() - start
+        result.tt_hits = self._tt_hits
+        result.tt_probes = self._tt_probes
+        return result
+
+    def analyze(
+        self,
+        game: Game,
+        limits: SearchLimits,
+        count: int,
+        stop: Event | None = None,
+        on_iteration: ProgressCallback | None = None,
+        progress_interval: float | None = None,
+    ) -> list[SearchResult]:
+        """Searches deeper until a limit is reached and returns the `count` best moves.
+
+        Every depth searches the root moves once per candidate with a full
+        window, leaving out the moves ranked before, so the later candidates
+        are searched from the table the first ones filled. The best candidate
+        is reported to `on_iteration` as in `search`.
+
+        Raises:
+            GameTerminatedError: If the game is over.
+        """
+        if game.is_over:
+            raise GameTerminatedError
+        start = self._begin(limits, stop, on_iteration, progress_interval)
+        max_depth = min(limits.depth or MAX_DEPTH, MAX_DEPTH)
+        entry = self.tt.probe(game.hash)
+        tt_move_code = entry[3] if entry is not None else logic.PASS_MOVE_CODE
+        moves = self._ordered_moves(game, game.legal_moves(), tt_move_code, 0)
+        count = min(count, len(moves))
+        results = [SearchResult(move=m, move_str=game.move_str(m)) for m in moves]
+        self._result = results[0]
+
+        for depth in range(1, max_depth + 1):
+            try:
+                ranked = self._rank_root(game, moves, depth, count)
+            except SearchTimeout:
+                break
+            elapsed = time.perf_counter() - start
+            results = []
+            for score, move in ranked:
+                result = self._progress(elapsed)
+                result.move = move
+                result.move_str = game.move_str(move)
+                result.score = score
+                result.depth = depth
+                game.push(move, validate=False)
+                line = principal_variation(self.tt, game, depth - 1)
+                game.undo(1)
+                result.pv = line_str(game, [move, *line])
+                results.append(result)
+            self._result = results[0]
+            # The next depth searches the candidates in their ranking first.
+            ranked_moves = [move for _, move in ranked]
+            moves = ranked_moves + [m for m in moves if m not in ranked_moves]
+            if on_iteration is not None:
+                on_iteration(results[0])
+                self._schedule_report(time.perf_counter())
+            if all(abs(score) >= _MATE_BOUND for score, _ in ranked):
+                break
+
+        elapsed = time.perf_counter() - start
+        for result in results[:count]:
+            result.nodes = self._nodes
+            result.elapsed = elapsed
+            result.tt_hits = self._tt_hits
+            result.tt_probes = self._tt_probes
+        return results[:count]
+
+    def _begin(
+        self,
+        limits: SearchLimits,
+        stop: Event | None,
+        on_iteration: ProgressCallback | None,
+        progress_interval: float | None,
+    ) -> float:
+        """Resets the search state and returns the start time."""
+        start = time.perf_counter()
+        self._start = start
+        self._deadline = limits.deadline(start)
+        self._stop = stop
+        self._nodes = 0
+        self._tt_hits = 0
+        self._tt_probes = 0
+        self._on_iteration = on_iteration
+        self._progress_interval = progress_interval or None
+        self._schedule_report(start)
+        self.ordering.age()
+        return start
+
+    def _negamax(self, game: Game, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self._count_node()
+
+        if game.is_over:
+            return _terminal_score(game, ply)
+        if depth <= 0:
+            return self.evaluator.evaluate(game)
+
+        key = game.hash
+        alpha_orig = alpha
+        tt_move_code = logic.PASS_MOVE_CODE
+        entry = self.tt.probe(key)
+        self._tt_probes += 1
+        if entry is not None:
+            self._tt_hits += 1
+            tt_depth, tt_score, bound, tt_move_code = entry
+            if tt_depth >= depth:
+                tt_score = _score_from_tt(tt_score, ply)
+                if bound == Bound.EXACT:
+                    return tt_score
+                if bound == Bound.LOWER and tt_score >= beta:
+                    return tt_score
+                if bound == Bound.UPPER and tt_score <= alpha:
+                    return tt_score
+
+        moves = self._ordered_moves(game, game.legal_moves(), tt_move_code, ply)
+        best_score, best_move = self._search_moves(game, moves, depth, alpha, beta, ply)
+
+        if best_score <= alpha_orig:
+            bound = Bound.UPPER
+        elif best_score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.tt.store(
+            key,
+            depth,
+            _score_to_tt(best_score, ply),
+            bound,
+            logic.encode_move(best_move),
+        )
+        return best_score
+
+    def _ordered_moves(
+        self, game: Game, moves: list[logic.Move], tt_move_code: int, ply: int
+    ) -> list[logic.Move]:
+        if self._rng is not None:
+            self._rng.shuffle(moves)
+        hash_move = None
+        if tt_move_code != logic.PASS_MOVE_CODE:
+            hash_move = logic.decode_move(tt_move_code)
+        return self.ordering.order(game, moves, ply, hash_move)
+
+    def _search_moves(
+        self,
+        game: Game,
+        moves: list[logic.Move],
+        depth: int,
+        alpha: int,
+        beta: int,
+        ply: int,
+    ) -> tuple[int, logic.Move]:
+        """Searches the ordered moves and returns the best score and move."""
+        futile = (
+            self.futility
+            and depth == 1
+            and self.evaluator.evaluate(game) + FUTILITY_MARGIN <= alpha
+        )
+        selective = self.lmr or futile
+        bee_neighbours = opponent_bee_neighbours(game) if selective else ()
+        best_score = -MATE_SCORE
+        best_move = moves[0]
+        for i, move in enumerate(moves):
+            quiet = selective and i > 0 and not is_tactical(game, move, bee_neighbours)
+            if futile and quiet:
+                continue
+            reduction = int(
+                self.lmr and quiet and depth >= LMR_MIN_DEPTH and i >= LMR_FULL_MOVES
+            )
+
+            game.push(move, validate=False)
+            try:
+                if i == 0 or not (self.pvs or reduction):
+                    score = -self._negamax(game, depth - 1, -beta, -alpha, ply + 1)
+                else:
+                    window = alpha + 1 if self.pvs else beta
+                    score = -self._negamax(
+                        game, depth - 1 - reduction, -window, -alpha, ply + 1
+                    )
+                    if score > alpha and (reduction or score < beta):
+                        score = -self._negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game.undo(1)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self.ordering.cutoff(move, depth, ply)
+                break
+        return best_score, best_move
+
+    def _search_root(
+        self,
+        game: Game,
+        moves: list[logic.Move],
+        depth: int,
+        previous_score: int | None,
+    ) -> tuple[int, logic.Move]:
+        entry = self.tt.probe(game.hash)
+        tt_move_code = entry[3] if entry is not None else logic.PASS_MOVE_CODE
+        moves = self._ordered_moves(game, list(moves), tt_move_code, 0)
+
+        alpha, beta = -MATE_SCORE, MATE_SCORE
+        if (
+            self.aspiration
+            and previous_score is not None
+            and abs(previous_score) < _MATE_BOUND
+        ):
+            alpha = previous_score - ASPIRATION_WINDOW
+            beta = previous_score + ASPIRATION_WINDOW
+
+        while True:
+            score, move = self._search_moves(game, moves, depth, alpha, beta, 0)
+            if score <= alpha and alpha > -MATE_SCORE:
+                alpha = -MATE_SCORE
+            elif score >= beta and beta < MATE_SCORE:
+                beta = MATE_SCORE
+            else:
+                break
+            # The best move of the failed search is tried first again.
+            moves.remove(move)
+            moves.insert(0, move)
+
+        self.tt.store(game.hash, depth, score, Bound.EXACT, logic.encode_move(move))
+        return score, move
+
+    def _rank_root(
+        self, game: Game, moves: list[logic.Move], depth: int, count: int
+    ) -> list[tuple[int, logic.Move]]:
+        """Returns the scores and moves of the `count` best root moves, best first."""
+        ranked = []
+        remaining = list(moves)
+        for _ in range(count):
+            score, move = self._search_moves(
+                game, remaining, depth, -MATE_SCORE, MATE_SCORE, 0
+            )
+            ranked.append((score, move))
+            remaining.remove(move)
+        # Reductions can score a later candidate above an earlier one.
+        ranked.sort(key=lambda candidate: -candidate[0])
+
+        score, move = ranked[0]
+        self.tt.store(game.hash, depth, score, Bound.EXACT, logic.encode_move(move))
+        return ranked
+
+    def _count_node(self) -> None:
+        self._nodes += 1
+        if self._nodes % _TIME_CHECK_NODES == 0:
+            now = time.perf_counter()
+            if self._deadline is not None and now >= self._deadline:
+                raise SearchTimeout
+            if self._stop is not None and self._stop.is_set():
+                raise SearchTimeout
+            if self._next_report is not None and now >= self._next_report:
+                self._on_iteration(self._progress(now - self._start))  # type: ignore
+                self._schedule_report(now)
+
+    def _progress(self, elapsed: float) -> SearchResult:
+        """Returns a copy of the last result with the current statistics."""
+        last = self._result
+        assert last is not None
+        return SearchResult(
+            move=last.move,
+            move_str=last.move_str,
+            score=last.score,
+            depth=last.depth,
+            nodes=self._nodes,
+            elapsed=elapsed,
+            pv=last.pv,
+            tt_hits=self._tt_hits,
+            tt_probes=self._tt_probes,
+        )
+
+    def _schedule_report(self, now: float) -> None:
+        if self._on_iteration is None or self._progress_interval is None:
+            self._next_report = None
+        else:
+            self._next_report = now + self._progress_interval
+
+
+def principal_variation(
+    tt: TranspositionTable | SharedTranspositionTable, game: Game, length: int
+) -> list[logic.Move]:
+    """Follows the best moves stored in the table from the position."""
+    line: list[logic.Move] = []
+    seen = set()
+    while len(line) < length and not game.is_over and game.hash not in seen:
+        seen.add(game.hash)
+        entry = tt.probe(game.hash)
+        if entry is None or entry[3] == logic.PASS_MOVE_CODE:
+            break
+        move = logic.decode_move(entry[3])
+        if move not in game.legal_moves():
+            break
+        line.append(move)
+        game.push(move, validate=False)
+    game.undo(len(line))
+    return line
+
+
+def _score_from_tt(score: int, ply: int) -> int:
+    if score >= _MATE_BOUND:
+        return score - ply
+    if score <= -_MATE_BOUND:
+        return score + ply
+    return score
+
+
+def _score_to_tt(score: int, ply: int) -> int:
+    if score >= _MATE_BOUND:
+        return score + ply
+    if score <= -_MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _terminal_score(game: Game, ply: int) -> int:
+    if game.state == notation.GameState.Draw:
+        return 0
+    winner = (
+        notation.PieceColor.WHITE
+        if game.state == notation.GameState.WhiteWins
+        else notation.PieceColor.BLACK
+    )
+    if winner == game.turn_color:
+        return MATE_SCORE - ply
+    return -(MATE_SCORE - ply)
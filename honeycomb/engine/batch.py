@@ -0,0 +1,125 @@
+from typing import Sequence
+
+import numpy as np
+
+from honeycomb.engine import notation, planes
+from honeycomb.engine.actions import action_space
+from honeycomb.engine.game import Game
+
+_WINNER = {
+    notation.GameState.WhiteWins: notation.PieceColor.WHITE,
+    notation.GameState.BlackWins: notation.PieceColor.BLACK,
+}
+
+
+class IllegalActionError(ValueError):
+    """Some actions of a step are not legal, no game was stepped."""
+
+
+class BatchGame:
+    """Many games stepped in lockstep with arrays of actions.
+
+    The observations are the planes of the positions, the masks the legal
+    actions of `ActionSpace` of the same size. A reward is given to the
+    player who made the step: 1 for a win, -1 for a loss and 0 otherwise.
+    A game that ends, or passes `max_turns` turns, is done and starts over,
+    so its observation is already the one of the new game. The arrays are
+    allocated once and overwritten by every step.
+    """
+
+    __slots__ = (
+        "_gametype",
+        "_max_turns",
+        "_space",
+        "dones",
+        "finished",
+        "games",
+        "masks",
+        "observations",
+        "rewards",
+    )
+
+    def __init__(
+        self,
+        games_num: int,
+        gametype: str = "Base",
+        size: int = planes.DEFAULT_SIZE,
+        max_turns: int | None = None,
+    ) -> None:
+        self._gametype = gametype
+        self._max_turns = max_turns
+        self._space = action_space(size)
+        self.games = [Game() for _ in range(games_num)]
+        self.observations = np.zeros(
+            (games_num, *planes.planes_shape(size)), dtype=np.float32
+        )
+        self.masks = np.zeros((games_num, len(self._space)), dtype=bool)
+        self.rewards = np.zeros(games_num, dtype=np.float32)
+        self.dones = np.zeros(games_num, dtype=bool)
+        self.finished: list[str] = []
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def reset(self) -> np.ndarray:
+        """Starts all the games over and returns the observations."""
+        for i in range(len(self.games)):
+            self._reset(i)
+        self.rewards.fill(0)
+        self.dones.fill(False)
+        return self.observations
+
+    def step(
+        self, actions: Sequence[int] | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Plays an action in every game and returns observations, rewards and dones.
+
+        The GameStrings of the games done in this step are kept in `finished`.
+
+        All the actions are checked against `masks` before any is played.
+
+        Raises:
+            ValueError: The number of actions is not the number of games.
+            IllegalActionError: An action is not legal in its game.
+        """
+        if len(actions) != len(self.games):
+            raise ValueError(f"Got {len(actions)} actions for {len(self.games)} games.")
+        actions = np.asarray(actions, dtype=np.int64)
+        legal = (actions >= 0) & (actions < self.masks.shape[1])
+        rows = np.flatnonzero(legal)
+        legal[rows] = self.masks[rows, actions[rows]]
+        if not legal.all():
+            illegal = np.flatnonzero(~legal).tolist()
+            raise IllegalActionError(f"Illegal actions in the games {illegal}.")
+
+        self.finished = []
+        for i, (game, action) in enumerate(zip(self.games, actions)):
+            color = game.turn_color
+            self._space.play(game, int(action), validate=False)
+
+            winner = _WINNER.get(game.state)
+            if winner is None:
+                self.rewards[i] = 0
+            else:
+                self.rewards[i] = 1 if winner == color else -1
+
+            done = game.is_over or (
+                self._max_turns is not None and game.turn_num > self._max_turns
+            )
+            self.dones[i] = done
+            if done:
+                self.finished.append(game.status)
+                self._reset(i)
+            else:
+                self._observe(i)
+        return self.observations, self.rewards, self.dones
+
+    def _observe(self, i: int) -> None:
+        game = self.games[i]
+        planes.encode_game(game, self.observations[i])
+        self._space.legal_mask(game, self.masks[i])
+
+    def _reset(self, i: int) -> None:
+        self.games[i].new_game(self._gametype)
+        self._observe(i)
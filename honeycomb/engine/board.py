@@ -0,0 +1,98 @@
+import random
+from typing import Generator
+
+from honeycomb.engine import notation
+from honeycomb.engine.game import Game
+from honeycomb.engine.logic import Move, MoveOrder
+
+
+class Board:
+    """Typed Python API over the Game.
+
+    Moves are passed around as `Move` tuples and UHP strings are produced only
+    when asked for with `move_str` or `game_str`.
+    """
+
+    __slots__ = "_game"
+
+    def __init__(self, game_str: str | None = None) -> None:
+        self._game = Game()
+        if game_str is not None:
+            self._game.load_game(game_str)
+
+    @property
+    def game(self) -> Game:
+        return self._game
+
+    @property
+    def game_str(self) -> str:
+        return self._game.status
+
+    @property
+    def hash(self) -> int:
+        return self._game.hash
+
+    @property
+    def is_game_over(self) -> bool:
+        return self._game.is_over
+
+    @property
+    def result(self) -> notation.GameState | None:
+        """Final game state or None if the game is still ongoing."""
+        if self.is_game_over:
+            return self._game.state
+        return None
+
+    @property
+    def state(self) -> notation.GameState:
+        return self._game.state
+
+    @property
+    def to_move(self) -> notation.PieceColor:
+        return self._game.turn_color
+
+    @property
+    def turn_num(self) -> int:
+        return self._game.turn_num
+
+    def count_moves(self) -> int:
+        """Returns the number of legal moves without building them."""
+        if self.is_game_over:
+            return 0
+        return self._game.count_moves()
+
+    def iter_moves(
+        self, order: MoveOrder = MoveOrder.BOARD_FIRST
+    ) -> Generator[Move, None, None]:
+        """Lazily yields the legal moves in the given order."""
+        if self.is_game_over:
+            return
+        yield from self._game.iter_moves(order)
+
+    def legal_moves(self) -> list[Move]:
+        """Returns the valid moves, or only the pass move if there are none."""
+        if self.is_game_over:
+            return []
+        return self._game.legal_moves()
+
+    def move_str(self, move: Move) -> str:
+        """Renders the move as a MoveString for the current position."""
+        return self._game.move_str(move)
+
+    def parse_move(self, move_str: str) -> Move:
+        return self._game.parse_move(move_str)
+
+    def pop(self) -> Move:
+        return self._game.pop()
+
+    def push(self, move: Move) -> None:
+        self._game.push(move)
+
+    def push_str(self, move_str: str) -> Move:
+        return self._game.play(move_str)
+
+    def sample_move(self, rng: random.Random) -> Move | None:
+        """Returns a uniformly drawn legal move, None if the game is over."""
+        if self.is_game_over:
+            return None
+        return self._game.sample_move(rng)
@@ -0,0 +1,210 @@
+"""Opening book of move statistics looked up by position in a mapped file.
+
+A book file starts with the magic bytes, the bitmask of the expansions of
+its games and the number of entries. The entries follow sorted by the
+position fingerprint and, within a position, by the number of games. An
+entry is the fingerprint, the `logic.encode_move` code of the move, the
+number of games the move was played in and the points the side that played
+it scored in them, 2 for a win and 1 for a draw.
+
+The fingerprints and moves are the ones of the canonical form of the
+position, see `symmetry`, so the games of the translated, turned and
+mirrored positions are counted together.
+"""
+
+import itertools
+import mmap
+import os
+import random
+import struct
+from typing import TYPE_CHECKING, Iterable
+
+from honeycomb.engine import logic, notation, symmetry
+from honeycomb.engine.game import Game
+
+if TYPE_CHECKING:
+    from honeycomb.records import GameSource
+
+MAGIC = b"HCB\x01"
+_HEADER = struct.Struct("<4sB3xQ")
+_ENTRY = struct.Struct("<QIII")
+_EXPANSIONS = tuple(notation.ExpansionPieces)
+_POINTS = {
+    notation.GameState.WhiteWins: {notation.PieceColor.WHITE: 2},
+    notation.GameState.BlackWins: {notation.PieceColor.BLACK: 2},
+    notation.GameState.Draw: {
+        notation.PieceColor.WHITE: 1,
+        notation.PieceColor.BLACK: 1,
+    },
+}
+DEFAULT_MAX_PLIES = 12
+
+
+class BookFormatError(ValueError):
+    pass
+
+
+class BookMove:
+    __slots__ = "move", "games", "points"
+
+    def __init__(self, move: logic.Move, games: int, points: int) -> None:
+        self.move = move
+        self.games = games
+        self.points = points
+
+    @property
+    def score(self) -> float:
+        """Share of the points the move scored, 1 if it won every game."""
+        return self.points / (2 * self.games)
+
+
+class OpeningBook:
+    """Book file mapped into memory, a position is found by binary search."""
+
+    __slots__ = "_file", "_mmap", "_size", "expansions"
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise BookFormatError(f"Not an opening book file: {path}.")
+        if len(self._mmap) < _HEADER.size or self._mmap[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise BookFormatError(f"Not an opening book file: {path}.")
+        _, expansions_mask, self._size = _HEADER.unpack_from(self._mmap)
+        if len(self._mmap) != _HEADER.size + self._size * _ENTRY.size:
+            self.close()
+            raise BookFormatError(f"Truncated opening book file: {path}.")
+        self.expansions = {
+            e for i, e in enumerate(_EXPANSIONS) if expansions_mask & (1 << i)
+        }
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+    def moves(self, game: Game) -> list[BookMove]:
+        """Returns the legal book moves of the position, the most played first."""
+        if game.expansions != self.expansions or game.is_over:
+            return []
+        key, transform = symmetry.canonical(game)
+        inverse = transform.inverse()
+        index = self._first(key)
+        entries = []
+        while index < self._size:
+            entry_key, move_code, games, points = self._entry(index)
+            if entry_key != key:
+                break
+            move = inverse.move(logic.decode_move(move_code))
+            entries.append(BookMove(move, games, points))
+            index += 1
+        if not entries:
+            return []
+        legal = set(game.legal_moves())
+        return [entry for entry in entries if entry.move in legal]
+
+    def choose(
+        self, game: Game, rng: random.Random, min_games: int = 1
+    ) -> BookMove | None:
+        """Draws a book move played in at least `min_games` games, weighted by games."""
+        entries = [entry for entry in self.moves(game) if entry.games >= min_games]
+        if not entries:
+            return None
+        return rng.choices(entries, weights=[entry.games for entry in entries])[0]
+
+    def _entry(self, index: int) -> tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self._mmap, _HEADER.size + index * _ENTRY.size)
+
+    def _first(self, key: int) -> int:
+        """Index of the first entry with a fingerprint not less than the key."""
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+def fingerprint(game: Game) -> int:
+    """Key of the position in the book, the same for its symmetric positions."""
+    return symmetry.canonical(game)[0]
+
+
+def build_book(
+    sources: Iterable["GameSource"],
+    path: str | os.PathLike,
+    gametype: str = "Base",
+    max_plies: int = DEFAULT_MAX_PLIES,
+    min_games: int = 1,
+) -> int:
+    """Writes the book of the first `max_plies` moves of the finished games.
+
+    Only the games of the gametype are counted, and the moves played in
+    fewer than `min_games` games are left out. Returns the number of entries.
+    """
+    expansions = notation.GameTypeString.decompose(gametype)
+    stats: dict[tuple[int, int], list[int]] = {}
+    for source in sources:
+        for key, move_code, points in _book_moves(source, expansions, max_plies):
+            entry = stats.setdefault((key, move_code), [0, 0])
+            entry[0] += 1
+            entry[1] += points
+
+    entries = sorted(
+        (
+            (key, move_code, games, points)
+            for (key, move_code), (games, points) in stats.items()
+            if games >= min_games
+        ),
+        key=lambda entry: (entry[0], -entry[2], entry[1]),
+    )
+    expansions_mask = sum(1 << _EXPANSIONS.index(e) for e in expansions)
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, expansions_mask, len(entries)))
+        for entry in entries:
+            file.write(_ENTRY.pack(*entry))
+    return len(entries)
+
+
+def _book_moves(
+    source: "GameSource",
+    expansions: set[notation.ExpansionPieces],
+    max_plies: int,
+) -> Iterable[tuple[int, int, int]]:
+    """Yields the fingerprint, move code and points of the opening moves."""
+    game = Game()
+    if isinstance(source, str):
+        source_expansions, state, _, _, move_strs = notation.GameString.decompose(
+            source
+        )
+        if source_expansions != expansions or state not in _POINTS:
+            return
+        game.new_game(notation.GameTypeString.build(expansions))
+        for move_str in move_strs[:max_plies]:
+            key, transforms = symmetry.canonical_transforms(game)
+            color = game.turn_color
+            move = symmetry.canonical_move(transforms, game.play(move_str))
+            yield key, logic.encode_move(move), _POINTS[state].get(color, 0)
+    else:
+        if source.expansions != expansions or source.state not in _POINTS:
+            return
+        game.new_game(source.gametype)
+        for move in itertools.islice(source.moves(), max_plies):
+            key, transforms = symmetry.canonical_transforms(game)
+            color = game.turn_color
+            game.push(move, validate=False)
+            code = logic.encode_move(symmetry.canonical_move(transforms, move))
+            yield key, code, _POINTS[source.state].get(color, 0)
@@ -1,11 +1,27 @@
+import random
+import threading
 import time
-from typing import Callable
+from typing import Callable, Mapping
 
 from honeycomb import _version
-from honeycomb.engine import err, notation
-from honeycomb.engine.game import Game
+from honeycomb.engine import err, logic, notation
+from honeycomb.engine.alphabeta import MATE_SCORE, AlphaBetaSearch
+from honeycomb.engine.book import OpeningBook
+from honeycomb.engine.game import Game, GameTerminatedError
+from honeycomb.engine.mcts import MctsSearch
+from honeycomb.engine.options import EngineOptions
+from honeycomb.engine.parallel import LazySmpSearch, ParallelMctsSearch
+from honeycomb.engine.ponder import Ponderer
+from honeycomb.engine.proofnumber import ProofNumberSearch, ProofResult, ProofStatus
+from honeycomb.engine.search import ProgressCallback, SearchLimits, SearchResult
+from honeycomb.engine.staticeval import StaticEvaluator
+from honeycomb.engine.transposition import TranspositionTable
 
 MAX_TIME_FORMAT = "%H:%M:%S"
+TT_ENTRY_SIZE = 16
+PROOF_TIME_SHARE = 0.25
+# Commands that leave the ponder search running, any other one stops it.
+PONDER_COMMANDS = frozenset({"bestmove", "info", "pass", "play", "validmoves"})
 ENGINE_NAME = "honeycomb"
 
 
@@ -30,16 +46,361 @@ class InvalidCommandParametersNumber(EngineError):
         )
 
 
-class Engine:
-    """Provides UHP engine API."""
+class Searcher:
+    """Runs the search selected with the SearchMode option.
+
+    Keeps the search state between the calls so that it can be reused after
+    the moves are played. With the ProofPreSearch option a proof search looks
+    for a forced win first and its winning move is played when it finds one.
+    With the Ponder option the `ponderer` searches on the opponent's time.
+    With the SearchProgress option `on_progress` gets the results of the
+    iterations of the `bestmove` searches and the ones reported every
+    ProgressInterval seconds. With a `book` and the OwnBook option a book
+    move played in at least BookMinGames games is played without a search.
+    """
+
+    __slots__ = (
+        "_alphabeta",
+        "_evaluator",
+        "_options",
+        "_mcts",
+        "_lazy_smp",
+        "_parallel_mcts",
+        "_prover",
+        "_rng",
+        "book",
+        "last_analysis",
+        "last_proof",
+        "last_result",
+        "on_progress",
+        "ponderer",
+    )
+
+    def __init__(
+        self,
+        options: EngineOptions,
+        weights: Mapping[str, float] | None = None,
+        book: OpeningBook | None = None,
+    ) -> None:
+        self._alphabeta: AlphaBetaSearch | None = None
+        self._evaluator = StaticEvaluator(weights)
+        self._options = options
+        self._mcts = MctsSearch()
+        self._lazy_smp: LazySmpSearch | None = None
+        self._parallel_mcts: ParallelMctsSearch | None = None
+        self._prover = ProofNumberSearch()
+        self._rng = random.Random()
+        self.book = book
+        self.last_analysis: list[SearchResult] = []
+        self.last_proof: ProofResult | None = None
+        self.last_result: SearchResult | None = None
+        self.on_progress: ProgressCallback | None = None
+        self.ponderer = Ponderer(self)
+
+    @property
+    def can_ponder(self) -> bool:
+        """Tells if the selected search can run in a thread and be stopped."""
+        mode = self._options["SearchMode"]
+        if mode == "MCTS":
+            return self._options["SearchProcesses"] == 1
+        return mode == "AlphaBeta"
+
+    def best_move(self, game: Game, limits: SearchLimits) -> str:
+        """Returns the move to play from the ponder search, the book or a search.
+
+        Raises:
+            GameTerminatedError: If the game is over.
+        """
+        if game.is_over:
+            raise GameTerminatedError
+        result = self.ponderer.search(game, limits)
+        if result is not None:
+            self.last_result = result
+            return result.move_str
+
+        if self.book is not None and self._options["OwnBook"]:
+            entry = self.book.choose(game, self._rng, self._options["BookMinGames"])
+            if entry is not None:
+                move_str = game.move_str(entry.move)
+                self.last_result = SearchResult(
+                    move=entry.move, move_str=move_str, pv=[move_str]
+                )
+                return move_str
+
+        if self._options["ProofPreSearch"]:
+            proof_time = None if limits.time is None else limits.time * PROOF_TIME_SHARE
+            proof = self.solve(game, time_limit=proof_time)
+            if proof.status == ProofStatus.PROVEN:
+                self.last_result = SearchResult(
+                    move=proof.move,  # type: ignore
+                    move_str=proof.move_str,  # type: ignore
+                    score=MATE_SCORE - proof.plies,
+                    depth=proof.plies,
+                    nodes=proof.nodes,
+                    elapsed=proof.elapsed,
+                )
+                return proof.move_str  # type: ignore
+            if limits.time is not None:
+                limits = SearchLimits(limits.depth, limits.time - proof.elapsed)
+
+        on_progress = self.on_progress if self._options["SearchProgress"] else None
+        result = self.search(game, limits, on_progress=on_progress)
+        self.last_result = result
+        return result.move_str
+
+    def search(
+        self,
+        game: Game,
+        limits: SearchLimits,
+        stop: threading.Event | None = None,
+        on_progress: ProgressCallback | None = None,
+    ) -> SearchResult:
+        """Runs the selected search until a limit is reached or `stop` is set."""
+        mode = self._options["SearchMode"]
+        if mode == "MCTS":
+            return self._mcts_search(game, limits, stop, on_progress)
+        if mode == "AlphaBeta":
+            return self._alphabeta_search(game, limits, stop, on_progress)
+        return self._random_move(game)
+
+    def ponder(self, game: Game, stop: threading.Event) -> SearchResult:
+        """Searches the position without limits until `stop` is set."""
+        return self.search(game, SearchLimits(), stop)
+
+    def expected_reply(self, game: Game, move: logic.Move) -> logic.Move | None:
+        """Returns the reply to the move the last search expects, if it knows one.
+
+        It is the best move stored in the transposition table for the position
+        after the move or the most visited reply in the MCTS tree.
+        """
+        mode = self._options["SearchMode"]
+        if mode == "MCTS":
+            if self._options["SearchProcesses"] != 1:
+                return None
+            return self._mcts.expected_reply(move)
+        if mode != "AlphaBeta":
+            return None
+
+        if self._options["SearchProcesses"] == 1:
+            search = self._alphabeta
+        else:
+            search = self._lazy_smp
+        if search is None:
+            return None
+
+        game.push(move, validate=False)
+        try:
+            if game.is_over:
+                return None
+            entry = search.tt.probe(game.hash)
+            if entry is None or entry[3] == logic.PASS_MOVE_CODE:
+                return None
+            reply = logic.decode_move(entry[3])
+            return reply if reply in game.legal_moves() else None
+        finally:
+            game.undo(1)
+
+    def analyze(
+        self, game: Game, limits: SearchLimits, count: int
+    ) -> list[SearchResult]:
+        """Returns the `count` best moves, best first, with their scores and lines.
+
+        The MCTS mode ranks the root moves of one search by visits, the other
+        modes run a multi-PV alpha-beta search. Both run in this process.
+
+        Raises:
+            GameTerminatedError: If the game is over.
+        """
+        if game.is_over:
+            raise GameTerminatedError
+        on_progress = self.on_progress if self._options["SearchProgress"] else None
+        interval = self._options["ProgressInterval"]
+        if self._options["SearchMode"] == "MCTS":
+            self._mcts.configure(*self._mcts_config())
+            results = self._mcts.analyze(
+                game, limits, count, on_progress=on_progress, progress_interval=interval
+            )
+        else:
+            results = self._local_alphabeta().analyze(
+                game,
+                limits,
+                count,
+                on_iteration=on_progress,
+                progress_interval=interval,
+            )
+        self.last_analysis = results
+        return results
+
+    def solve(
+        self,
+        game: Game,
+        max_nodes: int | None = None,
+        max_plies: int | None = None,
+        time_limit: float | None = None,
+    ) -> ProofResult:
+        """Proves a forced win of the side to move, the limits default to the options."""
+        self.last_proof = self._prover.solve(
+            game,
+            max_nodes or self._options["ProofMaxNodes"],
+            max_plies or self._options["ProofMaxPlies"],
+            time_limit,
+        )
+        return self.last_proof
+
+    def _alphabeta_search(
+        self,
+        game: Game,
+        limits: SearchLimits,
+        stop: threading.Event | None,
+        on_progress: ProgressCallback | None,
+    ) -> SearchResult:
+        processes = self._options["SearchProcesses"]
+        if processes == 1:
+            return self._local_alphabeta().search(
+                game,
+                limits,
+                stop=stop,
+                on_iteration=on_progress,
+                progress_interval=self._options["ProgressInterval"],
+            )
+
+        tt_entries = self._tt_entries()
+        if (
+            self._lazy_smp is None
+            or self._lazy_smp.processes != processes
+            or self._lazy_smp.tt.entries != tt_entries
+        ):
+            if self._lazy_smp is not None:
+                self._lazy_smp.close()
+            self._lazy_smp = LazySmpSearch(
+                processes, tt_entries, self._evaluator.weights
+            )
+        self._lazy_smp.configure(*self._features())
+        return self._lazy_smp.search(
+            game, limits, stop, on_progress, self._options["ProgressInterval"]
+        )
+
+    def _mcts_search(
+        self,
+        game: Game,
+        limits: SearchLimits,
+        stop: threading.Event | None,
+        on_progress: ProgressCallback | None,
+    ) -> SearchResult:
+        processes = self._options["SearchProcesses"]
+        config = self._mcts_config()
+
+        if processes == 1:
+            self._mcts.configure(*config)
+            return self._mcts.search(
+                game, limits, stop, on_progress, self._options["ProgressInterval"]
+            )
+
+        if self._parallel_mcts is None or self._parallel_mcts.processes != processes:
+            if self._parallel_mcts is not None:
+                self._parallel_mcts.close()
+            self._parallel_mcts = ParallelMctsSearch(processes)
+        self._parallel_mcts.configure(self._options["MctsParallelism"], *config)
+        return self._parallel_mcts.search(game, limits)
+
+    def _local_alphabeta(self) -> AlphaBetaSearch:
+        """Returns the alpha-beta search of this process set up from the options."""
+        tt_entries = self._tt_entries()
+        if self._alphabeta is None or self._alphabeta.tt.max_entries != tt_entries:
+            self._alphabeta = AlphaBetaSearch(
+                TranspositionTable(tt_entries), evaluator=self._evaluator
+            )
+        self._alphabeta.configure(*self._features())
+        return self._alphabeta
+
+    def _features(self) -> tuple[bool, bool, bool, bool]:
+        return (
+            self._options["AlphaBetaPVS"],
+            self._options["AlphaBetaAspiration"],
+            self._options["AlphaBetaLMR"],
+            self._options["AlphaBetaFutility"],
+        )
+
+    def _mcts_config(self) -> tuple[str, float, int, int]:
+        return (
+            self._options["MctsSelection"],
+            self._options["MctsExploration"],
+            self._options["MctsPlayoutDepth"],
+            self._options["MctsMaxNodes"],
+        )
+
+    def _tt_entries(self) -> int:
+        return self._options["HashSizeMB"] * (1 << 20) // TT_ENTRY_SIZE
+
+    def _random_move(self, game: Game) -> SearchResult:
+        start = time.perf_counter()
+        move = game.sample_move(self._rng)
+        return SearchResult(
+            move=move,
+            move_str=game.move_str(move),
+            nodes=1,
+            elapsed=time.perf_counter() - start,
+        )
 
-    __slots__ = "_cmd_completion_str", "_game", "_cmd_func_mapper"
 
-    def __init__(self) -> None:
+class Engine:
+    """Provides UHP engine API.
+
+    `weights` of the static evaluation, see `staticeval.load_weights`, are
+    used by the alpha-beta search, the opening `book` by `bestmove`. With the
+    Ponder option set, `bestmove` starts a search of the expected reply that
+    runs until the next command which is not in `PONDER_COMMANDS` or an
+    unexpected move is played.
+
+    With the SearchProgress option `bestmove` reports its progress in lines
+    starting with "progress", see `SearchResult`. They are passed to `output`
+    as soon as they are reported or, without it, put before the response.
+    """
+
+    __slots__ = (
+        "_cmd_completion_str",
+        "_game",
+        "_cmd_func_mapper",
+        "_options",
+        "_output",
+        "_progress_lines",
+        "_searcher",
+    )
+
+    def __init__(
+        self,
+        weights: Mapping[str, float] | None = None,
+        output: Callable[[str], None] | None = None,
+        book: OpeningBook | None = None,
+    ) -> None:
         self._cmd_completion_str = "ok"
-        self._cmd_func_mapper = CommandFunctionMapper()
+        self._options = EngineOptions()
+        self._output = output
+        self._progress_lines: list[str] = []
+        self._searcher = Searcher(self._options, weights, book)
+        self._searcher.on_progress = self._report_progress
+        self._cmd_func_mapper = CommandFunctionMapper(self._options, self._searcher)
         self._game = Game()
 
+    @property
+    def last_search(self) -> SearchResult | None:
+        """Result of the last bestmove search with its statistics."""
+        return self._searcher.last_result
+
+    @property
+    def last_analysis(self) -> list[SearchResult]:
+        """Candidates of the last analyze command, best first."""
+        return self._searcher.last_analysis
+
+    @property
+    def last_proof(self) -> ProofResult | None:
+        """Result of the last proof search, by solve or before bestmove."""
+        return self._searcher.last_proof
+
+    @property
+    def ponderer(self) -> Ponderer:
+        return self._searcher.ponderer
+
     def execute(self, inp) -> str:
         """Executes UHP commands and outputs response"""
         return self._response(inp)
@@ -50,42 +411,70 @@ class Engine:
         except err.BaseEngineError as e:
             result = str(e)
 
-        return f"{result}\n{self._cmd_completion_str}"
+        lines = [*self._progress_lines, result, self._cmd_completion_str]
+        self._progress_lines.clear()
+        return "\n".join(lines)
+
+    def _report_progress(self, result: SearchResult) -> None:
+        line = f"progress {result}"
+        if self._output is None:
+            self._progress_lines.append(line)
+        else:
+            self._output(line)
 
     def _cmd_result(self, inp) -> str:
         command, *params = inp.split()
         cmd_func = self._cmd_func_mapper[command]
+        ponderer = self._searcher.ponderer
+        if command not in PONDER_COMMANDS:
+            ponderer.stop()
         params_str = " ".join(params)
-        return cmd_func(self._game, params_str)
+        result = cmd_func(self._game, params_str)
+
+        if command in ("pass", "play"):
+            ponderer.played(self._game.moves[-1])
+        elif command == "bestmove" and self._options["Ponder"]:
+            ponderer.start(self._game, self._searcher.last_result.move)  # type: ignore
+        return result
 
 
 class CommandFunctionMapper:
-    def __init__(self) -> None:
+    def __init__(self, options: EngineOptions, searcher: Searcher) -> None:
+        self._options = options
+        self._searcher = searcher
         self._cmd_to_method = {
+            "analyze": _analyze,
             "bestmove": _bestmove,
             "info": _info,
             "newgame": _newgame,
             "options": _options,
             "pass": _pass,
             "play": _play,
+            "solve": _solve,
             "undo": _undo,
             "validmoves": _validmoves,
         }
         self._game_dependent_methods = {
+            _analyze,
             _bestmove,
             _newgame,
             _pass,
             _play,
+            _solve,
             _undo,
             _validmoves,
         }
         self._params_dependent_methods = {
+            _analyze,
             _bestmove,
             _newgame,
             _options,
             _play,
+            _solve,
             _undo,
         }
+        self._options_dependent_methods = {_options}
+        self._search_dependent_methods = {_analyze, _bestmove, _solve}
 
     def __getitem__(self, command) -> Callable[[Game, str], str]:
         method = self._method(command)
@@ -98,6 +487,10 @@ class CommandFunctionMapper:
                 args.append(params)
             elif params:
                 raise InvalidCommandParameters(params)
+            if method in self._options_dependent_methods:
+                args.append(self._options)
+            if method in self._search_dependent_methods:
+                args.append(self._searcher)
 
             return method(*args)
 
@@ -110,26 +503,34 @@ class CommandFunctionMapper:
         return self._cmd_to_method[command]
 
 
-def _bestmove(game: Game, params: str) -> str:
+def _analyze(game: Game, params: str, searcher: Searcher) -> str:
+    """Extension command: analyze K depth N | analyze K time HH:MM:SS.
+
+    Answers a line of move;score;principal variation for each of the K best
+    moves, best first.
+    """
+    param_list = params.split()
+    if len(param_list) != 3:
+        raise InvalidCommandParametersNumber(len(param_list), 3)
+
+    count, limit_type, limit_value = param_list
+    if not count.isdigit() or int(count) == 0:
+        raise InvalidCommandParameters(count)
+    limits = _search_limits(limit_type, limit_value)
+
+    lines = []
+    for result in searcher.analyze(game, limits, int(count)):
+        score = "none" if result.score is None else f"{result.score:g}"
+        lines.append(f"{result.move_str};{score};{' '.join(result.pv)}")
+    return "\n".join(lines)
+
+
+def _bestmove(game: Game, params: str, searcher: Searcher) -> str:
     param_list = params.split()
     if len(param_list) != 2:
         raise InvalidCommandParametersNumber(len(param_list), 2)
 
-    limit_type, limit_value = param_list
-
-    if limit_type == "depth":
-        if not limit_value.isdigit():
-            raise InvalidCommandParameters(limit_value)
-        return _bestmove_in_depth(game, int(limit_value))
-    elif limit_type == "time":
-        try:
-            time_info = time.strptime(limit_value, MAX_TIME_FORMAT)
-        except ValueError:
-            raise InvalidCommandParameters(limit_value)
-        return _bestmove_in_time(
-            game, time_info.tm_hour, time_info.tm_min, time_info.tm_sec
-        )
-    raise InvalidCommandParameters(limit_type)
+    return searcher.best_move(game, _search_limits(*param_list))
 
 
 def _info() -> str:
@@ -149,9 +550,16 @@ def _newgame(game: Game, params: str) -> str:
     return game.status
 
 
-def _options(params: str):
+def _options(params: str, options: EngineOptions) -> str:
     # TODO: It could be a good option to turn off move validation when training with AI for example
-    return ""
+    param_list = params.split()
+    if not param_list:
+        return str(options)
+    if param_list[0] == "get" and len(param_list) == 2:
+        return options.get(param_list[1])
+    if param_list[0] == "set" and len(param_list) == 3:
+        return options.set(param_list[1], param_list[2])
+    raise InvalidCommandParameters(params)
 
 
 def _pass(game: Game) -> str:
@@ -166,6 +574,24 @@ def _play(game: Game, params: str) -> str:
     raise InvalidCommandParameters(params)
 
 
+def _solve(game: Game, params: str, searcher: Searcher) -> str:
+    """Extension command: solve [nodes N] [plies N], see `ProofResult`."""
+    param_list = params.split()
+    if len(param_list) % 2:
+        raise InvalidCommandParameters(params)
+
+    limits = {}
+    for limit_type, limit_value in zip(param_list[::2], param_list[1::2]):
+        if limit_type not in ("nodes", "plies") or limit_type in limits:
+            raise InvalidCommandParameters(limit_type)
+        if not limit_value.isdigit() or int(limit_value) == 0:
+            raise InvalidCommandParameters(limit_value)
+        limits[limit_type] = int(limit_value)
+
+    result = searcher.solve(game, limits.get("nodes"), limits.get("plies"))
+    return str(result)
+
+
 def _undo(game: Game, params: str) -> str:
     if not params:
         params = "1"
@@ -182,9 +608,17 @@ def _validmoves(game: Game):
     return ";".join(valid_moves_str)
 
 
-def _bestmove_in_depth(game: Game, depth: int) -> str:
-    return game.best_move()
-
-
-def _bestmove_in_time(game: Game, hour: int, min: int, sec: int):
-    return game.best_move()
+def _search_limits(limit_type: str, limit_value: str) -> SearchLimits:
+    if limit_type == "depth":
+        if not limit_value.isdigit():
+            raise InvalidCommandParameters(limit_value)
+        return SearchLimits(depth=int(limit_value))
+    elif limit_type == "time":
+        try:
+            time_info = time.strptime(limit_value, MAX_TIME_FORMAT)
+        except ValueError:
+            raise InvalidCommandParameters(limit_value)
+        return SearchLimits(
+            time=time_info.tm_hour * 3600 + time_info.tm_min * 60 + time_info.tm_sec
+        )
+    raise InvalidCommandParameters(limit_type)
@@ -0,0 +1,127 @@
+import threading
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+from honeycomb.engine import logic, planes
+from honeycomb.engine.game import Game
+
+EvaluateBatch = Callable[[np.ndarray], tuple[Any, Sequence[float]]]
+Encode = Callable[[Game, np.ndarray], None]
+MoveIndex = Callable[[Game, logic.Move], int]
+
+
+class Evaluation:
+    """Pending evaluation of one position.
+
+    The value is in the range [-1, 1] from the view of the side to move and
+    the priors are aligned with `moves`, the legal moves of the position.
+    """
+
+    __slots__ = "_done", "_queue", "moves", "priors", "value"
+
+    def __init__(self, queue: "EvaluationQueue", moves: list[logic.Move]) -> None:
+        self._done = threading.Event()
+        self._queue = queue
+        self.moves = moves
+        self.priors: list[float] | None = None
+        self.value = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def result(self) -> tuple[list[float] | None, float]:
+        """Waits for the batch, evaluating it early when the timeout passes."""
+        if not self._done.wait(self._queue.timeout):
+            self._queue.flush()
+        return self.priors, self.value
+
+    def _set(self, priors: list[float] | None, value: float) -> None:
+        self.priors = priors
+        self.value = value
+        self._done.set()
+
+
+class EvaluationQueue:
+    """Collects positions to evaluate and evaluates them in batches.
+
+    Every submitted position is encoded into its row of a preallocated
+    array. The array is passed to `evaluate_batch` once `batch_size`
+    positions are pending or when a pending evaluation waits longer than
+    `timeout` seconds. `evaluate_batch` returns the policy and the values of
+    the rows. Without `move_index` the policy is ignored, otherwise
+    `policy[row][move_index(game, move)]` is the weight of the move, and the
+    weights of the legal moves are normalized into priors.
+    """
+
+    __slots__ = (
+        "_batch",
+        "_encode",
+        "_evaluate_batch",
+        "_lock",
+        "_move_index",
+        "_pending",
+        "batch_size",
+        "batches",
+        "timeout",
+    )
+
+    def __init__(
+        self,
+        evaluate_batch: EvaluateBatch,
+        batch_size: int = 16,
+        timeout: float = 0.005,
+        encode: Encode = planes.encode_game,
+        shape: tuple[int, ...] = planes.planes_shape(),
+        move_index: MoveIndex | None = None,
+    ) -> None:
+        self._batch = np.zeros((batch_size, *shape), dtype=np.float32)
+        self._encode = encode
+        self._evaluate_batch = evaluate_batch
+        self._lock = threading.Lock()
+        self._move_index = move_index
+        self._pending: list[tuple[Evaluation, list[int] | None]] = []
+        self.batch_size = batch_size
+        self.batches = 0
+        self.timeout = timeout
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, game: Game) -> Evaluation:
+        """Encodes the position and queues it, evaluating the batch when full."""
+        moves = game.legal_moves()
+        indices = None
+        if self._move_index is not None:
+            indices = [self._move_index(game, move) for move in moves]
+        evaluation = Evaluation(self, moves)
+
+        with self._lock:
+            self._encode(game, self._batch[len(self._pending)])
+            self._pending.append((evaluation, indices))
+            if len(self._pending) == self.batch_size:
+                self._flush()
+        return evaluation
+
+    def flush(self) -> None:
+        """Evaluates the pending positions."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        rows = len(self._pending)
+        policy, values = self._evaluate_batch(self._batch[:rows])
+        self.batches += 1
+
+        for row, (evaluation, indices) in enumerate(self._pending):
+            priors = None
+            if indices is not None:
+                weights = [float(policy[row][index]) for index in indices]
+                total = sum(weights)
+                if total > 0:
+                    priors = [weight / total for weight in weights]
+            evaluation._set(priors, float(values[row]))
+        self._pending = []
@@ -1,7 +1,17 @@
+import random
+from typing import TYPE_CHECKING, Generator
+
 from honeycomb.engine import err, logic, notation
 from honeycomb.engine.hive import Hive, PositionsResolver
 
+if TYPE_CHECKING:
+    import numpy as np
+
 _STARTING_COLOR = notation.PieceColor.WHITE
+_SIDE_TO_MOVE_KEY = 0x5F3759DF9E3779B9
+_ONGOING_STATES = frozenset(
+    {notation.GameState.NotStarted, notation.GameState.InProgress}
+)
 
 
 class GameError(err.BaseEngineError):
@@ -68,12 +78,34 @@ class PassMoveNotAllowedError(InvalidMove):
         self.message = f"The pass move is not a valid move if there are possible moves available: {', '.join(validmoves)}."
 
 
+class MoveRecord:
+    """Reversible record of a played move and of the game state before it."""
+
+    __slots__ = "move_str", "move", "state", "turn_color", "turn_num", "hash"
+
+    def __init__(
+        self,
+        move_str: str,
+        move: logic.Move,
+        state: notation.GameState,
+        turn_color: notation.PieceColor,
+        turn_num: int,
+        hash: int,
+    ):
+        self.move_str = move_str
+        self.move = move
+        self.state = state
+        self.turn_color = turn_color
+        self.turn_num = turn_num
+        self.hash = hash
+
+
 class Game:
     __slots__ = (
         "_expansions",
         "_hive",
+        "_history",
         "_moves_provider",
-        "_moves",
         "_state",
         "_turn_color",
         "_turn_num",
@@ -89,9 +121,44 @@ class Game:
             gamestate=self._state,
             turn_num=self._turn_num,
             turn_color=self._turn_color,
-            moves=self._moves,
+            moves=[record.move_str for record in self._history],
         )
 
+    @property
+    def expansions(self) -> set[notation.ExpansionPieces]:
+        return set(self._expansions)
+
+    @property
+    def hash(self) -> int:
+        """Zobrist hash of the position including the side to move."""
+        if self._turn_color == _STARTING_COLOR:
+            return self._hive.hash
+        return self._hive.hash ^ _SIDE_TO_MOVE_KEY
+
+    @property
+    def moves(self) -> list[logic.Move]:
+        return [record.move for record in self._history]
+
+    @property
+    def state(self) -> notation.GameState:
+        return self._state
+
+    @property
+    def turn_color(self) -> notation.PieceColor:
+        return self._turn_color
+
+    @property
+    def turn_num(self) -> int:
+        return self._turn_num
+
+    @property
+    def hive(self) -> Hive:
+        return self._hive
+
+    @property
+    def is_over(self) -> bool:
+        return self._state not in _ONGOING_STATES
+
     def best_move(self) -> str:
         return self._moves_provider.random_valid_move(self._turn_color, self._turn_num)
 
@@ -124,8 +191,11 @@ class Game:
         expansions = notation.GameTypeString.decompose(gametype_str)
         self._init_new_game(expansions)
 
-    def play(self, move_str: str):
+    def play(self, move_str: str) -> logic.Move:
         """
+        Returns:
+            The played move.
+
         Raises:
             GameTerminatedError: If the game is over.
             InvalidAddingPieceError: If adding piece from hand that is not allowed.
@@ -137,84 +207,136 @@ class Game:
             PassMoveNotAllowedError: If pass has played while valid moves existing.
         """
         # TODO: Implement better validation logic then calculating all possible moves
+        move = self.parse_move(move_str)
+        self._make(move, move_str)
+        return move
 
-        if self._state not in [
-            notation.GameState.NotStarted,
-            notation.GameState.InProgress,
-        ]:
-            raise GameTerminatedError
+    def parse_move(self, move_str: str) -> logic.Move:  # type: ignore
+        """Resolves the MoveString against the current position.
+
+        Raises:
+            The same errors as `play`.
+        """
+        self._check_not_terminated()
 
         move_str_parts = notation.MoveString.decompose(move_str)
         piece_str = move_str_parts[0]
 
         if piece_str is None:
             self._pass_move()
-        else:
-            color, *_ = notation.PieceString.decompose(piece_str)
-            if piece_str in self._hive.pieces_in_hand_str(
-                color
-            ) and piece_str in self._moves_provider.pieces_str_to_add(
-                self._turn_color, self._turn_num
-            ):
-                self._add(move_str)
-            elif piece_str in self._hive.pieces_on_board_str(color):
-                self._move(move_str)
+            return logic.PASS_MOVE
+
+        color, *_ = notation.PieceString.decompose(piece_str)
+        if piece_str in self._hive.pieces_in_hand_str(
+            color
+        ) and piece_str in self._moves_provider.pieces_str_to_add(
+            self._turn_color, self._turn_num
+        ):
+            return logic.Move(piece_str, self._adding_destination(move_str_parts))
+        if piece_str in self._hive.pieces_on_board_str(color):
+            return logic.Move(piece_str, self._moving_destination(move_str_parts))
+        self._raise_invalid_add_piece_error(piece_str)
+
+    def push(self, move: logic.Move, validate: bool = True) -> None:
+        """Plays the typed move. Its MoveString is rendered once for the history.
+
+        Search code that only plays generated moves can skip the validation.
+
+        Raises:
+            The same errors as `play` except InvalidMoveStringError.
+        """
+        if validate:
+            self._check_not_terminated()
+
+            if move.piece_str is None:
+                self._pass_move()
             else:
-                self._raise_invalid_add_piece_error(piece_str)
+                self._validate_move(move)
 
-        self._moves.append(move_str)
-        self._next_turn()
+        self._make(move, self._moves_provider.move_str(move))
+
+    def play_action(self, action: int, size: int | None = None) -> logic.Move:
+        """Plays the move of the action index, see `ActionSpace`, and returns it.
+
+        The size defaults to `planes.DEFAULT_SIZE`.
+
+        Raises:
+            The same errors as `push`.
+        """
+        from honeycomb.engine import planes
+        from honeycomb.engine.actions import action_space
+
+        space = action_space(planes.DEFAULT_SIZE if size is None else size)
+        return space.play(self, action)
+
+    def pop(self) -> logic.Move:
+        """Takes back the last move and returns it.
+
+        Raises:
+            IndexError: If there are no moves to take back.
+        """
+        move = self._history[-1].move
+        self.undo(1)
+        return move
 
     def undo(self, to_undo: int) -> None:
-        if self._state == notation.GameState.NotStarted or to_undo < 1:
-            return
-
-        self._turn_num -= to_undo // 2
-
-        if to_undo % 2 == 1:
-            if self._turn_color == _STARTING_COLOR:
-                self._turn_num -= 1
-            self._change_turn_color()
-
-        if self._turn_num < 1:
-            self.new_game()
-            return
-
-        self._hive.undo(to_undo)
-        self._moves = self._moves[:-to_undo]
-        self._state = (
-            notation.GameState.InProgress
-            if self._moves
-            else notation.GameState.NotStarted
-        )
+        """Takes back up to `to_undo` last moves restoring the exact previous state."""
+        for _ in range(min(to_undo, len(self._history))):
+            record = self._history.pop()
+            if record.move.piece_str is not None:
+                self._hive.undo()
+            assert self._hive.hash == record.hash
+            self._state = record.state
+            self._turn_color = record.turn_color
+            self._turn_num = record.turn_num
+
+    def count_moves(self) -> int:
+        return self._moves_provider.count_moves(self._turn_color, self._turn_num)
+
+    def iter_moves(
+        self, order: logic.MoveOrder = logic.MoveOrder.BOARD_FIRST
+    ) -> Generator[logic.Move, None, None]:
+        return self._moves_provider.iter_moves(self._turn_color, self._turn_num, order)
+
+    def legal_action_mask(self, size: int | None = None) -> "np.ndarray":
+        """Returns the NumPy bool mask of the legal actions, see `ActionSpace`.
+
+        The size defaults to `planes.DEFAULT_SIZE`.
+        """
+        from honeycomb.engine import planes
+        from honeycomb.engine.actions import action_space
 
-    def valid_moves(self) -> set[str]:
-        return self._moves_provider.valid_moves(self._turn_color, self._turn_num)
+        space = action_space(planes.DEFAULT_SIZE if size is None else size)
+        return space.legal_mask(self)
 
-    def _add(self, move_str: str):
-        move_str_parts = notation.MoveString.decompose(move_str)
+    def legal_moves(self) -> list[logic.Move]:
+        return list(self.iter_moves())
 
-        assert move_str_parts[0] is not None
+    def move_str(self, move: logic.Move) -> str:
+        return self._moves_provider.move_str(move)
 
-        if len(move_str_parts) == 1 and not self._hive.pieces_on_board_str():
-            piece_str = move_str_parts[0]
-            self._hive.add(piece_str)
-            return
+    def sample_move(self, rng: random.Random) -> logic.Move:
+        return self._moves_provider.sample_move(self._turn_color, self._turn_num, rng)
 
-        assert len(move_str_parts) == 3
+    def valid_moves(self) -> set[str]:
+        return self._moves_provider.valid_moves(self._turn_color, self._turn_num)
 
-        piece_str, relation, ref_piece_str = move_str_parts
-        color, *_ = notation.PieceString.decompose(piece_str)
-        if ref_piece_str in self._hive.pieces_on_board_str():
-            destination = self._destination(ref_piece_str, relation)
-            adding_positions = self._moves_provider.adding_positions(color)
-            if destination in adding_positions:
-                self._hive.add(piece_str, destination)
-                return
+    def _adding_destination(
+        self, move_str_parts: tuple[str] | tuple[str, str, str]
+    ) -> tuple[int, int]:
+        if len(move_str_parts) == 1 and not self._hive.pieces_on_board_str():
+            return self._hive.start_position
 
-        raise InvalidAddingPositionError(
-            notation.MoveString.build(piece_str, relation, ref_piece_str)
-        )
+        if len(move_str_parts) == 3:
+            piece_str, relation, ref_piece_str = move_str_parts
+            color, *_ = notation.PieceString.decompose(piece_str)
+            if ref_piece_str in self._hive.pieces_on_board_str():
+                destination = self._destination(ref_piece_str, relation)
+                adding_positions = self._moves_provider.adding_positions(color)
+                if destination in adding_positions:
+                    return destination
+
+        raise InvalidAddingPositionError(notation.MoveString.build(*move_str_parts))
 
     def _change_turn_color(self):
         if self._turn_color == notation.PieceColor.WHITE:
@@ -222,18 +344,21 @@ class Game:
         else:
             self._turn_color = notation.PieceColor.WHITE
 
+    def _check_not_terminated(self) -> None:
+        if self.is_over:
+            raise GameTerminatedError
+
     def _destination(self, ref_piece_str: str, relation: str):
-        ref_piece = self._hive.piece(ref_piece_str)
-        destination = PositionsResolver.destination_position(
-            ref_piece.position, relation
-        )
+        ref_position = self._hive.position(ref_piece_str)
+        assert ref_position is not None
+        destination = PositionsResolver.destination_position(ref_position, relation)
         return destination
 
     def _init_new_game(self, expansions: set[notation.ExpansionPieces] | None = None):
         if expansions is None:
             expansions = set()
         self._state = notation.GameState.NotStarted
-        self._moves = []
+        self._history = []
         self._turn_color = _STARTING_COLOR
         self._turn_num = 1
         self._expansions = expansions
@@ -264,25 +389,57 @@ class Game:
         if piece_str not in pieces_str_to_add:
             raise InvalidAddingPieceError(piece_str, pieces_str_to_add)
 
-    def _move(self, move_str: str):
-        move_str_parts = notation.MoveString.decompose(move_str)
+    def _validate_move(self, move: logic.Move) -> None:
+        piece_str, destination = move
+        assert piece_str is not None
+
+        color, *_ = notation.PieceString.decompose(piece_str)
+        if color != self._turn_color:
+            raise InvalidPieceColor(self._turn_color)
+
+        if piece_str in self._hive.pieces_on_board_str(color):
+            piece = self._hive.piece(piece_str)
+            if destination not in self._moves_provider.move_positions(piece):
+                raise InvalidMovingPositionError(f"{piece_str} {destination}")
+        elif piece_str in self._moves_provider.pieces_str_to_add(
+            self._turn_color, self._turn_num
+        ):
+            if destination not in self._moves_provider.adding_positions(color):
+                raise InvalidAddingPositionError(f"{piece_str} {destination}")
+        else:
+            self._raise_invalid_add_piece_error(piece_str)
+
+    def _make(self, move: logic.Move, move_str: str) -> None:
+        record = MoveRecord(
+            move_str=move_str,
+            move=move,
+            state=self._state,
+            turn_color=self._turn_color,
+            turn_num=self._turn_num,
+            hash=self._hive.hash,
+        )
+
+        if move.piece_str is not None:
+            assert move.destination is not None
+            color, *_ = notation.PieceString.decompose(move.piece_str)
+            if move.piece_str in self._hive.pieces_on_board_str(color):
+                self._hive.move(move.piece_str, move.destination)
+            else:
+                self._hive.add(move.piece_str, move.destination)
+
+        self._history.append(record)
+        self._next_turn()
+
+    def _moving_destination(
+        self, move_str_parts: tuple[str] | tuple[str, str, str]
+    ) -> tuple[int, int]:
         if len(move_str_parts) == 3:
             piece_str, relation, ref_piece_str = move_str_parts
-
-            if relation is None:
-                raise InvalidMovingPositionError(piece_str)
-
-            if ref_piece_str is not None:
-                piece = self._hive.piece(piece_str)
-                ref_piece = self._hive.piece(ref_piece_str)
-                destination = PositionsResolver.destination_position(
-                    ref_piece.position, relation
-                )
-                if destination in self._moves_provider.move_positions(piece):
-                    self._hive.move(piece_str, destination)
-                    return
-                raise InvalidMovingPositionError(move_str)
-        raise InvalidMovingPositionError(move_str)
+            piece = self._hive.piece(piece_str)
+            destination = self._destination(ref_piece_str, relation)
+            if destination in self._moves_provider.move_positions(piece):
+                return destination
+        raise InvalidMovingPositionError(notation.MoveString.build(*move_str_parts))
 
     def _next_turn(self):
         self._update_gamestate()
@@ -309,5 +466,5 @@ class Game:
             self._state = notation.GameState.BlackWins
         elif black_bee_surrounded:
             self._state = notation.GameState.WhiteWins
-        elif self._moves:
+        elif self._history:
             self._state = notation.GameState.InProgress
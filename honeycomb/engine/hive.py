@@ -30,15 +30,56 @@
 
 import collections
 import copy
+from typing import TYPE_CHECKING
 
 from honeycomb.engine import err, notation
 from honeycomb.engine import pieces as p
 
+if TYPE_CHECKING:
+    import numpy as np
+
+    from honeycomb.engine.staticeval import FeatureAccumulator
+
+_HASH_MASK = (1 << 64) - 1
+
 
 def sum_tuple_elem_wise(a: tuple, b: tuple):
     return tuple([a_i + b_i for a_i, b_i in zip(a, b)])
 
 
+def axial(position: tuple[int, int]) -> tuple[int, int]:
+    """Converts the (row, column) position into axial (q, r) coordinates."""
+    row, col = position
+    return col - (row - (row & 1)) // 2, row
+
+
+def offset(axial_position: tuple[int, int]) -> tuple[int, int]:
+    """Converts the axial (q, r) coordinates into the (row, column) position."""
+    q, r = axial_position
+    return r, q + (r - (r & 1)) // 2
+
+
+def zobrist_key(piece_str: str, position: tuple[int, int], level: int) -> int:
+    """Returns the 64-bit key of a piece standing on the given position and stack level.
+
+    Keys are derived from their arguments only (splitmix64 finalizer), so they are
+    the same in every process and do not need a precomputed table.
+    """
+    key = _zobrist_keys.get((piece_str, position, level))
+    if key is None:
+        x = int.from_bytes(piece_str.encode(), "big") << 40
+        x ^= (position[0] & 0xFFFF) << 24 ^ (position[1] & 0xFFFF) << 8 ^ level
+        x = (x + 0x9E3779B97F4A7C15) & _HASH_MASK
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _HASH_MASK
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _HASH_MASK
+        key = x ^ (x >> 31)
+        _zobrist_keys[(piece_str, position, level)] = key
+    return key
+
+
+_zobrist_keys: dict[tuple[str, tuple[int, int], int], int] = {}
+
+
 class PositionsResolver:
     _relation_to_move_offset = {
         "even": {
@@ -58,6 +99,11 @@ class PositionsResolver:
             "\\.": (-1, -1),
         },
     }
+    _offset_to_relation = {
+        parity: {offset: relation for relation, offset in offsets.items()}
+        for parity, offsets in _relation_to_move_offset.items()
+    }
+    _positions_around: dict[tuple[int, int], tuple[tuple[int, int], ...]] = {}
     _same_relation = "."
 
     @classmethod
@@ -84,26 +130,27 @@ class PositionsResolver:
     @classmethod
     def positions_around_clockwise(
         cls, position: tuple[int, int]
-    ) -> list[tuple[int, int]]:
-        return list(
-            (position[0] + offset[0], position[1] + offset[1])
-            for offset in cls._move_offsets_clockwise(position)
-        )
+    ) -> tuple[tuple[int, int], ...]:
+        positions_around = cls._positions_around.get(position)
+        if positions_around is None:
+            positions_around = tuple(
+                (position[0] + offset[0], position[1] + offset[1])
+                for offset in cls._move_offsets_clockwise(position)
+            )
+            cls._positions_around[position] = positions_around
+        return positions_around
 
     @classmethod
     def relation(
         cls, position: tuple[int, int], ref_position: tuple[int, int]
     ) -> str | None:
         pos_offset = (position[0] - ref_position[0], position[1] - ref_position[1])
-        relations_dict = cls._relation_to_move_offset[
+        relation = cls._offset_to_relation[
             "even" if cls.is_row_even(ref_position) else "odd"
-        ]
-
-        assert pos_offset in relations_dict.values()
+        ].get(pos_offset)
 
-        for relation, offset in relations_dict.items():
-            if offset == pos_offset:
-                return relation
+        assert relation is not None
+        return relation
 
     @classmethod
     def _move_offsets_clockwise(
@@ -141,16 +188,30 @@ class MovesStack:
     def pop(self):
         return self._stack.pop()
 
+    def __len__(self) -> int:
+        return len(self._stack)
+
 
 class Hive:
-    __slots__ = "_pieces", "_moves_stack"
+    __slots__ = (
+        "_accumulator",
+        "_hash",
+        "_pieces",
+        "_pieces_by_str",
+        "_moves_stack",
+        "_top_pieces",
+    )
 
     def __init__(self, expansions: set[notation.ExpansionPieces] | None = None):
         if expansions is None:
             expansions = set()
 
+        self._accumulator: "FeatureAccumulator | None" = None
+        self._hash = 0
         self._pieces = {}
+        self._pieces_by_str: dict[str, p.Piece] = {}
         self._moves_stack = MovesStack()
+        self._top_pieces: dict[tuple[int, int], p.Piece] = {}
 
         for color in notation.PieceColor:
             self._pieces[color] = {
@@ -164,49 +225,59 @@ class Hive:
                 },
             }
 
+    @property
+    def accumulator(self) -> "FeatureAccumulator | None":
+        return self._accumulator
+
+    @property
+    def hash(self) -> int:
+        """Zobrist hash of the pieces on board, updated incrementally by every change."""
+        return self._hash
+
     @property
     def start_position(self):
         return (0, 0)
 
     def add(self, piece_str: str, position: tuple[int, int] | None = None) -> None:
-        assert position not in self.positions()
-        assert piece_str not in self.pieces_on_board_str()
+        assert position not in self._top_pieces
+        assert piece_str not in self._pieces_by_str
         if position is None:
             position = self.start_position
 
         piece = self._create_new_piece(piece_str, position)
         self._register_piece(piece)
+        self._hash ^= zobrist_key(piece_str, position, 0)
         self._moves_stack.push(piece, None, position)
 
+    def attach(self, accumulator: "FeatureAccumulator") -> None:
+        """Makes the accumulator follow every change of the top pieces."""
+        self._accumulator = accumulator
+
+    def count_in_hand(self, color: notation.PieceColor) -> int:
+        return len(self._pieces[color]["hand"]["str"])
+
     def is_bee_on_board(self, color: notation.PieceColor) -> bool:
-        return notation.PieceString.build(
-            color, notation.BasePieces.BEE, 0
-        ) in self.pieces_on_board_str(color)
+        return (
+            notation.PieceString.build(color, notation.BasePieces.BEE, 0)
+            in self._pieces_by_str
+        )
 
     def is_position_empty(self, position: tuple[int, int]) -> bool:
-        return position not in self.positions()
+        return position not in self._top_pieces
 
     def pieces_on_board_str(self, color: notation.PieceColor | None = None) -> set[str]:
         if color is None:
-            return self.pieces_on_board_str(
-                notation.PieceColor.BLACK
-            ) | self.pieces_on_board_str(notation.PieceColor.WHITE)
+            return set(self._pieces_by_str)
         pieces_str = self._pieces[color]["board"]["str"]
         return set(pieces_str)
 
-    def piece(self, piece_str: str) -> p.Piece:  # type: ignore
-        assert piece_str in self.pieces_on_board_str()
-
-        color, *_ = notation.PieceString.decompose(piece_str)
-        for piece in self.pieces(color):
-            if piece.piece_str == piece_str:
-                return copy.deepcopy(piece)
+    def piece(self, piece_str: str) -> p.Piece:
+        assert piece_str in self._pieces_by_str
+        return copy.deepcopy(self._pieces_by_str[piece_str])
 
     def pieces(self, color: notation.PieceColor | None = None) -> set[p.Piece]:
         if color is None:
-            return self.pieces(notation.PieceColor.BLACK) | self.pieces(
-                notation.PieceColor.WHITE
-            )
+            return set(self._pieces_by_str.values())
         pieces = self._pieces[color]["board"]["instances"]
         return set(pieces)
 
@@ -218,49 +289,63 @@ class Hive:
         pieces_str = self._pieces[color]["hand"]["str"]
         return set(pieces_str)
 
+    def position(self, piece_str: str) -> tuple[int, int] | None:
+        """Returns the position of the piece or None if it is not on board."""
+        piece = self._pieces_by_str.get(piece_str)
+        if piece is None:
+            return None
+        return piece.position
+
     def positions(
         self, color: notation.PieceColor | None = None
     ) -> set[tuple[int, int]]:
+        """Returns occupied positions, or the ones with a piece of the color on top."""
         if color is None:
-            return self.positions(notation.PieceColor.BLACK) | self.positions(
-                notation.PieceColor.WHITE
-            )
+            return set(self._top_pieces)
 
         positions = self._pieces[color]["board"]["positions"]
         return set(positions)
 
     def stack_height(self, position: tuple[int, int]) -> int:
-        pieces = self.pieces()
-
-        for piece in pieces:
-            if piece.position == position:
-                height = 1
+        piece = self._top_pieces.get(position)
+        height = 0
+        while piece is not None:
+            height += 1
+            piece = piece.piece_under
+        return height
+
+    def to_planes(
+        self,
+        size: int | None = None,
+        center: tuple[int, int] | None = None,
+        turn_color: notation.PieceColor | None = None,
+    ) -> "np.ndarray":
+        """Returns the NumPy feature planes of the hive, see `planes.encode_hive`.
 
-                p = piece
-                while (p := p.piece_under) is not None:
-                    height += 1
+        The size defaults to `planes.DEFAULT_SIZE`.
+        """
+        import numpy as np
 
-                p = piece
-                while (p := p.piece_above) is not None:
-                    height += 1
+        from honeycomb.engine import planes
 
-                return height
+        if size is None:
+            size = planes.DEFAULT_SIZE
+        out = np.zeros(planes.planes_shape(size), dtype=np.float32)
+        planes.encode_hive(self, out, turn_color, center)
+        return out
 
-        return 0
+    def top_piece(self, position: tuple[int, int]) -> p.Piece | None:
+        return self._top_pieces.get(position)
 
     def move(self, piece_str: str, position: tuple[int, int]) -> None:
-        assert piece_str in self.pieces_on_board_str()
-
-        color, *_ = notation.PieceString.decompose(piece_str)
+        assert piece_str in self._pieces_by_str
 
-        for piece in self.pieces(color):
-            if piece.piece_str == piece_str:
-                start_position = piece.position
-                self._transfer_piece(piece, position)
-                self._moves_stack.push(piece, start_position, position)
-                break
+        piece = self._pieces_by_str[piece_str]
+        start_position = piece.position
+        self._transfer_piece(piece, position)
+        self._moves_stack.push(piece, start_position, position)
 
-    def undo(self, moves_num: int):
+    def undo(self, moves_num: int = 1):
         for _ in range(moves_num):
             if not self._moves_stack:
                 break
@@ -269,10 +354,12 @@ class Hive:
             if start_position is None:
                 color, *_ = notation.PieceString.decompose(piece.piece_str)
 
+                self._hash ^= zobrist_key(piece.piece_str, end_position, 0)
+                self._set_top_piece(end_position, None)
                 self._pieces[color]["board"]["str"].remove(piece.piece_str)
-                self._pieces[color]["board"]["positions"].remove(end_position)
                 self._pieces[color]["board"]["instances"].remove(piece)
                 self._pieces[color]["hand"]["str"].add(piece.piece_str)
+                del self._pieces_by_str[piece.piece_str]
             else:
                 self._transfer_piece(piece, start_position)
 
@@ -285,16 +372,11 @@ class Hive:
         )
         return new_piece
 
-    def _get_top_piece_on_position(self, position: tuple[int, int]) -> p.Piece | None:
-        assert position in self.positions()
-
-        pieces = self.pieces()
-
-        for piece in pieces:
-            if piece.position == position:
-                while piece.piece_above is not None:
-                    piece = piece.piece_above
-                return piece
+    def _piece_level(self, piece: p.Piece) -> int:
+        level = 0
+        while (piece := piece.piece_under) is not None:  # type: ignore
+            level += 1
+        return level
 
     def _register_piece(self, piece: p.Piece) -> None:
         color, *_ = notation.PieceString.decompose(piece.piece_str)
@@ -302,24 +384,44 @@ class Hive:
         self._pieces[color]["hand"]["str"].remove(piece.piece_str)
         self._pieces[color]["board"]["str"].add(piece.piece_str)
         self._pieces[color]["board"]["instances"].add(piece)
-        self._pieces[color]["board"]["positions"].add(piece.position)
+        self._pieces_by_str[piece.piece_str] = piece
+        self._set_top_piece(piece.position, piece)
+
+    def _set_top_piece(self, position: tuple[int, int], piece: p.Piece | None) -> None:
+        """Updates the top piece map and the per color positions of the top pieces."""
+        previous_top_piece = self._top_pieces.get(position)
+        if previous_top_piece is not None:
+            color, *_ = notation.PieceString.decompose(previous_top_piece.piece_str)
+            self._pieces[color]["board"]["positions"].remove(position)
+
+        if piece is None:
+            del self._top_pieces[position]
+        else:
+            color, *_ = notation.PieceString.decompose(piece.piece_str)
+            self._pieces[color]["board"]["positions"].add(position)
+            self._top_pieces[position] = piece
+
+        if self._accumulator is not None:
+            self._accumulator.top_changed(position, previous_top_piece, piece)
 
     def _transfer_piece(self, piece: p.Piece, position: tuple[int, int]) -> None:
-        if piece.piece_under is not None:
-            piece.piece_under.piece_above = piece.piece_above
-
-        if piece.piece_above is not None:
-            piece.piece_above.piece_under = piece.piece_under
+        assert piece.piece_above is None
 
         start_position = piece.position
-        color, *_ = notation.PieceString.decompose(piece.piece_str)
-        self._pieces[color]["board"]["positions"].remove(start_position)
+        self._hash ^= zobrist_key(
+            piece.piece_str, start_position, self._piece_level(piece)
+        )
+
+        piece_under = piece.piece_under
+        if piece_under is not None:
+            piece_under.piece_above = None
+        self._set_top_piece(start_position, piece_under)
 
-        if not self.is_position_empty(position):
-            top_piece_on_position = self._get_top_piece_on_position(position)
-            assert top_piece_on_position is not None
-            piece.piece_under = top_piece_on_position
+        top_piece_on_position = self._top_pieces.get(position)
+        if top_piece_on_position is not None:
             top_piece_on_position.piece_above = piece
+        piece.piece_under = top_piece_on_position
 
         piece.position = position
-        self._pieces[color]["board"]["positions"].add(piece.position)
+        self._set_top_piece(position, piece)
+        self._hash ^= zobrist_key(piece.piece_str, position, self._piece_level(piece))
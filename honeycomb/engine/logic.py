@@ -1,22 +1,74 @@
 import math
 import queue
-from typing import Generator
+import random
+from enum import Enum, auto
+from typing import Generator, NamedTuple
 
 from honeycomb.engine import hive as h
 from honeycomb.engine import notation
 from honeycomb.engine import pieces as p
 
 
-def bee_surrounded(hive: h.Hive, color: notation.PieceColor) -> bool:
+class Move(NamedTuple):
+    """Move of the piece to the destination position. The pass move has neither."""
+
+    piece_str: str | None
+    destination: tuple[int, int] | None
+
+    @property
+    def is_pass(self) -> bool:
+        return self.piece_str is None
+
+
+PASS_MOVE = Move(None, None)
+PASS_MOVE_CODE = 0
+
+
+def encode_move(move: Move) -> int:
+    """Packs the move into an int of 21 bits: piece id + 1, destination row and column.
+
+    The pass move is encoded as 0. Coordinates must fit in the range [-128, 127].
+    """
+    if move.piece_str is None:
+        return PASS_MOVE_CODE
+    assert move.destination is not None
+    row, col = move.destination
+    return (
+        (notation.PieceString.id(move.piece_str) + 1) << 16
+        | ((row + 128) & 0xFF) << 8
+        | (col + 128) & 0xFF
+    )
+
+
+def decode_move(code: int) -> Move:
+    if code == PASS_MOVE_CODE:
+        return PASS_MOVE
+    piece_str = notation.PieceString.from_id((code >> 16) - 1)
+    return Move(piece_str, (((code >> 8) & 0xFF) - 128, (code & 0xFF) - 128))
+
+
+_rng = random.Random()
+
+
+class MoveOrder(Enum):
+    BOARD_FIRST = auto()
+    HAND_FIRST = auto()
+
+
+def bee_neighbours(hive: h.Hive, color: notation.PieceColor) -> int:
+    """Returns the number of occupied positions around the bee, 0 if it is not on board."""
     bee_piece_str = notation.PieceString.build(color, notation.BasePieces.BEE, 0)
-    if bee_piece_str in hive.pieces_on_board_str(color):
-        bee = hive.piece(bee_piece_str)
-        positions_around = set(
-            h.PositionsResolver.positions_around_clockwise(bee.position)
-        )
-        occupied = hive.positions()
-        return len(positions_around - occupied) == 0
-    return False
+    bee_position = hive.position(bee_piece_str)
+    if bee_position is None:
+        return 0
+    return sum(
+        not hive.is_position_empty(pos)
+        for pos in h.PositionsResolver.positions_around_clockwise(bee_position)
+    )
+
+
+def bee_surrounded(hive: h.Hive, color: notation.PieceColor) -> bool:
+    return bee_neighbours(hive, color) == 6
 
 
 class MovesProvider:
@@ -38,43 +90,91 @@ class MovesProvider:
             e for e in notation.ExpansionPieces
         } & self._piece_to_moves_generator.keys()
 
-    def random_valid_move(self, turn_color: notation.PieceColor, turn_num: int) -> str:
-        for piece in self._hive.pieces(turn_color):
-            for pos in self.move_positions(piece):
-                move_str = self._move_str(piece.piece_str, pos)
-                return move_str
-
-        adding_positions = self.adding_positions(turn_color)
-        pieces_str_to_add = self.pieces_str_to_add(turn_color, turn_num)
-        if adding_positions and pieces_str_to_add:
-            move_str = self._move_str(pieces_str_to_add.pop(), adding_positions.pop())
-            return move_str
-        return "pass"
+    def random_valid_move(
+        self,
+        turn_color: notation.PieceColor,
+        turn_num: int,
+        rng: random.Random | None = None,
+    ) -> str:
+        move = self.sample_move(turn_color, turn_num, rng or _rng)
+        return self.move_str(move)
 
     def valid_moves(self, turn_color: notation.PieceColor, turn_num: int) -> set[str]:
-        valid_moves_str = set()
+        return {self.move_str(move) for move in self.iter_moves(turn_color, turn_num)}
 
-        for piece in self._hive.pieces(turn_color):
-            move_positions = set(self.move_positions(piece))
-            for pos in move_positions:
-                move_str = self._move_str(piece.piece_str, pos)
-                valid_moves_str.add(move_str)
+    def iter_moves(
+        self,
+        turn_color: notation.PieceColor,
+        turn_num: int,
+        order: MoveOrder = MoveOrder.BOARD_FIRST,
+    ) -> Generator[Move, None, None]:
+        """Lazily yields every valid move once, or only the pass move if there are none."""
+        if order == MoveOrder.HAND_FIRST:
+            generators = (
+                self._adding_moves(turn_color, turn_num),
+                self._moving_moves(turn_color),
+            )
+        else:
+            generators = (
+                self._moving_moves(turn_color),
+                self._adding_moves(turn_color, turn_num),
+            )
 
-        adding_positions = self.adding_positions(turn_color)
-        pieces_str_to_add = self.pieces_str_to_add(turn_color, turn_num)
-        for pos in adding_positions:
-            for piece_str in pieces_str_to_add:
-                move_str = self._move_str(piece_str, pos)
-                valid_moves_str.add(move_str)
+        has_moves = False
+        for generator in generators:
+            for move in generator:
+                has_moves = True
+                yield move
 
-        if not valid_moves_str:
-            return {"pass"}
+        if not has_moves:
+            yield PASS_MOVE
 
-        return valid_moves_str
+    def count_moves(self, turn_color: notation.PieceColor, turn_num: int) -> int:
+        """Returns the number of valid moves counting the pass move if there are none."""
+        count = sum(
+            len(set(self.move_positions(piece)))
+            for piece in self._hive.pieces(turn_color)
+        )
+        count += len(self.adding_positions(turn_color)) * len(
+            self.pieces_str_to_add(turn_color, turn_num)
+        )
+        return count or 1
+
+    def sample_move(
+        self, turn_color: notation.PieceColor, turn_num: int, rng: random.Random
+    ) -> Move:
+        """Returns a valid move drawn uniformly using the given random generator."""
+        moving_positions = [
+            (piece.piece_str, list(set(self.move_positions(piece))))
+            for piece in self._sorted_pieces(turn_color)
+        ]
+        adding_positions = list(self.adding_positions(turn_color))
+        pieces_str_to_add = sorted(self.pieces_str_to_add(turn_color, turn_num))
+
+        count = sum(len(positions) for _, positions in moving_positions)
+        count += len(adding_positions) * len(pieces_str_to_add)
+        if not count:
+            return PASS_MOVE
+
+        index = rng.randrange(count)
+        for piece_str, positions in moving_positions:
+            if index < len(positions):
+                return Move(piece_str, positions[index])
+            index -= len(positions)
+
+        position_idx, piece_idx = divmod(index, len(pieces_str_to_add))
+        return Move(pieces_str_to_add[piece_idx], adding_positions[position_idx])
+
+    def move_str(self, move: Move) -> str:
+        """Renders the move as a MoveString for the current position."""
+        if move.piece_str is None:
+            return "pass"
+        assert move.destination is not None
+        return self._move_str(move.piece_str, move.destination)
 
     def adding_positions(self, color: notation.PieceColor) -> set[tuple[int, int]]:
         player_pos = self._hive.positions(color)
-        opponent_pos = self._hive.positions(_opponent_color(color))
+        opponent_pos = self._hive.positions(opponent_color(color))
 
         if not player_pos:
             if not opponent_pos:
@@ -188,27 +288,51 @@ class MovesProvider:
 
         return self._hive_search(frontier, visited, occupied, targets, heuristic_target)
 
-    def _move_str(self, piece_str, target_position: tuple[int, int]) -> str:  # type: ignore
-        if not self._hive.positions():
-            return notation.MoveString.build(piece_str)
+    def _move_str(self, piece_str, target_position: tuple[int, int]) -> str:
+        """Renders the move referencing the first piece found clockwise around the target.
+
+        A piece climbing onto a stack references the top piece of that stack.
+        """
+        top_piece = self._hive.top_piece(target_position)
+        if top_piece is not None and top_piece.piece_str != piece_str:
+            return notation.MoveString.build(piece_str, ".", top_piece.piece_str)
 
-        positions_on_board = self._hive.positions()
         for pos_around in h.PositionsResolver.positions_around_clockwise(
             target_position
         ):
-            if pos_around in positions_on_board:
-                for ref_piece in self._hive.pieces():
-                    if (
-                        ref_piece.position == pos_around
-                        and ref_piece.piece_str != piece_str
-                    ):
-                        relation = h.PositionsResolver.relation(
-                            target_position, pos_around
-                        )
-                        move_str = notation.MoveString.build(
-                            piece_str, relation, ref_piece.piece_str
-                        )
-                        return move_str
+            ref_piece = self._hive.top_piece(pos_around)
+            if ref_piece is not None and ref_piece.piece_str == piece_str:
+                ref_piece = ref_piece.piece_under
+            if ref_piece is not None:
+                relation = h.PositionsResolver.relation(target_position, pos_around)
+                return notation.MoveString.build(
+                    piece_str, relation, ref_piece.piece_str
+                )
+
+        return notation.MoveString.build(piece_str)
+
+    def _adding_moves(
+        self, turn_color: notation.PieceColor, turn_num: int
+    ) -> Generator[Move, None, None]:
+        pieces_str_to_add = sorted(self.pieces_str_to_add(turn_color, turn_num))
+        if not pieces_str_to_add:
+            return
+        for pos in self.adding_positions(turn_color):
+            for piece_str in pieces_str_to_add:
+                yield Move(piece_str, pos)
+
+    def _moving_moves(
+        self, turn_color: notation.PieceColor
+    ) -> Generator[Move, None, None]:
+        for piece in self._sorted_pieces(turn_color):
+            seen = set()
+            for pos in self.move_positions(piece):
+                if pos not in seen:
+                    seen.add(pos)
+                    yield Move(piece.piece_str, pos)
+
+    def _sorted_pieces(self, color: notation.PieceColor) -> list[p.Piece]:
+        return sorted(self._hive.pieces(color), key=_piece_str_key)
 
     def _search_heuristic(self, current: tuple[int, int], target: tuple[int, int]):
         return math.sqrt(sum(((t - c) ** 2 for t, c in zip(target, current))))
@@ -329,7 +453,11 @@ class MovesProvider:
                 yield pos
 
 
-def _opponent_color(color: notation.PieceColor):
+def _piece_str_key(piece: p.Piece) -> str:
+    return piece.piece_str
+
+
+def opponent_color(color: notation.PieceColor):
     return (
         notation.PieceColor.WHITE
         if color == notation.PieceColor.BLACK
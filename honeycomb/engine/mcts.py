@@ -0,0 +1,459 @@
+import math
+import random
+import time
+from threading import Event
+from typing import TYPE_CHECKING
+
+from honeycomb.engine import logic, notation
+from honeycomb.engine.game import Game
+from honeycomb.engine.search import (
+    ProgressCallback,
+    SearchLimits,
+    SearchResult,
+    line_str,
+)
+
+if TYPE_CHECKING:
+    from honeycomb.engine.evaluation import Evaluation, EvaluationQueue
+
+_RESULT_REWARD = {
+    notation.GameState.WhiteWins: 1.0,
+    notation.GameState.BlackWins: 0.0,
+    notation.GameState.Draw: 0.5,
+}
+
+
+class Node:
+    """Search tree node. Its value is kept from the view of the player who moved."""
+
+    __slots__ = (
+        "move",
+        "color",
+        "parent",
+        "children",
+        "untried",
+        "visits",
+        "value",
+        "prior",
+        "priors",
+    )
+
+    def __init__(self) -> None:
+        self.move: logic.Move = logic.PASS_MOVE
+        self.color = notation.PieceColor.BLACK
+        self.parent: "Node | None" = None
+        self.children: list["Node"] = []
+        self.untried: list[logic.Move] | None = None
+        self.visits = 0
+        self.value = 0.0
+        self.prior = 1.0
+        self.priors: dict[logic.Move, float] | None = None
+
+
+class NodePool:
+    """Recycles nodes and bounds the number of nodes alive in the tree."""
+
+    __slots__ = "_free", "capacity", "size"
+
+    def __init__(self, capacity: int) -> None:
+        self._free: list[Node] = []
+        self.capacity = capacity
+        self.size = 0
+
+    def acquire(
+        self,
+        move: logic.Move,
+        color: notation.PieceColor,
+        parent: Node | None,
+        prior: float = 1.0,
+    ) -> Node | None:
+        """Returns an initialized node or None if the pool is exhausted."""
+        if self.size >= self.capacity:
+            return None
+        node = self._free.pop() if self._free else Node()
+        node.move = move
+        node.color = color
+        node.parent = parent
+        node.children = []
+        node.untried = None
+        node.visits = 0
+        node.value = 0.0
+        node.prior = prior
+        node.priors = None
+        self.size += 1
+        return node
+
+    def release(self, node: Node, keep: Node | None = None) -> None:
+        """Returns the subtree of the node to the pool except the `keep` subtree."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node is keep:
+                continue
+            stack.extend(node.children)
+            node.children = []
+            node.parent = None
+            node.untried = None
+            node.priors = None
+            self._free.append(node)
+            self.size -= 1
+
+
+class MctsSearch:
+    """Monte Carlo Tree Search with UCT or PUCT selection and random playouts.
+
+    The tree is kept between searches and its subtree is reused when the game
+    continues from the position searched before. With an evaluation queue the
+    leaves are evaluated in batches instead of played out, and the policy of
+    the evaluation gives the PUCT priors.
+    """
+
+    __slots__ = (
+        "_evaluator",
+        "_exploration",
+        "_playout_depth",
+        "_pool",
+        "_rng",
+        "_root",
+        "_root_moves",
+        "_selection",
+    )
+
+    def __init__(
+        self,
+        selection: str = "UCT",
+        exploration: float = 1.4,
+        playout_depth: int = 10,
+        max_nodes: int = 200000,
+        seed: int | None = None,
+        evaluator: "EvaluationQueue | None" = None,
+    ) -> None:
+        self._evaluator = evaluator
+        self._exploration = exploration
+        self._playout_depth = playout_depth
+        self._pool = NodePool(max_nodes)
+        self._rng = random.Random(seed)
+        self._root: Node | None = None
+        self._root_moves: list[logic.Move] = []
+        self._selection = selection
+
+    def configure(
+        self, selection: str, exploration: float, playout_depth: int, max_nodes: int
+    ) -> None:
+        """Changes the parameters dropping the tree if the selection rule changes."""
+        if selection != self._selection:
+            self.clear()
+        self._selection = selection
+        self._exploration = exploration
+        self._playout_depth = playout_depth
+        self._pool.capacity = max_nodes
+
+    def clear(self) -> None:
+        if self._root is not None:
+            self._pool.release(self._root)
+        self._root = None
+        self._root_moves = []
+
+    def search(
+        self,
+        game: Game,
+        limits: SearchLimits,
+        stop: Event | None = None,
+        on_progress: ProgressCallback | None = None,
+        progress_interval: float | None = None,
+    ) -> SearchResult:
+        """Runs playouts until a limit is reached or `stop` is set.
+
+        With a `progress_interval`, `on_progress` is called every that many
+        seconds with the result so far.
+        """
+        start = time.perf_counter()
+        deadline = limits.deadline(start)
+        root = self.root(game)
+        next_report = None
+        if on_progress is not None and progress_interval:
+            next_report = start + progress_interval
+
+        playouts = 0
+        while limits.depth is None or playouts < limits.depth:
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline:
+                break
+            if next_report is not None and now >= next_report:
+                on_progress(self.result(game, root, playouts, now - start))  # type: ignore
+                next_report = now + progress_interval  # type: ignore
+            if stop is not None and stop.is_set():
+                break
+            if game.is_over:
+                break
+            if self._evaluator is not None:
+                remaining = self._evaluator.batch_size
+                if limits.depth is not None:
+                    remaining = min(remaining, limits.depth - playouts)
+                playouts += self._iterate_batch(game, root, remaining)
+            else:
+                self._iterate(game, root)
+                playouts += 1
+
+        return self.result(game, root, playouts, time.perf_counter() - start)
+
+    def analyze(
+        self,
+        game: Game,
+        limits: SearchLimits,
+        count: int,
+        stop: Event | None = None,
+        on_progress: ProgressCallback | None = None,
+        progress_interval: float | None = None,
+    ) -> list[SearchResult]:
+        """Runs the search and returns the `count` most visited root moves."""
+        best = self.search(game, limits, stop, on_progress, progress_interval)
+        assert self._root is not None
+        children = sorted(self._root.children, key=_visits, reverse=True)[:count]
+        results = []
+        for child in children:
+            line = [child.move, *self._principal_variation(child)]
+            results.append(
+                SearchResult(
+                    move=child.move,
+                    move_str=game.move_str(child.move),
+                    score=child.value / child.visits if child.visits else None,
+                    depth=len(line),
+                    nodes=best.nodes,
+                    elapsed=best.elapsed,
+                    pv=line_str(game, line),
+                )
+            )
+        return results or [best]
+
+    def descend(self, game: Game, root: Node) -> tuple[Node, int]:
+        """Selects and expands a leaf, playing the moves leading to it on the game.
+
+        Returns the leaf and the number of moves played.
+        """
+        node = root
+        depth = 0
+        while node.untried is not None and not node.untried and node.children:
+            node = self._select(node)
+            game.push(node.move, validate=False)
+            depth += 1
+
+        if not game.is_over:
+            child = self._expand(game, node)
+            if child is not node:
+                node = child
+                depth += 1
+        return node, depth
+
+    def result(
+        self, game: Game, root: Node, playouts: int, elapsed: float
+    ) -> SearchResult:
+        line = self._principal_variation(root)
+        if line:
+            best = max(root.children, key=_visits)
+            move = best.move
+            score = best.value / best.visits if best.visits else None
+        else:
+            move = game.sample_move(self._rng)
+            score = None
+
+        return SearchResult(
+            move=move,
+            move_str=game.move_str(move),
+            score=score,
+            depth=len(line),
+            nodes=playouts,
+            elapsed=elapsed,
+            pv=line_str(game, line) if line else [game.move_str(move)],
+        )
+
+    def expected_reply(self, move: logic.Move) -> logic.Move | None:
+        """Returns the most visited reply to the root move in the tree."""
+        if self._root is None:
+            return None
+        node = next((c for c in self._root.children if c.move == move), None)
+        if node is None or not node.children:
+            return None
+        return max(node.children, key=_visits).move
+
+    def root(self, game: Game) -> Node:
+        """Returns the root for the game position, reusing the matching subtree."""
+        moves = game.moves
+        root = self._root
+        if root is not None and moves[: len(self._root_moves)] == self._root_moves:
+            for move in moves[len(self._root_moves) :]:
+                root = next((c for c in root.children if c.move == move), None)
+                if root is None:
+                    break
+        else:
+            root = None
+
+        if root is None:
+            self.clear()
+            root = self._pool.acquire(
+                logic.PASS_MOVE, logic.opponent_color(game.turn_color), None
+            )
+            assert root is not None
+        elif root is not self._root:
+            assert self._root is not None
+            self._pool.release(self._root, keep=root)
+            root.parent = None
+
+        self._root = root
+        self._root_moves = moves
+        return root
+
+    def _expand(self, game: Game, node: Node) -> Node:
+        if node.untried is None:
+            node.untried = game.legal_moves()
+            self._rng.shuffle(node.untried)
+
+        if self._selection == "PUCT":
+            prior = 1 / len(node.untried) if node.untried else 1.0
+            while node.untried:
+                move = node.untried[-1]
+                if node.priors is not None:
+                    prior = node.priors.get(move, 0.0)
+                child = self._pool.acquire(move, game.turn_color, node, prior)
+                if child is None:
+                    break
+                node.untried.pop()
+                node.children.append(child)
+            if not node.children:
+                return node
+            child = self._select(node)
+        else:
+            if not node.untried:
+                return node
+            child = self._pool.acquire(node.untried[-1], game.turn_color, node)
+            if child is None:
+                return node
+            node.untried.pop()
+            node.children.append(child)
+
+        game.push(child.move, validate=False)
+        return child
+
+    def _iterate(self, game: Game, root: Node) -> None:
+        node, depth = self.descend(game, root)
+        add_visit(node)
+        add_reward(node, playout(game, self._rng, self._playout_depth))
+        game.undo(depth)
+
+    def _iterate_batch(self, game: Game, root: Node, leaves_num: int) -> int:
+        """Evaluates up to `leaves_num` leaves at once and returns their number.
+
+        The leaves selected before the batch is evaluated hold a virtual loss,
+        so the selections spread over the tree.
+        """
+        assert self._evaluator is not None
+        if root.untried is None:
+            evaluation = self._evaluator.submit(game)
+            self._evaluator.flush()
+            self._evaluate(root, game.turn_color, evaluation)
+
+        pending: list[tuple[Node, notation.PieceColor, "Evaluation"]] = []
+        for _ in range(leaves_num):
+            node, depth = self.descend(game, root)
+            add_visit(node)
+            if game.is_over:
+                add_reward(node, _RESULT_REWARD[game.state])
+            else:
+                pending.append((node, game.turn_color, self._evaluator.submit(game)))
+            game.undo(depth)
+
+        self._evaluator.flush()
+        for node, color, evaluation in pending:
+            add_reward(node, self._evaluate(node, color, evaluation))
+        return leaves_num
+
+    def _evaluate(
+        self, node: Node, color: notation.PieceColor, evaluation: "Evaluation"
+    ) -> float:
+        """Stores the moves and the priors of the node and returns its reward."""
+        priors, value = evaluation.result()
+        if node.untried is None and not node.children:
+            node.untried = evaluation.moves
+            if priors is not None:
+                node.priors = dict(zip(evaluation.moves, priors))
+        if color == notation.PieceColor.WHITE:
+            return (1 + value) / 2
+        return (1 - value) / 2
+
+    def _select(self, node: Node) -> Node:
+        log_visits = math.log(node.visits) if node.visits else 0.0
+        sqrt_visits = math.sqrt(node.visits)
+        best_score = -math.inf
+        best = node.children[0]
+        for child in node.children:
+            q = child.value / child.visits if child.visits else 0.5
+            if self._selection == "PUCT":
+                u = child.prior * sqrt_visits / (1 + child.visits)
+            elif child.visits:
+                u = math.sqrt(log_visits / child.visits)
+            else:
+                u = math.inf
+            score = q + self._exploration * u
+            if score > best_score:
+                best_score = score
+                best = child
+        return best
+
+    def _principal_variation(self, root: Node) -> list[logic.Move]:
+        """Follows the most visited children from the root."""
+        line = []
+        node = root
+        while node.children:
+            node = max(node.children, key=_visits)
+            line.append(node.move)
+        return line
+
+
+def add_reward(node: Node | None, reward: float) -> None:
+    """Adds the reward of the white player to the values up to the root."""
+    while node is not None:
+        node.value += reward if node.color == notation.PieceColor.WHITE else 1 - reward
+        node = node.parent
+
+
+def add_visit(node: Node | None) -> None:
+    """Counts a visit up to the root.
+
+    A visit counted before its reward is added works as a virtual loss, it
+    steers parallel selections away from the path until the reward arrives.
+    """
+    while node is not None:
+        node.visits += 1
+        node = node.parent
+
+
+def remove_visit(node: Node | None) -> None:
+    """Takes back a visit whose reward will never arrive."""
+    while node is not None:
+        node.visits -= 1
+        node = node.parent
+
+
+def playout(game: Game, rng: random.Random, max_depth: int) -> float:
+    """Plays random moves and returns the reward of the white player."""
+    depth = 0
+    while not game.is_over and depth < max_depth:
+        game.push(game.sample_move(rng), validate=False)
+        depth += 1
+
+    reward = _RESULT_REWARD.get(game.state)
+    if reward is None:
+        reward = heuristic_reward(game)
+    game.undo(depth)
+    return reward
+
+
+def heuristic_reward(game: Game) -> float:
+    """Estimates the reward of the white player from the surroundings of the bees."""
+    white_neighbours = logic.bee_neighbours(game.hive, notation.PieceColor.WHITE)
+    black_neighbours = logic.bee_neighbours(game.hive, notation.PieceColor.BLACK)
+    return 0.5 + (black_neighbours - white_neighbours) / 12
+
+
+def _visits(node: Node) -> int:
+    return node.visits
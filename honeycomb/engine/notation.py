@@ -1,3 +1,4 @@
+import itertools
 import re
 from enum import Enum, auto
 
@@ -5,6 +6,14 @@ from honeycomb.engine import err
 
 PIECE_MAX_NUM = 3
 
+_GAME_PATTERN = re.compile("([^;]*);([^;]*);([^;]*)(?:;(.*))?")
+_GAME_VALID_PATTERN = re.compile("([^;]*);([^;]*);([^;]*)(?:(;.*)*)")
+_GAMETYPE_PATTERN = re.compile("Base(?:\\+(M|L|P)(M|L|P)?(M|L|P)?)?")
+_PIECE_PATTERN = re.compile(
+    "([bw])(?:(?:(Q))|(?:([SB])([12]))|(?:([AG])([1-3]))|(?:(M))|(?:(L))|(?:(P)))"
+)
+_TURN_PATTERN = re.compile("(White|Black)\\[([1-9]\\d*)\\]")
+
 
 class NotationError(err.BaseEngineError):
     pass
@@ -72,30 +81,15 @@ def pieces_str(color: PieceColor, expansion_pieces: set[ExpansionPieces] | None
     if expansion_pieces is None:
         expansion_pieces = set()
 
-    pieces_str = set()
-
-    color_str = color.value
-    ptype_strs = {base_piece.value for base_piece in BasePieces}
-    ptype_strs |= {
-        expansion_piece.value
-        for expansion_piece in ExpansionPieces
-        if expansion_piece in expansion_pieces
+    return {
+        piece_str
+        for piece_str in _COLOR_TO_PIECES_STR[color]
+        if not isinstance(ptype := _PIECE_STR_TO_PARTS[piece_str][1], ExpansionPieces)
+        or ptype in expansion_pieces
     }
-    num_strs = {str(num) for num in range(1, PIECE_MAX_NUM + 1)}
-    num_strs.add("")
-
-    for ptype_str in ptype_strs:
-        for num_str in num_strs:
-            piece_str = color_str + ptype_str + num_str
-            if PieceString.is_valid(piece_str):
-                pieces_str.add(piece_str)
-
-    return pieces_str
 
 
 class MoveString:
-    _relation_signs = frozenset({"/", "-", "\\"})
-
     @classmethod
     def build(
         cls,
@@ -103,6 +97,9 @@ class MoveString:
         relation: str | None = None,
         ref_piece_str: str | None = None,
     ) -> str:
+        move_str = _MOVE_PARTS_TO_STR.get((piece_str, relation, ref_piece_str))
+        if move_str is not None:
+            return move_str
         if relation is not None and ref_piece_str is not None:
             move_part = relation.replace(".", ref_piece_str)
             return f"{piece_str} {move_part}"
@@ -121,51 +118,14 @@ class MoveString:
         Raises:
             InvalidMoveStrinError: If move_str is not a valid MoveString
         """
-        if move_str == "pass":
-            return (None,)
-        prog = re.compile("(\\S+)(?: (\\S+))?")
-        if match := prog.fullmatch(move_str):
-            piece_str, moving_part = match.groups()
-            if PieceString.is_valid(piece_str):
-                if moving_part is None:
-                    return (piece_str,)
-
-                relation = "."
-                ref_piece_str = moving_part
-
-                if moving_part[0] in cls._relation_signs:
-                    relation = moving_part[0] + relation
-                    ref_piece_str = moving_part[1:]
-                elif moving_part[-1] in cls._relation_signs:
-                    relation = relation + moving_part[-1]
-                    ref_piece_str = moving_part[:-1]
-
-                if PieceString.is_valid(ref_piece_str):
-                    return piece_str, relation, ref_piece_str
-
+        move_str_parts = _MOVE_STR_TO_PARTS.get(move_str)
+        if move_str_parts is not None:
+            return move_str_parts
         raise InvalidMoveStringError(f"Invalid MoveString: {move_str}.")
 
     @classmethod
     def is_valid(cls, move_str: str) -> bool:
-        if move_str == "pass":
-            return True
-        prog = re.compile("(\\S+)(?: (\\S+))?")
-        if match := prog.fullmatch(move_str):
-            piece_str, moving_part = match.groups()
-            if PieceString.is_valid(piece_str):
-                if moving_part is None:
-                    return True
-
-                ref_piece_str = moving_part
-
-                if moving_part[0] in cls._relation_signs:
-                    ref_piece_str = moving_part[1:]
-                elif moving_part[-1] in cls._relation_signs:
-                    ref_piece_str = moving_part[:-1]
-
-                if PieceString.is_valid(ref_piece_str):
-                    return True
-        return False
+        return move_str in _MOVE_STR_TO_PARTS
 
 
 class GameTypeString:
@@ -179,8 +139,7 @@ class GameTypeString:
 
     @classmethod
     def decompose(cls, gametype: str) -> set[ExpansionPieces]:
-        prog = re.compile("Base(?:\\+(M|L|P)(M|L|P)?(M|L|P)?)?")
-        if match := prog.fullmatch(gametype):
+        if match := _GAMETYPE_PATTERN.fullmatch(gametype):
             return set(
                 [
                     ExpansionPieces(group)
@@ -192,8 +151,7 @@ class GameTypeString:
 
     @classmethod
     def is_valid(cls, gametype: str) -> bool:
-        prog = re.compile("Base(?:\\+(M|L|P)(M|L|P)?(M|L|P)?)?")
-        return prog.fullmatch(gametype) is not None
+        return _GAMETYPE_PATTERN.fullmatch(gametype) is not None
 
 
 class TurnString:
@@ -203,8 +161,7 @@ class TurnString:
 
     @classmethod
     def decompose(cls, turn_str: str) -> tuple[PieceColor, int]:
-        prog = re.compile("(White|Black)\\[([1-9]\\d*)\\]")
-        if match := prog.fullmatch(turn_str):
+        if match := _TURN_PATTERN.fullmatch(turn_str):
             turn_color, turn_num = match.groups()
             return PieceColor[turn_color.upper()], int(turn_num)
 
@@ -234,9 +191,7 @@ class GameString:
     def decompose(
         cls, game_str: str
     ) -> tuple[set[ExpansionPieces], GameState, PieceColor, int, list[str]]:
-        # TODO: Refactor all string building, decomposing and validating classes so that there is only one regex compilation per runtime
-        prog = re.compile("([^;]*);([^;]*);([^;]*)(?:;(.*))?")
-        if match := prog.fullmatch(game_str):
+        if match := _GAME_PATTERN.fullmatch(game_str):
             gametype_str, gamestate_str, turn_str, moves_part = match.groups()
             expansion_pieces = GameTypeString.decompose(gametype_str)
             gamestate = GameState[gamestate_str]
@@ -255,8 +210,7 @@ class GameString:
 
     @classmethod
     def is_valid(cls, game_str: str) -> bool:
-        prog = re.compile("([^;]*);([^;]*);([^;]*)(?:(;.*)*)")
-        return prog.fullmatch(game_str) is not None
+        return _GAME_VALID_PATTERN.fullmatch(game_str) is not None
 
 
 class PieceString:
@@ -275,10 +229,32 @@ class PieceString:
     def decompose(
         cls, piece_str: str
     ) -> tuple[PieceColor, PieceType] | tuple[PieceColor, PieceType, int]:
-        prog = re.compile(
-            "([bw])(?:(?:(Q))|(?:([SB])([12]))|(?:([AG])([1-3]))|(?:(M))|(?:(L))|(?:(P)))"
-        )
-        if match := prog.fullmatch(piece_str):
+        piece_str_parts = _PIECE_STR_TO_PARTS.get(piece_str)
+        if piece_str_parts is not None:
+            return piece_str_parts
+        raise InvalidPieceStringError(f"Invalid PieceString: {piece_str}.")
+
+    @classmethod
+    def from_id(cls, piece_id: int) -> str:
+        return PIECES_STR[piece_id]
+
+    @classmethod
+    def id(cls, piece_str: str) -> int:
+        """Returns the index of the piece in PIECES_STR."""
+        piece_id = _PIECE_STR_TO_ID.get(piece_str)
+        if piece_id is not None:
+            return piece_id
+        raise InvalidPieceStringError(f"Invalid PieceString: {piece_str}.")
+
+    @classmethod
+    def is_valid(cls, piece_str: str) -> bool:
+        return piece_str in _PIECE_STR_TO_PARTS
+
+    @classmethod
+    def _parse(
+        cls, piece_str: str
+    ) -> tuple[PieceColor, PieceType] | tuple[PieceColor, PieceType, int] | None:
+        if match := _PIECE_PATTERN.fullmatch(piece_str):
             color_str, type_str, *num = [
                 group for group in match.groups() if group is not None
             ]
@@ -291,12 +267,46 @@ class PieceString:
             if num:
                 return color, type_, int(num[0])
             return color, type_
-
-        raise InvalidPieceStringError(f"Invalid PieceString: {piece_str}.")
-
-    @classmethod
-    def is_valid(cls, piece_str: str) -> bool:
-        prog = re.compile(
-            "([bw])(?:(?:(Q))|(?:([SB])([12]))|(?:([AG])([1-3]))|(?:(M))|(?:(L))|(?:(P)))"
-        )
-        return prog.fullmatch(piece_str) is not None
+        return None
+
+
+RELATIONS = ("./", ".-", ".\\", "/.", "-.", "\\.", ".")
+
+
+def _pieces_str_table() -> tuple[str, ...]:
+    """Returns all the valid piece strings ordered by color, type and number."""
+    pieces_str = []
+    for color in PieceColor:
+        for ptype in itertools.chain(BasePieces, ExpansionPieces):
+            for num_str in ["", *(str(num) for num in range(1, PIECE_MAX_NUM + 1))]:
+                piece_str = color.value + ptype.value + num_str
+                if PieceString._parse(piece_str) is not None:
+                    pieces_str.append(piece_str)
+    return tuple(pieces_str)
+
+
+PIECES_STR = _pieces_str_table()
+_PIECE_STR_TO_ID = {piece_str: i for i, piece_str in enumerate(PIECES_STR)}
+_PIECE_STR_TO_PARTS = {
+    piece_str: PieceString._parse(piece_str) for piece_str in PIECES_STR
+}
+_COLOR_TO_PIECES_STR = {
+    color: tuple(
+        piece_str
+        for piece_str in PIECES_STR
+        if _PIECE_STR_TO_PARTS[piece_str][0] == color  # type: ignore
+    )
+    for color in PieceColor
+}
+
+_MOVE_STR_TO_PARTS: dict[str, tuple[None] | tuple[str] | tuple[str, str, str]] = {
+    "pass": (None,)
+}
+_MOVE_PARTS_TO_STR: dict[tuple[str, str | None, str | None], str] = {}
+for _piece_str in PIECES_STR:
+    _MOVE_STR_TO_PARTS[_piece_str] = (_piece_str,)
+    _MOVE_PARTS_TO_STR[(_piece_str, None, None)] = _piece_str
+    for _relation, _ref_piece_str in itertools.product(RELATIONS, PIECES_STR):
+        _move_str = f"{_piece_str} {_relation.replace('.', _ref_piece_str)}"
+        _MOVE_STR_TO_PARTS[_move_str] = (_piece_str, _relation, _ref_piece_str)
+        _MOVE_PARTS_TO_STR[(_piece_str, _relation, _ref_piece_str)] = _move_str
@@ -0,0 +1,180 @@
+import abc
+from typing import Any
+
+from honeycomb.engine import err
+
+
+class OptionError(err.BaseEngineError):
+    pass
+
+
+class InvalidOptionName(OptionError):
+    def __init__(self, name: str):
+        self.message = f"Invalid option name: '{name}'."
+
+
+class InvalidOptionValue(OptionError):
+    def __init__(self, name: str, value: str):
+        self.message = f"Invalid value: '{value}' for the option: '{name}'."
+
+
+class Option(abc.ABC):
+    """Engine option printed in the UHP format: Name;Type;Value;Default[;...]."""
+
+    __slots__ = "name", "default", "value"
+    type_name = ""
+
+    def __init__(self, name: str, default: Any):
+        self.name = name
+        self.default = default
+        self.value = default
+
+    def __str__(self) -> str:
+        return ";".join(
+            [
+                self.name,
+                self.type_name,
+                self._format(self.value),
+                self._format(self.default),
+                *self._constraints(),
+            ]
+        )
+
+    def set(self, value_str: str) -> None:
+        self.value = self._parse(value_str)
+
+    def _constraints(self) -> list[str]:
+        return []
+
+    def _format(self, value: Any) -> str:
+        return str(value)
+
+    @abc.abstractmethod
+    def _parse(self, value_str: str) -> Any:
+        """Returns the value of the string, raises InvalidOptionValue if invalid."""
+
+
+class BoolOption(Option):
+    __slots__ = ()
+    type_name = "bool"
+
+    def _parse(self, value_str: str) -> bool:
+        if value_str not in ("True", "False"):
+            raise InvalidOptionValue(self.name, value_str)
+        return value_str == "True"
+
+
+class EnumOption(Option):
+    __slots__ = "values"
+    type_name = "enum"
+
+    def __init__(self, name: str, default: str, values: list[str]):
+        super().__init__(name, default)
+        self.values = values
+
+    def _constraints(self) -> list[str]:
+        return self.values
+
+    def _parse(self, value_str: str) -> str:
+        if value_str not in self.values:
+            raise InvalidOptionValue(self.name, value_str)
+        return value_str
+
+
+class IntOption(Option):
+    __slots__ = "min", "max"
+    type_name = "int"
+
+    def __init__(self, name: str, default: int, min: int, max: int):
+        super().__init__(name, default)
+        self.min = min
+        self.max = max
+
+    def _constraints(self) -> list[str]:
+        return [self._format(self.min), self._format(self.max)]
+
+    def _parse(self, value_str: str) -> int:
+        try:
+            value = int(value_str)
+        except ValueError:
+            raise InvalidOptionValue(self.name, value_str)
+        if not self.min <= value <= self.max:
+            raise InvalidOptionValue(self.name, value_str)
+        return value
+
+
+class DoubleOption(Option):
+    __slots__ = "min", "max"
+    type_name = "double"
+
+    def __init__(self, name: str, default: float, min: float, max: float):
+        super().__init__(name, default)
+        self.min = min
+        self.max = max
+
+    def _constraints(self) -> list[str]:
+        return [self._format(self.min), self._format(self.max)]
+
+    def _parse(self, value_str: str) -> float:
+        try:
+            value = float(value_str)
+        except ValueError:
+            raise InvalidOptionValue(self.name, value_str)
+        if not self.min <= value <= self.max:
+            raise InvalidOptionValue(self.name, value_str)
+        return value
+
+
+def default_options() -> list[Option]:
+    return [
+        EnumOption("SearchMode", "Random", ["Random", "MCTS", "AlphaBeta"]),
+        EnumOption("MctsSelection", "UCT", ["UCT", "PUCT"]),
+        DoubleOption("MctsExploration", 1.4, 0.0, 10.0),
+        IntOption("MctsPlayoutDepth", 10, 0, 200),
+        IntOption("MctsMaxNodes", 200000, 1, 10000000),
+        EnumOption("MctsParallelism", "Tree", ["Tree", "Root"]),
+        IntOption("SearchProcesses", 1, 1, 64),
+        IntOption("HashSizeMB", 16, 1, 4096),
+        BoolOption("AlphaBetaPVS", True),
+        BoolOption("AlphaBetaAspiration", True),
+        BoolOption("AlphaBetaLMR", True),
+        BoolOption("AlphaBetaFutility", False),
+        IntOption("ProofMaxNodes", 100000, 1, 100000000),
+        IntOption("ProofMaxPlies", 9, 1, 63),
+        BoolOption("ProofPreSearch", False),
+        BoolOption("Ponder", False),
+        BoolOption("SearchProgress", False),
+        DoubleOption("ProgressInterval", 1.0, 0.0, 3600.0),
+        BoolOption("OwnBook", True),
+        IntOption("BookMinGames", 1, 1, 1000000),
+    ]
+
+
+class EngineOptions:
+    """Named engine options that can be listed, read and set with UHP commands."""
+
+    __slots__ = "_options"
+
+    def __init__(self, options: list[Option] | None = None) -> None:
+        if options is None:
+            options = default_options()
+        self._options = {option.name: option for option in options}
+
+    def __getitem__(self, name: str) -> Any:
+        return self._option(name).value
+
+    def __str__(self) -> str:
+        return "\n".join(str(option) for option in self._options.values())
+
+    def get(self, name: str) -> str:
+        return str(self._option(name))
+
+    def set(self, name: str, value_str: str) -> str:
+        option = self._option(name)
+        option.set(value_str)
+        return str(option)
+
+    def _option(self, name: str) -> Option:
+        if name not in self._options:
+            raise InvalidOptionName(name)
+        return self._options[name]
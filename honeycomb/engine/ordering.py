@@ -0,0 +1,106 @@
+from honeycomb.engine import hive as h
+from honeycomb.engine import logic, notation
+from honeycomb.engine.game import Game
+
+KILLERS_PER_PLY = 2
+
+_HASH_MOVE_SCORE = 1 << 30
+_TACTICAL_SCORE = 1 << 24
+_KILLER_SCORE = 1 << 20
+_HISTORY_MAX = 1 << 16
+
+
+class MoveOrderer:
+    """Orders the moves of a search so that the likely best ones come first.
+
+    The move stored in the transposition table comes first, then the moves
+    bringing a piece next to the opponent bee, then the killer moves that
+    caused a cutoff at the same ply, and the rest by the history of cutoffs
+    of the piece type on the destination.
+    """
+
+    __slots__ = "_history", "_killers"
+
+    def __init__(self) -> None:
+        self._history: dict[tuple[str, tuple[int, int]], int] = {}
+        self._killers: list[list[logic.Move]] = []
+
+    def age(self) -> None:
+        """Halves the history and forgets the killers before a new search."""
+        self._history = {key: score // 2 for key, score in self._history.items()}
+        self._killers = []
+
+    def clear(self) -> None:
+        self._history.clear()
+        self._killers = []
+
+    def cutoff(self, move: logic.Move, depth: int, ply: int) -> None:
+        """Records the move that caused a beta cutoff at the ply."""
+        if move.is_pass:
+            return
+        while len(self._killers) <= ply:
+            self._killers.append([])
+        killers = self._killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[KILLERS_PER_PLY:]
+
+        key = _history_key(move)
+        self._history[key] = min(
+            self._history.get(key, 0) + depth * depth, _HISTORY_MAX
+        )
+
+    def order(
+        self,
+        game: Game,
+        moves: list[logic.Move],
+        ply: int,
+        hash_move: logic.Move | None = None,
+    ) -> list[logic.Move]:
+        """Sorts the moves in place, keeping the order of equally scored ones."""
+        killers = self._killers[ply] if ply < len(self._killers) else []
+        bee_neighbours = opponent_bee_neighbours(game)
+        history = self._history
+
+        def score(move: logic.Move) -> int:
+            if move.is_pass:
+                return 0
+            if move == hash_move:
+                return _HASH_MOVE_SCORE
+            value = history.get(_history_key(move), 0)
+            if move in killers:
+                value += _KILLER_SCORE
+            if is_tactical(game, move, bee_neighbours):
+                value += _TACTICAL_SCORE
+            return value
+
+        moves.sort(key=score, reverse=True)
+        return moves
+
+
+def is_tactical(
+    game: Game, move: logic.Move, bee_neighbours: tuple[tuple[int, int], ...]
+) -> bool:
+    """Tells if the move brings a piece next to the opponent bee.
+
+    `bee_neighbours` are the positions around the bee, see
+    `opponent_bee_neighbours`.
+    """
+    return (
+        move.destination in bee_neighbours
+        and game.hive.position(move.piece_str) not in bee_neighbours  # type: ignore
+    )
+
+
+def opponent_bee_neighbours(game: Game) -> tuple[tuple[int, int], ...]:
+    opponent = logic.opponent_color(game.turn_color)
+    bee_str = notation.PieceString.build(opponent, notation.BasePieces.BEE, 0)
+    bee_position = game.hive.position(bee_str)
+    if bee_position is None:
+        return ()
+    return h.PositionsResolver.positions_around_clockwise(bee_position)
+
+
+def _history_key(move: logic.Move) -> tuple[str, tuple[int, int]]:
+    _, piece_type, *_ = notation.PieceString.decompose(move.piece_str)  # type: ignore
+    return piece_type.value, move.destination  # type: ignore
@@ -0,0 +1,519 @@
+import multiprocessing
+import queue
+import random
+import threading
+import time
+import weakref
+from multiprocessing.synchronize import Event
+from typing import Any, Callable, Iterable, Mapping
+
+from honeycomb.engine import logic
+from honeycomb.engine.alphabeta import AlphaBetaSearch, principal_variation
+from honeycomb.engine.game import Game
+from honeycomb.engine.mcts import (
+    MctsSearch,
+    Node,
+    add_reward,
+    add_visit,
+    playout,
+    remove_visit,
+)
+from honeycomb.engine.search import (
+    ProgressCallback,
+    SearchLimits,
+    SearchResult,
+    line_str,
+)
+from honeycomb.engine.staticeval import StaticEvaluator
+from honeycomb.engine.transposition import SharedTranspositionTable
+
+_LEAVES_PER_WORKER = 2
+_POLL_INTERVAL = 0.01
+
+
+class WorkerPool:
+    """Worker processes kept alive between searches.
+
+    Every worker has its own task queue and all of them report to one result
+    queue. The worker target is called with the worker id, its task queue,
+    the result queue and the extra arguments, and must return when it gets
+    None from its task queue.
+    """
+
+    __slots__ = "_finalizer", "results", "tasks", "workers", "__weakref__"
+
+    def __init__(
+        self, processes: int, target: Callable[..., None], args: tuple[Any, ...] = ()
+    ) -> None:
+        context = multiprocessing.get_context()
+        self.results = context.Queue()
+        self.tasks = [context.Queue() for _ in range(processes)]
+        self.workers = [
+            context.Process(
+                target=target,
+                args=(worker_id, tasks, self.results, *args),
+                daemon=True,
+            )
+            for worker_id, tasks in enumerate(self.tasks)
+        ]
+        for worker in self.workers:
+            worker.start()
+        self._finalizer = weakref.finalize(self, _shutdown, self.workers, self.tasks)
+
+    def __len__(self) -> int:
+        return len(self.workers)
+
+    def close(self) -> None:
+        self._finalizer()
+
+    def dead(self) -> set[int]:
+        """Ids of the worker processes that are no longer running."""
+        return {
+            worker_id
+            for worker_id, worker in enumerate(self.workers)
+            if not worker.is_alive()
+        }
+
+    def get(self, waiting: Iterable[int]) -> Any | None:
+        """Returns the next result, or None once one of the `waiting` workers died.
+
+        A dead worker never answers its tasks, so the caller has to stop
+        waiting for them.
+        """
+        waiting = set(waiting)
+        while True:
+            try:
+                return self.results.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if waiting & self.dead():
+                    return None
+
+
+class LazySmpSearch:
+    """Lazy SMP: alpha-beta searches in many processes sharing one table.
+
+    Every worker searches the same position from its own start depth and with
+    its own move ordering, so the workers fill the shared transposition table
+    with different parts of the tree and speed each other up. The deepest
+    completed iteration of any worker is the result.
+    """
+
+    __slots__ = (
+        "_finalizer",
+        "_pool",
+        "_search_id",
+        "_stop",
+        "features",
+        "tt",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        processes: int,
+        tt_entries: int = 1 << 20,
+        weights: Mapping[str, float] | None = None,
+    ) -> None:
+        self.tt = SharedTranspositionTable(tt_entries)
+        self._stop = multiprocessing.get_context().Event()
+        self._search_id = 0
+        self.features = (True, True, True, False)
+        self._pool = WorkerPool(
+            processes,
+            _lazy_smp_worker,
+            (self.tt.name, self._stop, None if weights is None else dict(weights)),
+        )
+        self._finalizer = weakref.finalize(self, _close_lazy_smp, self._pool, self.tt)
+
+    @property
+    def processes(self) -> int:
+        return len(self._pool)
+
+    def close(self) -> None:
+        """Stops the worker processes and releases the shared table."""
+        self._finalizer()
+
+    def configure(self, pvs: bool, aspiration: bool, lmr: bool, futility: bool) -> None:
+        """Sets the selectivity of the worker searches, see `AlphaBetaSearch`."""
+        self.features = (pvs, aspiration, lmr, futility)
+
+    def search(
+        self,
+        game: Game,
+        limits: SearchLimits,
+        stop: threading.Event | None = None,
+        on_progress: ProgressCallback | None = None,
+        progress_interval: float | None = None,
+    ) -> SearchResult:
+        """Searches until a limit is reached or `stop` is set.
+
+        `on_progress` is called with every deeper result and, with a
+        `progress_interval`, every that many seconds with the last one. A
+        worker process that died is counted as done.
+
+        Raises:
+            RuntimeError: Every worker process died before an iteration.
+        """
+        start = time.perf_counter()
+        deadline = limits.deadline(start)
+        self._search_id += 1
+        self._stop.clear()
+        for tasks in self._pool.tasks:
+            tasks.put(
+                (
+                    self._search_id,
+                    game.status,
+                    limits.depth,
+                    limits.time,
+                    self.features,
+                )
+            )
+
+        best: tuple[int, int, int, int] | None = None
+        # Nodes, table hits and probes of every worker, the latest reported.
+        counters = [(0, 0, 0)] * len(self._pool)
+        next_report = None
+        if on_progress is not None and progress_interval:
+            next_report = start + progress_interval
+        done: set[int] = set()
+        while len(done) < len(self._pool):
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline:
+                self._stop.set()
+            if stop is not None and stop.is_set():
+                self._stop.set()
+            if next_report is not None and now >= next_report and best is not None:
+                on_progress(self._result(game, best, counters, now - start))  # type: ignore
+                next_report = now + progress_interval  # type: ignore
+            try:
+                message = self._pool.results.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                # A dead worker never sends the message that it is done.
+                done.update(
+                    worker_id
+                    for worker_id, worker in enumerate(self._pool.workers)
+                    if not worker.is_alive()
+                )
+                continue
+            search_id, worker_id, depth, score, move_code, *worker_counters = message
+            if search_id != self._search_id:
+                continue
+            counters[worker_id] = tuple(worker_counters)
+            if depth is None:
+                done.add(worker_id)
+                # The first finished worker reached the depth limit or a mate.
+                self._stop.set()
+            elif best is None or (depth, -worker_id) > (best[0], -best[1]):
+                best = (depth, worker_id, score, move_code)
+                if on_progress is not None:
+                    elapsed = time.perf_counter() - start
+                    on_progress(self._result(game, best, counters, elapsed))
+
+        elapsed = time.perf_counter() - start
+        if best is None and not any(w.is_alive() for w in self._pool.workers):
+            raise RuntimeError("Every Lazy SMP worker process died.")
+        if best is None:
+            move = game.legal_moves()[0]
+            nodes, tt_hits, tt_probes = map(sum, zip(*counters))
+            return SearchResult(
+                move=move,
+                move_str=game.move_str(move),
+                nodes=nodes,
+                elapsed=elapsed,
+                pv=[game.move_str(move)],
+                tt_hits=tt_hits,
+                tt_probes=tt_probes,
+            )
+        return self._result(game, best, counters, elapsed)
+
+    def _result(
+        self,
+        game: Game,
+        best: tuple[int, int, int, int],
+        counters: list[tuple[int, ...]],
+        elapsed: float,
+    ) -> SearchResult:
+        depth, _, score, move_code = best
+        move = logic.decode_move(move_code)
+        line = principal_variation(self.tt, game, depth)
+        if not line or line[0] != move:
+            line = [move]
+        nodes, tt_hits, tt_probes = map(sum, zip(*counters))
+        return SearchResult(
+            move=move,
+            move_str=game.move_str(move),
+            score=score,
+            depth=depth,
+            nodes=nodes,
+            elapsed=elapsed,
+            pv=line_str(game, line),
+            tt_hits=tt_hits,
+            tt_probes=tt_probes,
+        )
+
+
+class ParallelMctsSearch:
+    """Monte Carlo Tree Search with the playouts run in many processes.
+
+    In the Tree mode the tree is kept in this process, which hands the
+    selected leaves out to the workers and backs up the rewards they return.
+    A path gets its visit before its reward, the virtual loss, so the leaves
+    in flight at the same time differ. In the Root mode every worker grows
+    its own tree and the visits of the root moves are summed.
+    """
+
+    __slots__ = "_mcts", "_playout_depth", "_pool", "_rng", "config", "parallelism"
+
+    def __init__(
+        self, processes: int, parallelism: str = "Tree", seed: int | None = None
+    ) -> None:
+        self._mcts = MctsSearch(seed=seed)
+        self._playout_depth = 10
+        self._pool = WorkerPool(processes, _mcts_worker)
+        self._rng = random.Random(seed)
+        self.config: tuple[str, float, int, int] = ("UCT", 1.4, 10, 200000)
+        self.parallelism = parallelism
+
+    @property
+    def processes(self) -> int:
+        return len(self._pool)
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def configure(
+        self,
+        parallelism: str,
+        selection: str,
+        exploration: float,
+        playout_depth: int,
+        max_nodes: int,
+    ) -> None:
+        self.parallelism = parallelism
+        self.config = (selection, exploration, playout_depth, max_nodes)
+        self._playout_depth = playout_depth
+        self._mcts.configure(selection, exploration, playout_depth, max_nodes)
+
+    def search(self, game: Game, limits: SearchLimits) -> SearchResult:
+        if self.parallelism == "Root":
+            return self._search_roots(game, limits)
+        return self._search_tree(game, limits)
+
+    def _search_roots(self, game: Game, limits: SearchLimits) -> SearchResult:
+        start = time.perf_counter()
+        processes = len(self._pool)
+        depth = None if limits.depth is None else -(-limits.depth // processes)
+        for tasks in self._pool.tasks:
+            tasks.put(("tree", game.status, depth, limits.time, self.config))
+
+        merged: dict[int, list[float]] = {}
+        playouts = 0
+        waiting = set(range(processes)) - self._pool.dead()
+        while waiting:
+            message = self._pool.get(waiting)
+            if message is None:
+                # The trees of the dead workers are lost, the others count.
+                waiting -= self._pool.dead()
+                continue
+            worker_id, nodes, stats = message
+            waiting.discard(worker_id)
+            playouts += nodes
+            for move_code, visits, value in stats:
+                move_stats = merged.setdefault(move_code, [0, 0.0])
+                move_stats[0] += visits
+                move_stats[1] += value
+
+        if merged:
+            move_code, (visits, value) = max(
+                merged.items(), key=lambda item: item[1][0]
+            )
+            move = logic.decode_move(move_code)
+            score = value / visits if visits else None
+        else:
+            move = game.sample_move(self._rng)
+            score = None
+
+        return SearchResult(
+            move=move,
+            move_str=game.move_str(move),
+            score=score,
+            depth=1 if merged else 0,
+            nodes=playouts,
+            elapsed=time.perf_counter() - start,
+        )
+
+    def _search_tree(self, game: Game, limits: SearchLimits) -> SearchResult:
+        start = time.perf_counter()
+        deadline = limits.deadline(start)
+        root = self._mcts.root(game)
+        game_str = game.status
+        root_moves_num = len(game.moves)
+
+        pending: dict[int, tuple[Node, int]] = {}
+        # A dead worker counts as fully loaded, so it gets no leaves.
+        dead = self._pool.dead()
+        loads = [
+            _LEAVES_PER_WORKER if worker_id in dead else 0
+            for worker_id in range(len(self._pool))
+        ]
+        dispatched = 0
+        playouts = 0
+
+        def can_dispatch() -> bool:
+            if game.is_over or min(loads) >= _LEAVES_PER_WORKER:
+                return False
+            if limits.depth is not None and dispatched >= limits.depth:
+                return False
+            return deadline is None or time.perf_counter() < deadline
+
+        while True:
+            while can_dispatch():
+                node, depth = self._mcts.descend(game, root)
+                add_visit(node)
+                dispatched += 1
+                if game.is_over:
+                    add_reward(node, playout(game, self._rng, 0))
+                    playouts += 1
+                else:
+                    worker_id = loads.index(min(loads))
+                    move_codes = [
+                        logic.encode_move(move) for move in game.moves[root_moves_num:]
+                    ]
+                    self._pool.tasks[worker_id].put(
+                        (
+                            "playout",
+                            dispatched,
+                            game_str,
+                            move_codes,
+                            self._playout_depth,
+                        )
+                    )
+                    pending[dispatched] = (node, worker_id)
+                    loads[worker_id] += 1
+                game.undo(depth)
+
+            if not pending:
+                break
+            message = self._pool.get(worker_id for _, worker_id in pending.values())
+            if message is None:
+                dead = self._pool.dead()
+                for leaf_id, (node, worker_id) in list(pending.items()):
+                    if worker_id in dead:
+                        del pending[leaf_id]
+                        remove_visit(node)
+                        loads[worker_id] = _LEAVES_PER_WORKER
+                continue
+            leaf_id, reward = message
+            if leaf_id not in pending:
+                # Sent by a worker that died before its leaves were dropped.
+                continue
+            node, worker_id = pending.pop(leaf_id)
+            loads[worker_id] -= 1
+            add_reward(node, reward)
+            playouts += 1
+
+        return self._mcts.result(game, root, playouts, time.perf_counter() - start)
+
+
+def _lazy_smp_worker(
+    worker_id: int,
+    tasks: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+    tt_name: str,
+    stop: Event,
+    weights: dict[str, float] | None,
+) -> None:
+    tt = SharedTranspositionTable(name=tt_name)
+    rng = random.Random(worker_id) if worker_id else None
+    searcher = AlphaBetaSearch(tt, rng, evaluator=StaticEvaluator(weights))
+    try:
+        while (task := tasks.get()) is not None:
+            search_id, game_str, depth, search_time, features = task
+            searcher.configure(*features)
+            game = Game()
+            game.load_game(game_str)
+
+            def report(result: SearchResult) -> None:
+                results.put(
+                    (
+                        search_id,
+                        worker_id,
+                        result.depth,
+                        result.score,
+                        logic.encode_move(result.move),
+                        result.nodes,
+                        result.tt_hits,
+                        result.tt_probes,
+                    )
+                )
+
+            result = searcher.search(
+                game,
+                SearchLimits(depth, search_time),
+                start_depth=1 + worker_id % 2,
+                stop=stop,  # type: ignore
+                on_iteration=report,
+            )
+            results.put(
+                (
+                    search_id,
+                    worker_id,
+                    None,
+                    None,
+                    None,
+                    result.nodes,
+                    result.tt_hits,
+                    result.tt_probes,
+                )
+            )
+    finally:
+        tt.close()
+
+
+def _mcts_worker(
+    worker_id: int, tasks: multiprocessing.Queue, results: multiprocessing.Queue
+) -> None:
+    rng = random.Random(worker_id)
+    mcts = MctsSearch(seed=worker_id)
+    game = Game()
+    game_str = ""
+    while (task := tasks.get()) is not None:
+        kind, *params = task
+        if kind == "playout":
+            leaf_id, leaf_game_str, move_codes, playout_depth = params
+            if leaf_game_str != game_str:
+                game = Game()
+                game.load_game(leaf_game_str)
+                game_str = leaf_game_str
+            for move_code in move_codes:
+                game.push(logic.decode_move(move_code), validate=False)
+            reward = playout(game, rng, playout_depth)
+            game.undo(len(move_codes))
+            results.put((leaf_id, reward))
+        else:
+            root_game_str, depth, search_time, config = params
+            root_game = Game()
+            root_game.load_game(root_game_str)
+            mcts.configure(*config)
+            result = mcts.search(root_game, SearchLimits(depth, search_time))
+            stats = [
+                (logic.encode_move(child.move), child.visits, child.value)
+                for child in mcts.root(root_game).children
+            ]
+            results.put((worker_id, result.nodes, stats))
+
+
+def _close_lazy_smp(pool: WorkerPool, tt: SharedTranspositionTable) -> None:
+    pool.close()
+    tt.close()
+
+
+def _shutdown(
+    workers: list[multiprocessing.Process], tasks: list[multiprocessing.Queue]
+) -> None:
+    for worker_tasks in tasks:
+        worker_tasks.put(None)
+    for worker in workers:
+        worker.join(timeout=1)
+        if worker.is_alive():
+            worker.terminate()
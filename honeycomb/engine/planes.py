@@ -0,0 +1,99 @@
+import itertools
+from typing import Iterable
+
+import numpy as np
+
+from honeycomb.engine import hive as h
+from honeycomb.engine import notation
+from honeycomb.engine.game import Game
+
+PIECE_TYPES = tuple(itertools.chain(notation.BasePieces, notation.ExpansionPieces))
+COLORS = (notation.PieceColor.WHITE, notation.PieceColor.BLACK)
+LEVELS = 2
+BOARD_PLANES = len(COLORS) * len(PIECE_TYPES) * LEVELS
+HAND_PLANES = len(COLORS) * len(PIECE_TYPES)
+PLANES_NUM = BOARD_PLANES + HAND_PLANES + 1
+DEFAULT_SIZE = 15
+
+
+def _piece_planes() -> dict[str, tuple[int, int]]:
+    """Returns the first board plane and the hand plane of every piece."""
+    piece_planes = {}
+    for piece_str in notation.PIECES_STR:
+        color, piece_type, *_ = notation.PieceString.decompose(piece_str)
+        kind = COLORS.index(color) * len(PIECE_TYPES) + PIECE_TYPES.index(piece_type)
+        piece_planes[piece_str] = (kind * LEVELS, BOARD_PLANES + kind)
+    return piece_planes
+
+
+_PIECE_PLANES = _piece_planes()
+
+
+def hive_center(hive: h.Hive) -> tuple[int, int]:
+    """Returns the rounded mean of the occupied positions in axial coordinates."""
+    positions = [h.axial(position) for position in hive.positions()]
+    if not positions:
+        return 0, 0
+    return (
+        round(sum(q for q, _ in positions) / len(positions)),
+        round(sum(r for _, r in positions) / len(positions)),
+    )
+
+
+def planes_shape(size: int = DEFAULT_SIZE) -> tuple[int, int, int]:
+    return PLANES_NUM, size, size
+
+
+def encode_hive(
+    hive: h.Hive,
+    out: np.ndarray,
+    turn_color: notation.PieceColor | None = None,
+    center: tuple[int, int] | None = None,
+) -> None:
+    """Writes the feature planes of the hive into `out` of `planes_shape`.
+
+    The board planes are indexed by colour, piece type and stack level, the
+    last level counting every piece above the ground. They are laid on a
+    rhombus of axial coordinates with `center`, a (row, column) position
+    defaulting to the middle of the hive, in the middle. Pieces outside of
+    the rhombus are left out. The hand planes hold the number of pieces of
+    the colour and type in hand and the last plane is ones when white is to
+    move.
+    """
+    size = out.shape[-1]
+    half = size // 2
+    center_q, center_r = hive_center(hive) if center is None else h.axial(center)
+    out.fill(0)
+
+    for piece in hive.pieces():
+        q, r = h.axial(piece.position)
+        row, col = r - center_r + half, q - center_q + half
+        if 0 <= row < size and 0 <= col < size:
+            level = 0
+            under = piece.piece_under
+            while under is not None and level < LEVELS - 1:
+                level += 1
+                under = under.piece_under
+            out[_PIECE_PLANES[piece.piece_str][0] + level, row, col] = 1
+
+    for piece_str in hive.pieces_in_hand_str():
+        out[_PIECE_PLANES[piece_str][1]] += 1
+
+    if turn_color == notation.PieceColor.WHITE:
+        out[-1] = 1
+
+
+def encode_game(game: Game, out: np.ndarray) -> None:
+    """Writes the feature planes of the game position into `out`."""
+    encode_hive(game.hive, out, game.turn_color)
+
+
+def encode_many(games: Iterable[Game], out: np.ndarray) -> np.ndarray:
+    """Writes the planes of every game into the rows of the preallocated `out`.
+
+    Returns the view of the written rows.
+    """
+    rows = 0
+    for rows, game in enumerate(games, 1):
+        encode_hive(game.hive, out[rows - 1], game.turn_color)
+    return out[:rows]
@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from honeycomb.engine import logic, notation
+from honeycomb.engine.game import Game
+from honeycomb.engine.search import SearchLimits, SearchResult
+
+if TYPE_CHECKING:
+    from honeycomb.engine.engine import Searcher
+
+
+class Ponderer:
+    """Searches the position after the expected reply while the opponent thinks.
+
+    The search runs in a thread of this process, so the transposition table
+    and the MCTS tree it fills are the ones the next search starts from. When
+    the expected moves are played a time limited search continues the ponder
+    search for its time (a ponder hit), any other move stops and discards it
+    (a ponder miss).
+    """
+
+    __slots__ = (
+        "_expected",
+        "_game",
+        "_moves",
+        "_result",
+        "_searcher",
+        "_stop",
+        "_thread",
+        "hits",
+        "misses",
+    )
+
+    def __init__(self, searcher: "Searcher") -> None:
+        self._expected: list[logic.Move] = []
+        self._game: Game | None = None
+        self._moves: list[logic.Move] = []
+        self._result: SearchResult | None = None
+        self._searcher = searcher
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def pondering(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def expected(self) -> list[logic.Move]:
+        """The moves still to be played for a ponder hit."""
+        return list(self._expected)
+
+    def start(self, game: Game, move: logic.Move) -> bool:
+        """Starts pondering after the move and the expected reply to it.
+
+        Returns False if there is no expected reply or the game ends before.
+        """
+        self.stop()
+        if not self._searcher.can_ponder:
+            return False
+        reply = self._searcher.expected_reply(game, move)
+        if reply is None:
+            return False
+
+        moves = [*game.moves, move, reply]
+        ponder_game = Game()
+        ponder_game.new_game(notation.GameTypeString.build(game.expansions))
+        for played in moves:
+            if ponder_game.is_over:
+                return False
+            ponder_game.push(played, validate=False)
+        if ponder_game.is_over:
+            return False
+
+        self._expected = [move, reply]
+        self._game = ponder_game
+        self._moves = moves
+        self._result = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._ponder, daemon=True)
+        self._thread.start()
+        return True
+
+    def played(self, move: logic.Move) -> None:
+        """Follows a move played on the game, an unexpected one is a miss."""
+        if self._expected and self._expected[0] == move:
+            self._expected.pop(0)
+        else:
+            self.miss()
+
+    def miss(self) -> None:
+        if self.pondering:
+            self.misses += 1
+            self.stop()
+
+    def search(self, game: Game, limits: SearchLimits) -> SearchResult | None:
+        """Returns the result of the ponder search continued on a ponder hit.
+
+        Returns None when the search should run as usual: on a miss, and on a
+        hit limited by depth, which is searched again from the filled tables.
+        """
+        if not self.pondering:
+            return None
+        if self._expected or game.moves != self._moves:
+            self.miss()
+            return None
+
+        self.hits += 1
+        if limits.time is None or limits.depth is not None:
+            self.stop()
+            return None
+
+        assert self._thread is not None
+        self._thread.join(max(limits.time, 0.0))
+        self.stop()
+        result = self._result
+        if result is None or result.depth == 0:
+            return None
+        return result
+
+    def stop(self) -> None:
+        """Stops the ponder search and waits for its thread."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+        self._thread = None
+        self._game = None
+        self._moves = []
+        self._expected = []
+
+    def _ponder(self) -> None:
+        assert self._game is not None
+        start = time.perf_counter()
+        result = self._searcher.ponder(self._game, self._stop)
+        result.elapsed = time.perf_counter() - start
+        self._result = result
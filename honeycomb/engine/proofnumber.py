@@ -0,0 +1,210 @@
+import enum
+import time
+
+from honeycomb.engine import logic, notation
+from honeycomb.engine.game import Game
+
+INFINITY = 1 << 40
+DEFAULT_MAX_NODES = 100000
+DEFAULT_MAX_PLIES = 9
+
+
+class ProofStatus(enum.Enum):
+    PROVEN = "Proven"
+    DISPROVEN = "Disproven"
+    UNKNOWN = "Unknown"
+
+
+class ProofNode:
+    """Node of the proof tree. `plies` is the length of the proven win."""
+
+    __slots__ = "move", "children", "proof", "disproof", "plies"
+
+    def __init__(self, move: logic.Move, proof: int, disproof: int) -> None:
+        self.move = move
+        self.children: list["ProofNode"] | None = None
+        self.proof = proof
+        self.disproof = disproof
+        self.plies = 0
+
+
+class ProofResult:
+    """Outcome of a proof search from the view of the side to move.
+
+    A proven result holds the first move and the line of a forced win. A
+    disproven one means there is no forced win within the plies searched.
+    """
+
+    __slots__ = "status", "move", "line", "plies", "nodes", "elapsed"
+
+    def __init__(
+        self,
+        status: ProofStatus,
+        move: logic.Move | None = None,
+        line: list[str] | None = None,
+        plies: int = 0,
+        nodes: int = 0,
+        elapsed: float = 0.0,
+    ) -> None:
+        self.status = status
+        self.move = move
+        self.line = line or []
+        self.plies = plies
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __str__(self) -> str:
+        if self.status == ProofStatus.PROVEN:
+            return f"mate {self.moves_to_win} {' '.join(self.line)}"
+        if self.status == ProofStatus.DISPROVEN:
+            return f"nomate {self.plies}"
+        return "unknown"
+
+    @property
+    def move_str(self) -> str | None:
+        return self.line[0] if self.line else None
+
+    @property
+    def moves_to_win(self) -> int:
+        """Moves of the winning side in the proven line, the "mate in N"."""
+        return (self.plies + 1) // 2
+
+
+class ProofNumberSearch:
+    """Proof-number search of a forced bee surround by the side to move.
+
+    The attacker needs one winning move in its nodes and the defender must
+    lose after all its moves, the tree grows at the most proving leaf. A
+    leaf starts with the proof number of the pieces still missing around the
+    defending bee. The search deepens the ply limit by a full move at a time,
+    so a proven win is the shortest one, and the nodes created in all the
+    iterations count towards the node budget.
+    """
+
+    __slots__ = "_deadline", "_defender", "_max_nodes", "_nodes", "_winner"
+
+    def __init__(self) -> None:
+        self._deadline: float | None = None
+        self._defender = notation.PieceColor.BLACK
+        self._max_nodes = 0
+        self._nodes = 0
+        self._winner = notation.GameState.WhiteWins
+
+    def solve(
+        self,
+        game: Game,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_plies: int = DEFAULT_MAX_PLIES,
+        time_limit: float | None = None,
+    ) -> ProofResult:
+        """Proves or disproves a win of the side to move within `max_plies` plies."""
+        start = time.perf_counter()
+        self._deadline = None if time_limit is None else start + time_limit
+        self._max_nodes = max_nodes
+        self._nodes = 0
+        self._defender = logic.opponent_color(game.turn_color)
+        self._winner = (
+            notation.GameState.WhiteWins
+            if game.turn_color == notation.PieceColor.WHITE
+            else notation.GameState.BlackWins
+        )
+
+        result = ProofResult(ProofStatus.UNKNOWN)
+        if not game.is_over:
+            for plies in range(1, max_plies + 1, 2):
+                root = ProofNode(logic.PASS_MOVE, 1, 1)
+                if not self._prove(game, root, plies):
+                    break
+                if root.proof == 0:
+                    line = self._winning_line(game, root)
+                    result = ProofResult(
+                        ProofStatus.PROVEN, line[0][0], [s for _, s in line], root.plies
+                    )
+                    break
+                result = ProofResult(ProofStatus.DISPROVEN, plies=plies)
+
+        result.nodes = self._nodes
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _prove(self, game: Game, root: ProofNode, max_plies: int) -> bool:
+        """Grows the tree until the root is solved, False if out of budget."""
+        while root.proof != 0 and root.disproof != 0:
+            if self._nodes >= self._max_nodes:
+                return False
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                return False
+
+            path = [root]
+            node = root
+            while node.children is not None:
+                if len(path) % 2:
+                    node = min(node.children, key=lambda child: child.proof)
+                else:
+                    node = min(node.children, key=lambda child: child.disproof)
+                game.push(node.move, validate=False)
+                path.append(node)
+
+            try:
+                self._expand(game, node, len(path) - 1, max_plies)
+            finally:
+                game.undo(len(path) - 1)
+
+            for i in range(len(path) - 1, -1, -1):
+                _update(path[i], attacker=i % 2 == 0)
+        return True
+
+    def _expand(self, game: Game, node: ProofNode, ply: int, max_plies: int) -> None:
+        attacker = ply % 2 == 0
+        children = []
+        for move in game.legal_moves():
+            game.push(move, validate=False)
+            if game.is_over:
+                if game.state == self._winner:
+                    child = ProofNode(move, 0, INFINITY)
+                else:
+                    child = ProofNode(move, INFINITY, 0)
+            elif ply + 1 >= max_plies:
+                child = ProofNode(move, INFINITY, 0)
+            else:
+                missing = 6 - logic.bee_neighbours(game.hive, self._defender)
+                child = ProofNode(move, max(missing, 1), 1)
+            game.undo(1)
+            children.append(child)
+            if attacker and child.proof == 0:
+                break
+        self._nodes += len(children)
+        node.children = children
+
+    def _winning_line(
+        self, game: Game, root: ProofNode
+    ) -> list[tuple[logic.Move, str]]:
+        """Returns the moves of the proven line, the defender delaying the loss."""
+        line = []
+        node = root
+        while node.children:
+            proven = [child for child in node.children if child.proof == 0]
+            if len(line) % 2:
+                node = max(proven, key=lambda child: child.plies)
+            else:
+                node = min(proven, key=lambda child: child.plies)
+            line.append((node.move, game.move_str(node.move)))
+            game.push(node.move, validate=False)
+        game.undo(len(line))
+        return line
+
+
+def _update(node: ProofNode, attacker: bool) -> None:
+    children = node.children
+    if children is None:
+        return
+    if attacker:
+        node.proof = min(child.proof for child in children)
+        node.disproof = min(sum(child.disproof for child in children), INFINITY)
+        if node.proof == 0:
+            node.plies = 1 + min(c.plies for c in children if c.proof == 0)
+    else:
+        node.proof = min(sum(child.proof for child in children), INFINITY)
+        node.disproof = min(child.disproof for child in children)
+        if node.proof == 0:
+            node.plies = 1 + max(child.plies for child in children)
@@ -0,0 +1,104 @@
+from typing import TYPE_CHECKING, Callable
+
+from honeycomb.engine import logic
+
+if TYPE_CHECKING:
+    from honeycomb.engine.game import Game
+
+
+class SearchLimits:
+    """Limits of a single search. Depth is counted in iterations for MCTS."""
+
+    __slots__ = "depth", "time"
+
+    def __init__(self, depth: int | None = None, time: float | None = None):
+        self.depth = depth
+        self.time = time
+
+    def deadline(self, start: float) -> float | None:
+        if self.time is None:
+            return None
+        return start + self.time
+
+
+class SearchResult:
+    """Best move of a search with its statistics.
+
+    `pv` is the principal variation starting with the move, and `tt_hits`
+    of `tt_probes` lookups of the transposition table found an entry.
+    """
+
+    __slots__ = (
+        "move",
+        "move_str",
+        "score",
+        "depth",
+        "nodes",
+        "elapsed",
+        "pv",
+        "tt_hits",
+        "tt_probes",
+    )
+
+    def __init__(
+        self,
+        move: logic.Move,
+        move_str: str,
+        score: float | None = None,
+        depth: int = 0,
+        nodes: int = 0,
+        elapsed: float = 0.0,
+        pv: list[str] | None = None,
+        tt_hits: int = 0,
+        tt_probes: int = 0,
+    ):
+        self.move = move
+        self.move_str = move_str
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.pv = pv or []
+        self.tt_hits = tt_hits
+        self.tt_probes = tt_probes
+
+    def __str__(self) -> str:
+        score = "none" if self.score is None else f"{self.score:g}"
+        parts = [
+            f"depth {self.depth}",
+            f"score {score}",
+            f"nodes {self.nodes}",
+            f"nps {self.nodes_per_second:.0f}",
+        ]
+        if self.tt_probes:
+            parts.append(f"tthits {self.tt_hit_rate:.1%}")
+        parts.append(f"time {self.elapsed:.3f}")
+        parts.append(f"pv {' '.join(self.pv or [self.move_str])}")
+        return " ".join(parts)
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Searched nodes per second, for MCTS these are the playouts."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.nodes / self.elapsed
+
+    @property
+    def tt_hit_rate(self) -> float:
+        """Share of the transposition table lookups that found an entry."""
+        if not self.tt_probes:
+            return 0.0
+        return self.tt_hits / self.tt_probes
+
+
+ProgressCallback = Callable[[SearchResult], None]
+
+
+def line_str(game: "Game", moves: list[logic.Move]) -> list[str]:
+    """Returns the move strings of a line of moves played from the position."""
+    strings = []
+    for move in moves:
+        strings.append(game.move_str(move))
+        game.push(move, validate=False)
+    game.undo(len(moves))
+    return strings
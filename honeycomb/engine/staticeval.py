@@ -0,0 +1,249 @@
+"""Static evaluation from feature accumulators updated by every hive change.
+
+The accumulator keeps the mask of the occupied neighbours of every occupied
+position. A change of a stack updates the masks of its neighbours and the
+per color feature totals of the positions whose mask or top piece changed,
+so evaluating a position does not walk the hive or generate moves.
+"""
+
+import json
+import os
+from typing import Mapping
+
+from honeycomb.engine import hive as h
+from honeycomb.engine import notation
+from honeycomb.engine import pieces as p
+from honeycomb.engine.game import Game
+
+FEATURES = ("bee_liberties", "pinned", "in_hand", "beetle_on_bee", "mobility")
+DEFAULT_WEIGHTS = {
+    "bee_liberties": 100.0,
+    "pinned": -10.0,
+    "in_hand": 0.0,
+    "beetle_on_bee": -50.0,
+    "mobility": 10.0,
+}
+COLORS = (notation.PieceColor.WHITE, notation.PieceColor.BLACK)
+
+_PINNED = 0
+_MOBILE = 2
+_CLIMBERS = (notation.BasePieces.BEETLE, notation.BasePieces.GRASSHOPPER)
+
+
+def _groups(mask: int) -> int:
+    """Number of separate runs of occupied neighbours around a position."""
+    if mask == 0b111111:
+        return 1
+    return sum(bool(mask >> i & 1) and not mask >> (i - 1) % 6 & 1 for i in range(6))
+
+
+def _slides(mask: int) -> bool:
+    """Tells if two adjacent neighbours are empty, the gap to slide out."""
+    return any(not mask >> i & 1 and not mask >> (i + 1) % 6 & 1 for i in range(6))
+
+
+_GROUPS = tuple(_groups(mask) for mask in range(64))
+_SLIDES = tuple(_slides(mask) for mask in range(64))
+_NEIGHBOURS = tuple(bin(mask).count("1") for mask in range(64))
+
+
+def _piece_kinds() -> dict[str, tuple[int, bool]]:
+    """Returns the color index of every piece and if it can leave a gated spot."""
+    kinds = {}
+    for piece_str in notation.PIECES_STR:
+        color, piece_type, *_ = notation.PieceString.decompose(piece_str)
+        kinds[piece_str] = (COLORS.index(color), piece_type in _CLIMBERS)
+    return kinds
+
+
+_PIECE_KINDS = _piece_kinds()
+_NOTHING = (0, 0, 0, 0)
+
+
+def _single_contribution(color: int, climbs: bool, mask: int) -> tuple[int, ...]:
+    """Pinned and mobile counts of a piece alone on its position."""
+    contribution = [0, 0, 0, 0]
+    if _GROUPS[mask] > 1:
+        contribution[_PINNED + color] = 1
+    elif climbs or _SLIDES[mask]:
+        contribution[_MOBILE + color] = 1
+    return tuple(contribution)
+
+
+def _stack_contribution(top: p.Piece) -> tuple[int, ...]:
+    """Pinned counts of the covered pieces and the mobile top of a stack."""
+    contribution = [0, 0, 0, 0]
+    contribution[_MOBILE + _PIECE_KINDS[top.piece_str][0]] = 1
+    piece = top.piece_under
+    while piece is not None:
+        contribution[_PINNED + _PIECE_KINDS[piece.piece_str][0]] += 1
+        piece = piece.piece_under
+    return tuple(contribution)
+
+
+_SINGLE = tuple(
+    tuple(
+        tuple(_single_contribution(color, climbs, mask) for mask in range(64))
+        for climbs in (False, True)
+    )
+    for color in range(len(COLORS))
+)
+_BEES = tuple(
+    notation.PieceString.build(color, notation.BasePieces.BEE, 0) for color in COLORS
+)
+
+
+class FeatureAccumulator:
+    """Feature totals of a hive kept up to date by `Hive` on every change.
+
+    A piece counts as pinned when it is covered by a beetle or when its
+    occupied neighbours form more than one group, the local test for the
+    one-hive rule. The test also counts the pieces of a ring of the hive
+    that could leave it. A piece is mobile when it is not pinned and it is
+    on top of a stack, climbs or jumps, or has a gap to slide out through.
+    """
+
+    __slots__ = "_contributions", "_hive", "_masks", "_totals"
+
+    def __init__(self, hive: h.Hive) -> None:
+        self._hive = hive
+        self._masks: dict[tuple[int, int], int] = {}
+        self._contributions: dict[tuple[int, int], tuple[int, ...]] = {}
+        self._totals = [0, 0, 0, 0]
+
+        occupied = hive.positions()
+        for position in occupied:
+            self._masks[position] = _mask(position, occupied)
+        for position in occupied:
+            self._refresh(position)
+        hive.attach(self)
+
+    def top_changed(
+        self,
+        position: tuple[int, int],
+        previous: p.Piece | None,
+        piece: p.Piece | None,
+    ) -> None:
+        """Called by the hive after the top piece of the position changed."""
+        masks = self._masks
+        if (previous is None) != (piece is None):
+            around = h.PositionsResolver.positions_around_clockwise(position)
+            for i, neighbour in enumerate(around):
+                if neighbour in masks:
+                    masks[neighbour] ^= 1 << (i + 3) % 6
+                    self._refresh(neighbour)
+            if piece is None:
+                del masks[position]
+            else:
+                masks[position] = _mask(position, masks)
+        self._refresh(position)
+
+    def values(self, color: notation.PieceColor) -> tuple[int, ...]:
+        """Returns the features of the color in the order of `FEATURES`."""
+        index = COLORS.index(color)
+        hive = self._hive
+        bee_position = hive.position(_BEES[index])
+        if bee_position is None:
+            liberties = 6
+            beetle_on_bee = 0
+            mobile = 0
+        else:
+            liberties = 6 - _NEIGHBOURS[self._masks[bee_position]]
+            beetle_on_bee = int(hive.top_piece(bee_position).piece_str != _BEES[index])  # type: ignore
+            mobile = self._totals[_MOBILE + index]
+        return (
+            liberties,
+            self._totals[_PINNED + index],
+            hive.count_in_hand(color),
+            beetle_on_bee,
+            mobile,
+        )
+
+    def features(self, color: notation.PieceColor) -> tuple[int, ...]:
+        """Returns the features of the color minus the ones of the opponent."""
+        own = self.values(color)
+        opponent = self.values(COLORS[1 - COLORS.index(color)])
+        return tuple(a - b for a, b in zip(own, opponent))
+
+    def _refresh(self, position: tuple[int, int]) -> None:
+        top = self._hive.top_piece(position)
+        if top is None:
+            contribution = _NOTHING
+        elif top.piece_under is None:
+            color, climbs = _PIECE_KINDS[top.piece_str]
+            contribution = _SINGLE[color][climbs][self._masks[position]]
+        else:
+            contribution = _stack_contribution(top)
+
+        previous = self._contributions.get(position, _NOTHING)
+        if contribution == previous:
+            return
+        totals = self._totals
+        for i in range(4):
+            totals[i] += contribution[i] - previous[i]
+        if top is None:
+            del self._contributions[position]
+        else:
+            self._contributions[position] = contribution
+
+
+class StaticEvaluator:
+    """Weighted sum of the accumulated features, see `FEATURES`."""
+
+    __slots__ = "_weights", "weights"
+
+    def __init__(self, weights: Mapping[str, float] | None = None) -> None:
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights is not None:
+            _check_names(weights)
+            self.weights.update(weights)
+        self._weights = tuple(self.weights[name] for name in FEATURES)
+
+    def evaluate(self, game: Game) -> int:
+        """Scores the position from the view of the side to move."""
+        return round(
+            sum(w * f for w, f in zip(self._weights, features(game)) if w)  # type: ignore
+        )
+
+
+def accumulator(hive: h.Hive) -> FeatureAccumulator:
+    """Returns the accumulator of the hive, attaching a new one the first time."""
+    attached = hive.accumulator
+    if attached is None:
+        attached = FeatureAccumulator(hive)
+    return attached  # type: ignore
+
+
+def features(game: Game) -> tuple[int, ...]:
+    """Returns the features from the view of the side to move."""
+    return accumulator(game.hive).features(game.turn_color)
+
+
+def load_weights(path: str | os.PathLike) -> dict[str, float]:
+    """Reads the weights from a JSON object of feature names and numbers."""
+    with open(path) as file:
+        weights = json.load(file)
+    if not isinstance(weights, dict) or not all(
+        isinstance(value, (int, float)) for value in weights.values()
+    ):
+        raise ValueError(f"Invalid evaluation weights in {path}.")
+    _check_names(weights)
+    return {name: float(value) for name, value in weights.items()}
+
+
+def save_weights(weights: Mapping[str, float], path: str | os.PathLike) -> None:
+    _check_names(weights)
+    with open(path, "w") as file:
+        json.dump({name: weights[name] for name in FEATURES if name in weights}, file)
+        file.write("\n")
+
+
+def _check_names(weights: Mapping[str, float]) -> None:
+    unknown = set(weights) - set(FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown evaluation features: {', '.join(sorted(unknown))}.")
+
+
+def _mask(position: tuple[int, int], occupied) -> int:
+    around = h.PositionsResolver.positions_around_clockwise(position)
+    return sum(1 << i for i, neighbour in enumerate(around) if neighbour in occupied)
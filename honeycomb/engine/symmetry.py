@@ -0,0 +1,148 @@
+"""Canonical form of positions under the symmetries of the hexagonal grid.
+
+A position plays the same when the hive is translated, turned by a multiple
+of 60 degrees or mirrored, but the coordinates of its pieces, and so the
+Zobrist hash of the game, depend on where the first piece was placed and
+which way the hive grew from it. The canonical form is the image of the hive
+under the one of the 12 rotations and reflections, followed by the
+translation of its least position to the origin, whose sorted pieces come
+first. Its fingerprint is the Zobrist hash of the game in that placement.
+"""
+
+from honeycomb.engine import logic
+from honeycomb.engine.game import Game
+from honeycomb.engine.hive import axial, offset, zobrist_key
+
+ROTATIONS = 6
+
+
+def _turn(
+    axial_position: tuple[int, int], rotation: int, reflected: bool
+) -> tuple[int, int]:
+    """Mirrors the axial position if `reflected`, then turns it clockwise."""
+    q, r = axial_position
+    if reflected:
+        q, r = r, q
+    for _ in range(rotation):
+        q, r = -r, q + r
+    return q, r
+
+
+class Transform:
+    """Symmetry of the grid mapping (row, column) positions.
+
+    The position is mirrored if `reflected`, turned by `rotation` sixths of a
+    turn about the origin and shifted by `translation` in axial coordinates.
+    """
+
+    __slots__ = "rotation", "reflected", "translation"
+
+    def __init__(
+        self,
+        rotation: int = 0,
+        reflected: bool = False,
+        translation: tuple[int, int] = (0, 0),
+    ) -> None:
+        self.rotation = rotation % ROTATIONS
+        self.reflected = reflected
+        self.translation = translation
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Transform):
+            return NotImplemented
+        return (self.rotation, self.reflected, self.translation) == (
+            other.rotation,
+            other.reflected,
+            other.translation,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.rotation, self.reflected, self.translation))
+
+    def __repr__(self) -> str:
+        return (
+            f"Transform(rotation={self.rotation}, reflected={self.reflected}, "
+            f"translation={self.translation})"
+        )
+
+    def position(self, position: tuple[int, int]) -> tuple[int, int]:
+        q, r = _turn(axial(position), self.rotation, self.reflected)
+        return offset((q + self.translation[0], r + self.translation[1]))
+
+    def move(self, move: logic.Move) -> logic.Move:
+        """Maps the destination of the move, the pass move is left as it is."""
+        if move.destination is None:
+            return move
+        return logic.Move(move.piece_str, self.position(move.destination))
+
+    def inverse(self) -> "Transform":
+        """The transform mapping the images of this one back."""
+        # Mirroring then turning back is the same as turning forward then
+        # mirroring, so a reflected transform keeps its rotation.
+        rotation = self.rotation if self.reflected else -self.rotation % ROTATIONS
+        q, r = _turn(self.translation, rotation, self.reflected)
+        return Transform(rotation, self.reflected, (-q, -r))
+
+
+def canonical(game: Game) -> tuple[int, Transform]:
+    """Returns the fingerprint of the position and the transform to its canonical form.
+
+    Positions that are translations, rotations or reflections of each other
+    have the same fingerprint.
+    """
+    key, transforms = canonical_transforms(game)
+    return key, transforms[0]
+
+
+def canonical_transforms(game: Game) -> tuple[int, list[Transform]]:
+    """Returns the fingerprint and every transform to the canonical form.
+
+    There is more than one when the position is symmetric itself, the first
+    is the one `canonical` returns.
+    """
+    pieces = []
+    for piece in game.hive.pieces():
+        level = 0
+        under = piece.piece_under
+        while under is not None:
+            level += 1
+            under = under.piece_under
+        pieces.append((piece.piece_str, axial(piece.position), level))
+
+    best: list[tuple[int, int, int, str]] | None = None
+    transforms: list[Transform] = []
+    for reflected in (False, True):
+        for rotation in range(ROTATIONS):
+            turned = [
+                (*_turn(position, rotation, reflected), level, piece_str)
+                for piece_str, position, level in pieces
+            ]
+            anchor_q, anchor_r = min(turned, default=(0, 0))[:2]
+            form = sorted(
+                (q - anchor_q, r - anchor_r, level, piece_str)
+                for q, r, level, piece_str in turned
+            )
+            transform = Transform(rotation, reflected, (-anchor_q, -anchor_r))
+            if best is None or form < best:
+                best = form
+                transforms = [transform]
+            elif form == best:
+                transforms.append(transform)
+
+    assert best is not None
+    # The game hash differs from the hive hash by the side to move key.
+    key = game.hash ^ game.hive.hash
+    for q, r, level, piece_str in best:
+        key ^= zobrist_key(piece_str, offset((q, r)), level)
+    return key, transforms
+
+
+def canonical_move(transforms: list[Transform], move: logic.Move) -> logic.Move:
+    """Returns the least image of the move under the transforms to a canonical form.
+
+    The moves of a symmetric position that are images of each other get the
+    same canonical move.
+    """
+    return min(
+        (transform.move(move) for transform in transforms), key=logic.encode_move
+    )
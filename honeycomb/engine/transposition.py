@@ -0,0 +1,118 @@
+import struct
+import sys
+from enum import IntEnum
+from multiprocessing import shared_memory
+
+_ENTRY = struct.Struct("<QQ")
+_SCORE_OFFSET = 1 << 31
+
+
+class Bound(IntEnum):
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+
+class TranspositionTable:
+    """Process local table of searched positions keyed by the position hash.
+
+    Entries are (depth, score, bound, move_code) tuples. The table is cleared
+    when it reaches its maximum number of entries.
+    """
+
+    __slots__ = "_entries", "_max_entries"
+
+    def __init__(self, max_entries: int = 1 << 20) -> None:
+        self._entries: dict[int, tuple[int, int, Bound, int]] = {}
+        self._max_entries = max_entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def probe(self, key: int) -> tuple[int, int, Bound, int] | None:
+        return self._entries.get(key)
+
+    def store(
+        self, key: int, depth: int, score: int, bound: Bound, move_code: int
+    ) -> None:
+        if len(self._entries) >= self._max_entries and key not in self._entries:
+            self._entries.clear()
+        self._entries[key] = (depth, score, bound, move_code)
+
+
+class SharedTranspositionTable:
+    """Transposition table in shared memory that many processes can use at once.
+
+    Every entry is two 64-bit words: the key xor-ed with the data and the data.
+    Writes are not locked, an entry torn by a concurrent write no longer
+    matches its key and is treated as missing.
+    """
+
+    __slots__ = "_buf", "_entries", "_owner", "_shm"
+
+    def __init__(self, entries: int = 1 << 20, name: str | None = None) -> None:
+        """Creates the table or attaches to the existing one with the given name."""
+        if name is None:
+            self._shm = shared_memory.SharedMemory(
+                create=True, size=entries * _ENTRY.size
+            )
+        else:
+            # Only the creating process owns the segment, see bpo-39959. Older
+            # versions register it again with the resource tracker, which is
+            # shared with the child processes, so it is still unlinked once.
+            if sys.version_info >= (3, 13):
+                self._shm = shared_memory.SharedMemory(name=name, track=False)
+            else:
+                self._shm = shared_memory.SharedMemory(name=name)
+        self._owner = name is None
+        self._buf = self._shm.buf
+        self._entries = len(self._buf) // _ENTRY.size
+
+    @property
+    def entries(self) -> int:
+        return self._entries
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def clear(self) -> None:
+        self._buf[:] = bytes(len(self._buf))
+
+    def close(self) -> None:
+        self._buf.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def probe(self, key: int) -> tuple[int, int, Bound, int] | None:
+        xored_key, data = _ENTRY.unpack_from(self._buf, self._offset(key))
+        if data == 0 or xored_key ^ data != key:
+            return None
+        return (
+            (data >> 32) & 0xFF,
+            (data & 0xFFFFFFFF) - _SCORE_OFFSET,
+            Bound((data >> 40) & 0x3),
+            data >> 42,
+        )
+
+    def store(
+        self, key: int, depth: int, score: int, bound: Bound, move_code: int
+    ) -> None:
+        data = (
+            (score + _SCORE_OFFSET)
+            | (min(depth, 0xFF) << 32)
+            | (int(bound) << 40)
+            | (move_code << 42)
+        )
+        _ENTRY.pack_into(self._buf, self._offset(key), key ^ data, data)
+
+    def _offset(self, key: int) -> int:
+        return (key % self._entries) * _ENTRY.size
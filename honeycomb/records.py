@@ -0,0 +1,232 @@
+"""Compact binary game records.
+
+A record file starts with the magic bytes and holds the games one after
+another. A game is a header, the bitmask of the expansions, the index of the
+game state and the number of moves, followed by the moves as 3-byte codes of
+`logic.encode_move`.
+"""
+
+import mmap
+import os
+import struct
+from typing import BinaryIO, Generator, Iterable, Iterator
+
+from honeycomb.engine import logic, notation
+from honeycomb.engine.game import Game
+
+MAGIC = b"HGR\x01"
+_HEADER = struct.Struct("<BBH")
+_MOVE_SIZE = 3
+_EXPANSIONS = tuple(notation.ExpansionPieces)
+_STATES = tuple(notation.GameState)
+
+
+class RecordFormatError(ValueError):
+    pass
+
+
+class GameRecord:
+    """Game read from a record file, its moves are decoded on demand."""
+
+    __slots__ = "_moves", "expansions", "state"
+
+    def __init__(
+        self,
+        expansions: set[notation.ExpansionPieces],
+        state: notation.GameState,
+        moves: bytes,
+    ) -> None:
+        self._moves = moves
+        self.expansions = expansions
+        self.state = state
+
+    def __len__(self) -> int:
+        return len(self._moves) // _MOVE_SIZE
+
+    @property
+    def gametype(self) -> str:
+        return notation.GameTypeString.build(self.expansions)
+
+    def move_codes(self) -> Generator[int, None, None]:
+        moves = self._moves
+        for i in range(0, len(moves), _MOVE_SIZE):
+            yield moves[i] | moves[i + 1] << 8 | moves[i + 2] << 16
+
+    def moves(self) -> Generator[logic.Move, None, None]:
+        for move_code in self.move_codes():
+            yield logic.decode_move(move_code)
+
+    def to_game(self) -> Game:
+        """Replays the moves on a new game."""
+        game = Game()
+        game.new_game(self.gametype)
+        for move in self.moves():
+            game.push(move, validate=False)
+        return game
+
+    def to_gamestring(self) -> str:
+        return self.to_game().status
+
+
+GameSource = str | GameRecord
+
+
+def encode_game(game: Game) -> bytes:
+    """Returns the record of the game."""
+    return encode(game.expansions, game.state, game.moves)
+
+
+def encode(
+    expansions: Iterable[notation.ExpansionPieces],
+    state: notation.GameState,
+    moves: list[logic.Move],
+) -> bytes:
+    if len(moves) > 0xFFFF:
+        raise RecordFormatError(f"Too many moves to record: {len(moves)}.")
+    expansions_mask = sum(1 << _EXPANSIONS.index(e) for e in expansions)
+    record = bytearray(_HEADER.pack(expansions_mask, _STATES.index(state), len(moves)))
+    for move in moves:
+        record += logic.encode_move(move).to_bytes(_MOVE_SIZE, "little")
+    return bytes(record)
+
+
+def gamestring_to_record(game_str: str) -> bytes:
+    game = Game()
+    game.load_game(game_str)
+    return encode_game(game)
+
+
+def record_to_gamestring(record: GameRecord) -> str:
+    return record.to_gamestring()
+
+
+class RecordWriter:
+    """Appends games to a record file, writing the magic into a new file."""
+
+    __slots__ = "_file"
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self._file: BinaryIO = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def write(self, game: Game) -> None:
+        self._file.write(encode_game(game))
+
+    def write_gamestring(self, game_str: str) -> None:
+        self._file.write(gamestring_to_record(game_str))
+
+
+class RecordReader:
+    """Iterates the games of a record file mapped into memory."""
+
+    __slots__ = "_file", "_mmap", "_offsets"
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped.
+            self._file.close()
+            raise RecordFormatError(f"Not a game record file: {path}.")
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise RecordFormatError(f"Not a game record file: {path}.")
+        self._offsets: list[int] | None = None
+
+    def __enter__(self) -> "RecordReader":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __getitem__(self, index: int) -> GameRecord:
+        return self._record(self._index()[index])[0]
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        offset = len(MAGIC)
+        while offset < len(self._mmap):
+            record, offset = self._record(offset)
+            yield record
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+    def _index(self) -> list[int]:
+        if self._offsets is None:
+            offsets = []
+            offset = len(MAGIC)
+            while offset < len(self._mmap):
+                offsets.append(offset)
+                *_, moves_num = self._header(offset)
+                end = offset + _HEADER.size + moves_num * _MOVE_SIZE
+                if end > len(self._mmap):
+                    raise RecordFormatError(f"Truncated game record at {offset}.")
+                offset = end
+            self._offsets = offsets
+        return self._offsets
+
+    def _header(self, offset: int) -> tuple[int, int, int]:
+        if offset + _HEADER.size > len(self._mmap):
+            raise RecordFormatError(f"Truncated game record at {offset}.")
+        return _HEADER.unpack_from(self._mmap, offset)
+
+    def _record(self, offset: int) -> tuple[GameRecord, int]:
+        expansions_mask, state, moves_num = self._header(offset)
+        start = offset + _HEADER.size
+        end = start + moves_num * _MOVE_SIZE
+        if end > len(self._mmap):
+            raise RecordFormatError(f"Truncated game record at {offset}.")
+        expansions = {
+            e for i, e in enumerate(_EXPANSIONS) if expansions_mask & (1 << i)
+        }
+        # The bytes are copied so that the record outlives the mapping.
+        record = GameRecord(expansions, _STATES[state], self._mmap[start:end])
+        return record, end
+
+
+def text_to_records(text_path: str | os.PathLike, record_path: str | os.PathLike):
+    """Converts the file of GameStrings, one per line, into a record file."""
+    with open(text_path) as text, RecordWriter(record_path) as writer:
+        for line in text:
+            if line.strip():
+                writer.write_gamestring(line.strip())
+
+
+def records_to_text(record_path: str | os.PathLike, text_path: str | os.PathLike):
+    """Converts the record file into a file of GameStrings, one per line."""
+    with RecordReader(record_path) as reader, open(text_path, "w") as text:
+        for record in reader:
+            text.write(record.to_gamestring() + "\n")
+
+
+def read_corpus(paths: Iterable[str | os.PathLike]) -> Iterator[GameSource]:
+    """Yields the games of record files and of text files of GameStrings."""
+    for path in paths:
+        with open(path, "rb") as file:
+            binary = file.read(len(MAGIC)) == MAGIC
+        if binary:
+            with RecordReader(path) as reader:
+                yield from reader
+        else:
+            with open(path) as text:
+                for line in text:
+                    if line.strip():
+                        yield line.strip()
@@ -0,0 +1,168 @@
+"""Replay buffer of training positions in memory-mapped files."""
+
+import os
+import threading
+from typing import Any, ContextManager
+
+import numpy as np
+
+from honeycomb.engine import planes
+from honeycomb.engine.actions import action_space
+from honeycomb.engine.game import Game
+
+_HEAD = 0
+_CAPACITY = 1
+_SIZE = 2
+SAMPLE_ATTEMPTS = 100
+
+
+class ReplayBuffer:
+    """Ring buffer of encoded positions, legal action masks and targets.
+
+    The arrays live in `numpy.memmap` files of the directory, so processes
+    that open the same directory share them. Every append takes the next
+    slot under the lock and overwrites the oldest position once the buffer
+    is full. Every slot has a version, odd while the slot is being written
+    and bumped again once all its arrays are. Sampling reads the versions
+    before and after copying the rows and draws again the rows of the slots
+    that were being written or changed meanwhile, so a row never mixes two
+    positions as long as the buffer has more slots than there are writers.
+    To append from many processes pass the same `multiprocessing.Lock` to
+    all of them.
+    """
+
+    __slots__ = (
+        "_lock",
+        "_meta",
+        "_space",
+        "_versions",
+        "masks",
+        "policies",
+        "positions",
+        "values",
+    )
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        capacity: int,
+        size: int = planes.DEFAULT_SIZE,
+        lock: ContextManager[Any] | None = None,
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, "meta.dat")
+        exists = os.path.exists(meta_path)
+        mode = "r+" if exists else "w+"
+
+        self._meta = np.memmap(meta_path, dtype=np.int64, mode=mode, shape=(3,))
+        if exists:
+            if self._meta[_CAPACITY] != capacity or self._meta[_SIZE] != size:
+                raise ValueError(
+                    f"Replay buffer in {directory} has capacity "
+                    f"{self._meta[_CAPACITY]} and size {self._meta[_SIZE]}."
+                )
+        else:
+            self._meta[:] = (0, capacity, size)
+
+        self._space = action_space(size)
+        actions_num = len(self._space)
+
+        def array(name: str, dtype: Any, shape: tuple[int, ...]) -> np.memmap:
+            path = os.path.join(directory, f"{name}.dat")
+            return np.memmap(path, dtype=dtype, mode=mode, shape=(capacity, *shape))
+
+        self.positions = array("positions", np.uint8, planes.planes_shape(size))
+        self.masks = array("masks", np.bool_, (actions_num,))
+        self.policies = array("policies", np.float32, (actions_num,))
+        self.values = array("values", np.float32, ())
+        self._versions = array("versions", np.int64, ())
+        self._lock = lock if lock is not None else threading.Lock()
+
+    def __len__(self) -> int:
+        return int(min(self._meta[_HEAD], self._meta[_CAPACITY]))
+
+    @property
+    def capacity(self) -> int:
+        return int(self._meta[_CAPACITY])
+
+    @property
+    def total(self) -> int:
+        """Number of positions appended since the buffer was created."""
+        return int(self._meta[_HEAD])
+
+    def append(self, game: Game, policy: np.ndarray, value: float) -> int:
+        """Stores the position of the game with its targets and returns the slot.
+
+        The policy is over the actions of `ActionSpace` and the value is from
+        the view of the side to move.
+        """
+        with self._lock:
+            slot = int(self._meta[_HEAD] % self._meta[_CAPACITY])
+            self._meta[_HEAD] += 1
+            self._versions[slot] += 2 if self._versions[slot] % 2 else 1
+            version = int(self._versions[slot])
+
+        planes.encode_game(game, self.positions[slot])
+        self._space.legal_mask(game, self.masks[slot])
+        self.policies[slot] = policy
+        self.values[slot] = value
+        with self._lock:
+            # A later append to the slot marks it once it is written.
+            if self._versions[slot] == version:
+                self._versions[slot] += 1
+        return slot
+
+    def flush(self) -> None:
+        for array in (
+            self._meta,
+            self.positions,
+            self.masks,
+            self.policies,
+            self.values,
+            self._versions,
+        ):
+            array.flush()
+
+    def sample(
+        self,
+        batch_size: int,
+        rng: np.random.Generator,
+        out: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns positions, masks, policies and values of random written slots.
+
+        The rows are gathered straight from the mapped files into `out`, the
+        preallocated batch arrays, or into new arrays.
+
+        Raises:
+            IndexError: The buffer is empty.
+            RuntimeError: Some rows hit slots being written in every one of
+                the `SAMPLE_ATTEMPTS` draws, as left by a writer that died.
+        """
+        size = len(self)
+        if size == 0:
+            raise IndexError("Sampling from an empty replay buffer.")
+
+        arrays = (self.positions, self.masks, self.policies, self.values)
+        if out is None:
+            out = tuple(  # type: ignore
+                np.empty((batch_size, *array.shape[1:]), dtype=array.dtype)
+                for array in arrays
+            )
+        assert out is not None
+        rows = np.arange(batch_size)
+        for _ in range(SAMPLE_ATTEMPTS):
+            slots = rng.integers(size, size=len(rows))
+            versions = self._versions[slots]
+            for array, batch in zip(arrays, out):
+                if len(rows) == batch_size:
+                    np.take(array, slots, axis=0, out=batch)
+                else:
+                    batch[rows] = np.take(array, slots, axis=0)
+            torn = (versions % 2 == 1) | (self._versions[slots] != versions)
+            rows = rows[torn]
+            if not len(rows):
+                return out
+        raise RuntimeError(
+            f"{len(rows)} rows hit slots being written in {SAMPLE_ATTEMPTS} draws."
+        )
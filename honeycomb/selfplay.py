@@ -0,0 +1,193 @@
+import contextlib
+import multiprocessing
+import os
+import random
+import time
+from typing import Callable, Iterator
+
+from honeycomb import records
+from honeycomb.engine import logic
+from honeycomb.engine.alphabeta import AlphaBetaSearch
+from honeycomb.engine.game import Game
+from honeycomb.engine.mcts import MctsSearch
+from honeycomb.engine.search import SearchLimits
+
+POLICIES = ("random", "mcts", "alphabeta")
+_EXTENSIONS = {"text": "txt", "binary": "hgr"}
+FORMATS = tuple(_EXTENSIONS)
+
+Policy = Callable[[Game], logic.Move]
+
+
+class SelfPlayStats:
+    __slots__ = "games", "moves", "elapsed", "shards"
+
+    def __init__(
+        self, games: int, moves: int, elapsed: float, shards: list[str]
+    ) -> None:
+        self.games = games
+        self.moves = moves
+        self.elapsed = elapsed
+        self.shards = shards
+
+    @property
+    def games_per_second(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.games / self.elapsed
+
+
+def make_policy(name: str, limits: SearchLimits, rng: random.Random) -> Policy:
+    """Returns the function choosing the moves of the named policy."""
+    if name == "random":
+        return lambda game: game.sample_move(rng)
+    if name == "mcts":
+        mcts = MctsSearch(seed=rng.getrandbits(32))
+        return lambda game: mcts.search(game, limits).move
+    if name == "alphabeta":
+        # The shuffled move order varies the games between equal searches.
+        alphabeta = AlphaBetaSearch(rng=rng)
+        return lambda game: alphabeta.search(game, limits).move
+    raise ValueError(f"Unknown policy: {name}.")
+
+
+def play_game(gametype: str, policy: Policy, max_turns: int | None) -> Game:
+    """Plays a game until it ends or passes `max_turns` turns."""
+    game = Game()
+    game.new_game(gametype)
+    while not game.is_over and (max_turns is None or game.turn_num <= max_turns):
+        game.push(policy(game), validate=False)
+    return game
+
+
+def shard_path(output_dir: str, worker_id: int, fmt: str) -> str:
+    return os.path.join(output_dir, f"games-{worker_id:03d}.{_EXTENSIONS[fmt]}")
+
+
+def selfplay(
+    output_dir: str,
+    games: int,
+    workers: int | None = None,
+    policy: str = "random",
+    limits: SearchLimits | None = None,
+    gametype: str = "Base",
+    max_turns: int | None = 100,
+    fmt: str = "text",
+    seed: int | None = None,
+    report: Callable[[int, int, float], None] | None = None,
+) -> SelfPlayStats:
+    """Plays `games` games in each of the worker processes.
+
+    Every worker appends its games to its own shard in `output_dir`.
+    `report` is called with the finished and total numbers of games and the
+    elapsed time after every game.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy: {policy}.")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}.")
+    workers = workers or os.cpu_count() or 1
+    limits = limits or SearchLimits(depth=1)
+    seed = random.randrange(1 << 32) if seed is None else seed
+    os.makedirs(output_dir, exist_ok=True)
+
+    context = multiprocessing.get_context()
+    progress = context.Queue()
+    processes = [
+        context.Process(
+            target=_worker,
+            args=(
+                worker_id,
+                output_dir,
+                games,
+                policy,
+                limits.depth,
+                limits.time,
+                gametype,
+                max_turns,
+                fmt,
+                seed + worker_id,
+                progress,
+            ),
+            daemon=True,
+        )
+        for worker_id in range(workers)
+    ]
+
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+
+    total = games * workers
+    finished = 0
+    moves = 0
+    try:
+        while finished < total:
+            game_moves = progress.get()
+            if game_moves is None:
+                raise RuntimeError("Self-play worker failed.")
+            finished += 1
+            moves += game_moves
+            if report is not None:
+                report(finished, total, time.perf_counter() - start)
+    finally:
+        for process in processes:
+            if finished < total:
+                process.terminate()
+            process.join()
+
+    return SelfPlayStats(
+        games=finished,
+        moves=moves,
+        elapsed=time.perf_counter() - start,
+        shards=[shard_path(output_dir, i, fmt) for i in range(workers)],
+    )
+
+
+def _worker(
+    worker_id: int,
+    output_dir: str,
+    games: int,
+    policy_name: str,
+    depth: int | None,
+    search_time: float | None,
+    gametype: str,
+    max_turns: int | None,
+    fmt: str,
+    seed: int,
+    progress: multiprocessing.Queue,
+) -> None:
+    try:
+        policy = make_policy(
+            policy_name, SearchLimits(depth, search_time), random.Random(seed)
+        )
+        path = shard_path(output_dir, worker_id, fmt)
+        with _shard_writer(path, fmt) as write:
+            for _ in range(games):
+                game = play_game(gametype, policy, max_turns)
+                write(game)
+                progress.put(len(game.moves))
+    except BaseException:
+        progress.put(None)
+        raise
+
+
+@contextlib.contextmanager
+def _shard_writer(path: str, fmt: str) -> Iterator[Callable[[Game], None]]:
+    """Yields the function appending a game to the shard and flushing it."""
+    if fmt == "binary":
+        with records.RecordWriter(path) as writer:
+
+            def write_record(game: Game) -> None:
+                writer.write(game)
+                writer.flush()
+
+            yield write_record
+    else:
+        with open(path, "a") as shard:
+
+            def write_line(game: Game) -> None:
+                shard.write(game.status + "\n")
+                shard.flush()
+
+            yield write_line
@@ -0,0 +1,310 @@
+"""Texel tuning of the static evaluation weights on finished games.
+
+Positions sampled from the games are turned into rows of the features of
+the side to move and the result of the game for that side. The weights are
+fitted so that the sigmoid of the evaluation divided by the scale predicts
+the results, minimizing the log loss with full batch Adam steps.
+"""
+
+import itertools
+import multiprocessing
+import os
+import random
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+from honeycomb.engine import notation, staticeval, symmetry
+from honeycomb.engine.game import Game
+from honeycomb.records import GameSource, read_corpus
+
+_RESULTS = {
+    notation.GameState.WhiteWins: (1.0, 0.0),
+    notation.GameState.BlackWins: (0.0, 1.0),
+    notation.GameState.Draw: (0.5, 0.5),
+}
+_SCALE_RANGE = (10.0, 10000.0)
+_SCALE_STEPS = 60
+CHUNK_GAMES = 256
+
+
+class TuneResult:
+    __slots__ = "positions", "scale", "initial_loss", "loss", "weights"
+
+    def __init__(
+        self,
+        positions: int,
+        scale: float,
+        initial_loss: float,
+        loss: float,
+        weights: dict[str, float],
+    ) -> None:
+        self.positions = positions
+        self.scale = scale
+        self.initial_loss = initial_loss
+        self.loss = loss
+        self.weights = weights
+
+
+def game_positions(
+    source: GameSource,
+    rng: random.Random,
+    sample: float,
+    skip_plies: int,
+    keys: list[int] | None = None,
+) -> tuple[list[tuple[int, ...]], list[float]]:
+    """Replays the finished game and returns the sampled features and results.
+
+    The features come from the accumulator of the replayed hive, so a
+    position costs only the move that leads to it. The canonical fingerprints
+    of the sampled positions are appended to `keys` if it is given.
+    """
+    if isinstance(source, str):
+        gametype, state, _, _, moves = notation.GameString.decompose(source)
+        game = Game()
+        game.new_game(notation.GameTypeString.build(gametype))
+
+        def push(move: str) -> None:
+            game.play(move)
+
+    else:
+        state = source.state
+        moves = list(source.moves())  # type: ignore
+        game = Game()
+        game.new_game(source.gametype)
+
+        def push(move: str) -> None:
+            game.push(move, validate=False)  # type: ignore
+
+    if state not in _RESULTS:
+        return [], []
+    white_result, black_result = _RESULTS[state]
+    staticeval.accumulator(game.hive)
+
+    rows = []
+    targets = []
+    for ply, move in enumerate(moves):
+        if ply >= skip_plies and rng.random() < sample:
+            rows.append(staticeval.features(game))
+            if keys is not None:
+                keys.append(symmetry.canonical(game)[0])
+            white = game.turn_color == notation.PieceColor.WHITE
+            targets.append(white_result if white else black_result)
+        push(move)
+    return rows, targets
+
+
+def extract(
+    sources: Iterable[GameSource],
+    sample: float = 0.25,
+    skip_plies: int = 8,
+    workers: int | None = None,
+    seed: int = 0,
+    report: Callable[[int, int], None] | None = None,
+    unique: bool = False,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the feature rows and the results of the positions of the games.
+
+    The games are replayed in chunks by the worker processes. `report` is
+    called with the numbers of games and positions after every chunk. With
+    `unique` the positions that are translations, rotations or reflections of
+    each other are merged into one row with the mean of their results.
+    """
+    chunks = _chunks(sources, CHUNK_GAMES)
+    tasks = (
+        (chunk, sample, skip_plies, seed + i, unique) for i, chunk in enumerate(chunks)
+    )
+
+    features = []
+    targets = []
+    keys = []
+    games = 0
+    positions = 0
+
+    def add(result: tuple[np.ndarray, np.ndarray, np.ndarray, int]) -> None:
+        nonlocal games, positions
+        chunk_features, chunk_targets, chunk_keys, chunk_games = result
+        features.append(chunk_features)
+        targets.append(chunk_targets)
+        keys.append(chunk_keys)
+        games += chunk_games
+        positions += len(chunk_targets)
+        if report is not None:
+            report(games, positions)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in tasks:
+            add(_extract_chunk(task))
+    else:
+        with multiprocessing.get_context().Pool(workers) as pool:
+            for result in pool.imap(_extract_chunk, tasks):
+                add(result)
+
+    if not features:
+        return (
+            np.zeros((0, len(staticeval.FEATURES)), dtype=np.float32),
+            np.zeros(0, dtype=np.float32),
+        )
+    if unique:
+        return _merge_positions(
+            np.concatenate(features), np.concatenate(targets), np.concatenate(keys)
+        )
+    return np.concatenate(features), np.concatenate(targets)
+
+
+def loss(
+    features: np.ndarray, targets: np.ndarray, weights: np.ndarray, scale: float
+) -> float:
+    """Mean log loss of the predicted results."""
+    return float(_log_loss(_sigmoid(features @ weights / scale), targets))
+
+
+def fit_scale(features: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> float:
+    """Returns the scale of the evaluation that best predicts the results.
+
+    It keeps the fitted weights in the units of the given ones. The loss is
+    convex in the inverse of the scale, which a golden section search finds.
+    """
+    evaluations = features @ weights
+
+    def scale_loss(inverse: float) -> float:
+        return float(_log_loss(_sigmoid(evaluations * inverse), targets))
+
+    ratio = (np.sqrt(5) - 1) / 2
+    low, high = 1 / _SCALE_RANGE[1], 1 / _SCALE_RANGE[0]
+    for _ in range(_SCALE_STEPS):
+        left = high - ratio * (high - low)
+        right = low + ratio * (high - low)
+        if scale_loss(left) <= scale_loss(right):
+            high = right
+        else:
+            low = left
+    return 2 / (low + high)
+
+
+def fit(
+    features: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    scale: float,
+    epochs: int = 500,
+    learning_rate: float = 1.0,
+    l2: float = 0.0,
+) -> np.ndarray:
+    """Fits the weights by full batch Adam steps from the given ones."""
+    weights = weights.astype(np.float64)
+    features = features.astype(np.float64)
+    moment = np.zeros_like(weights)
+    velocity = np.zeros_like(weights)
+    beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+    for step in range(1, epochs + 1):
+        probabilities = _sigmoid(features @ weights / scale)
+        gradient = features.T @ (probabilities - targets) / (len(targets) * scale)
+        gradient += l2 * weights
+        moment = beta1 * moment + (1 - beta1) * gradient
+        velocity = beta2 * velocity + (1 - beta2) * gradient**2
+        corrected = moment / (1 - beta1**step)
+        weights -= (
+            learning_rate
+            * corrected
+            / (np.sqrt(velocity / (1 - beta2**step)) + epsilon)
+        )
+    return weights
+
+
+def tune(
+    paths: Iterable[str | os.PathLike],
+    output: str | os.PathLike | None = None,
+    initial: dict[str, float] | None = None,
+    sample: float = 0.25,
+    skip_plies: int = 8,
+    epochs: int = 500,
+    learning_rate: float = 1.0,
+    l2: float = 0.0,
+    workers: int | None = None,
+    seed: int = 0,
+    report: Callable[[int, int], None] | None = None,
+    unique: bool = False,
+) -> TuneResult:
+    """Fits the weights to the games of the corpus and writes them to `output`.
+
+    The scale is fitted to the initial weights first, the defaults or the
+    `initial` ones, so that the tuned weights stay in the evaluation units
+    the search is built around.
+    """
+    features, targets = extract(
+        read_corpus(paths), sample, skip_plies, workers, seed, report, unique
+    )
+    if not len(targets):
+        raise ValueError("No positions of finished games in the corpus.")
+
+    start = staticeval.StaticEvaluator(initial).weights
+    weights = np.array([start[name] for name in staticeval.FEATURES])
+    scale = fit_scale(features, targets, weights)
+    initial_loss = loss(features, targets, weights, scale)
+    weights = fit(features, targets, weights, scale, epochs, learning_rate, l2)
+
+    tuned = {
+        name: round(float(weight), 2)
+        for name, weight in zip(staticeval.FEATURES, weights)
+    }
+    if output is not None:
+        staticeval.save_weights(tuned, output)
+    return TuneResult(
+        positions=len(targets),
+        scale=scale,
+        initial_loss=initial_loss,
+        loss=loss(features, targets, weights, scale),
+        weights=tuned,
+    )
+
+
+def _chunks(sources: Iterable[GameSource], size: int) -> Iterator[list[GameSource]]:
+    iterator = iter(sources)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _extract_chunk(
+    task: tuple[list[GameSource], float, int, int, bool],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    sources, sample, skip_plies, seed, unique = task
+    rng = random.Random(seed)
+    rows = []
+    targets = []
+    keys: list[int] | None = [] if unique else None
+    for source in sources:
+        game_rows, game_targets = game_positions(source, rng, sample, skip_plies, keys)
+        rows.extend(game_rows)
+        targets.extend(game_targets)
+    features = np.array(rows, dtype=np.float32).reshape(-1, len(staticeval.FEATURES))
+    return (
+        features,
+        np.array(targets, dtype=np.float32),
+        np.array(keys or [], dtype=np.uint64),
+        len(sources),
+    )
+
+
+def _merge_positions(
+    features: np.ndarray, targets: np.ndarray, keys: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Keeps the first row of every fingerprint with the mean of its results."""
+    _, first, inverse, counts = np.unique(
+        keys, return_index=True, return_inverse=True, return_counts=True
+    )
+    means = np.bincount(inverse.reshape(-1), weights=targets) / counts
+    order = np.argsort(first)
+    return features[first[order]], means[order].astype(np.float32)
+
+
+def _log_loss(probabilities: np.ndarray, targets: np.ndarray) -> float:
+    probabilities = np.clip(probabilities, 1e-7, 1 - 1e-7)
+    return -np.mean(
+        targets * np.log(probabilities) + (1 - targets) * np.log1p(-probabilities)
+    )
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (1 + np.tanh(x / 2))
@@ -35,6 +35,7 @@ setuptools.setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
+    extras_require={"ml": ["numpy>=1.23"]},
     tests_require=test_requires,
     python_requires=">=3.10",
 )
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from honeycomb.engine import hive as h
+from honeycomb.engine.game import Game, PassMoveNotAllowedError
+
+np = pytest.importorskip("numpy")
+
+from honeycomb.engine import planes  # noqa: E402
+from honeycomb.engine.actions import ActionSpace, action_space  # noqa: E402
+
+_GAMESTRING = "Base;InProgress;White[3];wS1;bG1 -wS1;wA1 wS1/;bG2 /bG1"
+
+
+def _game(gamestring: str) -> Game:
+    game = Game()
+    game.load_game(gamestring)
+    return game
+
+
+@pytest.mark.parametrize("position", [(0, 0), (1, 0), (-1, 3), (2, -2), (-3, -1)])
+def test_offset_inverts_axial(position: tuple[int, int]):
+    assert h.offset(h.axial(position)) == position
+
+
+def test_action_space_has_cell_for_every_piece_and_pass():
+    space = ActionSpace(size=5)
+
+    assert len(space) == 28 * 25 + 1
+    assert space.pass_action == len(space) - 1
+    assert action_space(5) is action_space(5)
+
+
+def test_legal_action_mask_matches_legal_moves():
+    game = _game(_GAMESTRING)
+    space = action_space()
+    center = planes.hive_center(game.hive)
+
+    mask = game.legal_action_mask()
+
+    assert mask.dtype == bool
+    assert mask.sum() == game.count_moves()
+    for move in game.legal_moves():
+        action = space.index(move, center)
+        assert action is not None and mask[action]
+        assert space.move(action, center) == move
+
+
+def test_play_action_plays_random_game_to_the_end():
+    game = Game()
+    game.new_game()
+    rng = random.Random(0)
+    out = np.zeros(len(action_space()), dtype=bool)
+
+    while not game.is_over and game.turn_num < 60:
+        actions = np.flatnonzero(action_space().legal_mask(game, out))
+        move = game.play_action(int(rng.choice(actions)))
+        assert game.moves[-1] == move
+
+
+def test_pass_action_is_validated():
+    game = Game()
+    game.new_game()
+
+    with pytest.raises(PassMoveNotAllowedError):
+        game.play_action(action_space().pass_action)
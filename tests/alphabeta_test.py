@@ -0,0 +1,195 @@
+import pytest
+
+from honeycomb.engine import logic
+from honeycomb.engine.alphabeta import MATE_SCORE, AlphaBetaSearch
+from honeycomb.engine.game import Game, GameTerminatedError
+from honeycomb.engine.parallel import LazySmpSearch
+from honeycomb.engine.search import SearchLimits
+from honeycomb.engine.transposition import (
+    Bound,
+    SharedTranspositionTable,
+    TranspositionTable,
+)
+
+_GAMESTRING = "Base;InProgress;White[3];wS1;bG1 -wS1;wA1 wS1/;bG2 /bG1"
+_WIN_IN_ONE_GAMESTRING = (
+    "Base;InProgress;White[19];wB1;bS1 wB1-;wS1 -wB1;bQ bS1\\;wA1 /wS1;"
+    "bB1 /bQ;wQ -wS1;bS2 /bB1;wS2 \\wS1;bB2 bB1-;wA1 bB2-;bG1 bQ/;wG1 \\wB1;"
+    "bA1 bS2\\;wA2 -wQ;bA1 wA1-;wA2 -bB1;bA1 /wA2;wA2 \\bS1;bA2 /bB2;"
+    "wB1 wS1\\;bA2 \\wS2;wA1 -bA2;bG2 -bA1;wB1 wS1;bA3 bA2/;wA1 bA3-;"
+    "bG3 -bA2;wG2 wA1-;bB2 bQ-;wA3 wB1\\;bG2 bS2-;wG3 wG2-;bA1 /wA3;wB2 /wQ;"
+    "bG2 /bS1"
+)
+
+
+def _game(gamestring: str) -> Game:
+    game = Game()
+    game.load_game(gamestring)
+    return game
+
+
+@pytest.mark.parametrize(
+    "move",
+    [
+        pytest.param(logic.PASS_MOVE, id="pass"),
+        pytest.param(logic.Move("wQ", (0, 0)), id="origin"),
+        pytest.param(logic.Move("bM", (-128, 127)), id="bounds"),
+    ],
+)
+def test_move_code_roundtrip(move: logic.Move):
+    assert logic.decode_move(logic.encode_move(move)) == move
+
+
+@pytest.mark.parametrize(
+    "table",
+    [
+        pytest.param(TranspositionTable, id="local"),
+        pytest.param(SharedTranspositionTable, id="shared"),
+    ],
+)
+def test_transposition_table_store_and_probe(table):
+    tt = table(1024)
+    move_code = logic.encode_move(logic.Move("wA1", (-1, 2)))
+
+    tt.store(0xDEADBEEF, 5, -MATE_SCORE + 3, Bound.UPPER, move_code)
+
+    assert tt.probe(0xDEADBEEF) == (5, -MATE_SCORE + 3, Bound.UPPER, move_code)
+    assert tt.probe(0xDEADBEEF + 1) is None
+    if isinstance(tt, SharedTranspositionTable):
+        tt.close()
+
+
+def test_shared_transposition_table_is_visible_after_attach():
+    tt = SharedTranspositionTable(1024)
+    attached = SharedTranspositionTable(name=tt.name)
+
+    tt.store(42, 3, 100, Bound.EXACT, 0)
+
+    assert attached.probe(42) == (3, 100, Bound.EXACT, 0)
+    attached.close()
+    tt.close()
+
+
+@pytest.mark.parametrize(
+    "features",
+    [
+        pytest.param({}, id="default"),
+        pytest.param(dict(pvs=False, aspiration=False, lmr=False), id="plain"),
+        pytest.param(dict(futility=True), id="futility"),
+    ],
+)
+def test_alphabeta_finds_winning_move(features: dict):
+    game = _game(_WIN_IN_ONE_GAMESTRING)
+
+    result = AlphaBetaSearch(**features).search(game, SearchLimits(depth=3))
+    game.push(result.move)
+
+    assert game.state == game.state.WhiteWins
+    assert result.score == MATE_SCORE - 1
+
+
+def test_lazy_smp_returns_playable_move():
+    game = _game(_GAMESTRING)
+    search = LazySmpSearch(processes=2, tt_entries=1 << 12)
+
+    try:
+        result = search.search(game, SearchLimits(depth=2))
+    finally:
+        search.close()
+
+    assert result.depth == 2
+    assert result.nodes > 0
+    game.push(result.move)
+
+
+def test_lazy_smp_survives_dead_workers():
+    game = _game(_GAMESTRING)
+    search = LazySmpSearch(processes=2, tt_entries=1 << 12)
+    workers = search._pool.workers
+
+    try:
+        workers[1].kill()
+        workers[1].join()
+        result = search.search(game, SearchLimits(depth=2))
+        assert result.depth == 2
+
+        workers[0].kill()
+        workers[0].join()
+        with pytest.raises(RuntimeError):
+            search.search(game, SearchLimits(time=60))
+    finally:
+        search.close()
+
+
+def test_search_of_finished_game_raises(finished_game: Game):
+    with pytest.raises(GameTerminatedError):
+        AlphaBetaSearch().search(finished_game, SearchLimits(depth=1))
+    with pytest.raises(GameTerminatedError):
+        AlphaBetaSearch().analyze(finished_game, SearchLimits(depth=1), 2)
+
+
+def test_pvs_and_aspiration_keep_the_score():
+    plain = AlphaBetaSearch(pvs=False, aspiration=False, lmr=False)
+    selective = AlphaBetaSearch(lmr=False)
+
+    plain_result = plain.search(_game(_GAMESTRING), SearchLimits(depth=3))
+    selective_result = selective.search(_game(_GAMESTRING), SearchLimits(depth=3))
+
+    assert selective_result.score == plain_result.score
+
+
+def test_search_reports_iterations_with_principal_variation():
+    game = _game(_GAMESTRING)
+    reports = []
+
+    result = AlphaBetaSearch().search(
+        game, SearchLimits(depth=3), on_iteration=reports.append
+    )
+
+    assert [report.depth for report in reports] == [1, 2, 3]
+    assert result.pv[0] == result.move_str
+    assert 1 <= len(result.pv) <= 3
+    assert 0 < result.tt_hits <= result.tt_probes
+    assert str(result).startswith(f"depth 3 score {result.score} nodes")
+
+
+def test_search_reports_progress_between_iterations():
+    game = _game(_GAMESTRING)
+    reports = []
+
+    AlphaBetaSearch().search(
+        game,
+        SearchLimits(depth=4),
+        on_iteration=reports.append,
+        progress_interval=1e-6,
+    )
+
+    assert len(reports) > 4
+    assert [report.nodes for report in reports] == sorted(
+        report.nodes for report in reports
+    )
+
+
+def test_analyze_ranks_distinct_candidates():
+    plain = dict(pvs=False, aspiration=False, lmr=False)
+    best = AlphaBetaSearch(**plain).search(_game(_GAMESTRING), SearchLimits(depth=3))
+
+    results = AlphaBetaSearch(**plain).analyze(
+        _game(_GAMESTRING), SearchLimits(depth=3), count=4
+    )
+
+    assert len({result.move for result in results}) == 4
+    assert results[0].score == best.score
+    assert [r.score for r in results] == sorted(
+        (r.score for r in results), reverse=True
+    )
+    assert all(result.pv[0] == result.move_str for result in results)
+
+
+def test_analyze_puts_the_winning_move_first():
+    game = _game(_WIN_IN_ONE_GAMESTRING)
+
+    results = AlphaBetaSearch().analyze(game, SearchLimits(depth=2), count=3)
+
+    assert results[0].score == MATE_SCORE - 1
+    assert len(results) == 3
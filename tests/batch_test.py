@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from honeycomb.engine import planes  # noqa: E402
+from honeycomb.engine.actions import action_space  # noqa: E402
+from honeycomb.engine.batch import BatchGame, IllegalActionError  # noqa: E402
+
+
+def _random_actions(batch: BatchGame, rng: random.Random) -> list[int]:
+    return [int(rng.choice(np.flatnonzero(mask))) for mask in batch.masks]
+
+
+def test_reset_returns_start_observations():
+    batch = BatchGame(3, size=7)
+
+    observations = batch.reset()
+
+    assert observations.shape == (3, *planes.planes_shape(7))
+    assert batch.masks.shape == (3, len(action_space(7)))
+    assert not observations[:, : planes.BOARD_PLANES].any()
+    assert observations[:, -1].all()
+
+
+def test_step_plays_actions_in_every_game():
+    batch = BatchGame(4)
+    rng = random.Random(0)
+
+    observations, rewards, dones = batch.step(_random_actions(batch, rng))
+
+    assert all(len(game.moves) == 1 for game in batch.games)
+    assert observations[:, : planes.BOARD_PLANES].sum() == 4
+    assert not rewards.any()
+    assert not dones.any()
+
+
+def test_step_resets_finished_games():
+    batch = BatchGame(2, max_turns=3)
+    rng = random.Random(0)
+
+    for _ in range(6):
+        _, rewards, dones = batch.step(_random_actions(batch, rng))
+
+    assert dones.all()
+    assert not rewards.any()
+    assert len(batch.finished) == 2
+    assert all(not game.moves for game in batch.games)
+
+
+def test_step_rejects_illegal_action_before_playing():
+    batch = BatchGame(3)
+    rng = random.Random(0)
+    batch.step(_random_actions(batch, rng))
+    observations = batch.observations.copy()
+    statuses = [game.status for game in batch.games]
+    actions = _random_actions(batch, rng)
+    actions[1] = action_space().pass_action
+
+    with pytest.raises(IllegalActionError):
+        batch.step(actions)
+
+    assert [game.status for game in batch.games] == statuses
+    assert np.array_equal(batch.observations, observations)
+
+
+def test_step_rejects_wrong_number_of_actions():
+    batch = BatchGame(3)
+    rng = random.Random(0)
+
+    with pytest.raises(ValueError):
+        batch.step(_random_actions(batch, rng)[:1])
+
+    assert all(not game.moves for game in batch.games)
@@ -0,0 +1,14 @@
+from honeycomb import benchmark
+
+
+def test_benchmark_reports_every_depth_of_every_position():
+    reported = []
+
+    rows = benchmark.run_benchmark(2, report=reported.append)
+
+    assert rows == reported
+    assert [(row.position, row.result.depth) for row in rows] == [
+        (name, depth) for name, _ in benchmark.POSITIONS for depth in (1, 2)
+    ]
+    assert all(row.result.nodes > 0 for row in rows)
+    assert "nodes" in str(rows[0])
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from honeycomb import PASS_MOVE, Board, Move
+from honeycomb.engine.game import (
+    GameTerminatedError,
+    InvalidAddingPositionError,
+    InvalidMovingPositionError,
+    InvalidPieceColor,
+)
+from honeycomb.engine.logic import MoveOrder
+from honeycomb.engine.notation import GameState, PieceColor
+
+
+@pytest.mark.parametrize(
+    "gamestring",
+    [
+        pytest.param("Base;NotStarted;White[1]", id="not_started"),
+        pytest.param(
+            "Base;InProgress;White[3];wS1;bG1 -wS1;wA1 wS1/;bG2 /bG1", id="in_progress"
+        ),
+        pytest.param(
+            "Base;InProgress;Black[12];wQ;bQ -wQ;wG1 wQ-;bG1 -bQ;wG2 wG1-;bG2 -bG1;wG3 wG2-;bG3 -bG2;wS1 wG3-;bS1 -bG3;wS2 wS1-;bS2 -bS1;wB1 wS2-;bB1 -bS2;wB2 wB1-;bB2 -bB1;wA1 wB2-;bA1 -bB2;wA2 wA1-;bA2 -bA1;wA3 wA2-;bA3 -bA2;wA3 -bA3",
+            id="pass",
+        ),
+    ],
+)
+def test_legal_moves_match_valid_moves(gamestring: str):
+    board = Board(gamestring)
+
+    moves = board.legal_moves()
+
+    assert len(moves) == len(set(moves))
+    assert {board.move_str(move) for move in moves} == board.game.valid_moves()
+    assert board.count_moves() == len(moves)
+    assert set(board.iter_moves(MoveOrder.HAND_FIRST)) == set(moves)
+    assert board.sample_move(random.Random(0)) in moves
+
+
+def test_sample_move_draws_every_move():
+    board = Board("Base;InProgress;White[2];wS1;bG1 -wS1")
+    rng = random.Random(0)
+
+    samples = {board.sample_move(rng) for _ in range(500)}
+
+    assert samples == set(board.legal_moves())
+
+
+def test_push_and_pop_restore_game_str():
+    gamestring = "Base;InProgress;White[3];wS1;bG1 -wS1;wA1 wS1/;bG2 /bG1"
+    board = Board(gamestring)
+
+    for move in board.legal_moves():
+        move_str = board.move_str(move)
+        board.push(move)
+        assert board.game_str.endswith(f";{move_str}")
+        assert board.to_move == PieceColor.BLACK
+        assert board.pop() == move
+        assert board.game_str == gamestring
+
+
+def test_push_pass_when_no_moves():
+    board = Board(
+        "Base;InProgress;Black[12];wQ;bQ -wQ;wG1 wQ-;bG1 -bQ;wG2 wG1-;bG2 -bG1;wG3 wG2-;bG3 -bG2;wS1 wG3-;bS1 -bG3;wS2 wS1-;bS2 -bS1;wB1 wS2-;bB1 -bS2;wB2 wB1-;bB2 -bB1;wA1 wB2-;bA1 -bB2;wA2 wA1-;bA2 -bA1;wA3 wA2-;bA3 -bA2;wA3 -bA3"
+    )
+
+    assert board.legal_moves() == [PASS_MOVE]
+    board.push(PASS_MOVE)
+    assert board.game_str.endswith(";pass")
+
+
+@pytest.mark.parametrize(
+    ("move", "error"),
+    [
+        pytest.param(Move("bS1", (0, -2)), InvalidPieceColor, id="color"),
+        pytest.param(Move("wQ", (5, 5)), InvalidAddingPositionError, id="adding"),
+        pytest.param(Move("wA1", (5, 5)), InvalidMovingPositionError, id="moving"),
+    ],
+)
+def test_push_invalid_move_raises_error(move: Move, error: type):
+    board = Board("Base;InProgress;White[3];wS1;bG1 -wS1;wA1 wS1/;bG2 /bG1")
+
+    with pytest.raises(error):
+        board.push(move)
+
+
+def test_result_after_game_end():
+    board = Board(
+        "Base;InProgress;Black[5];wQ;bG1 wQ-;wG1 -wQ;bQ bG1\\;wG2 /wQ;bA1 bG1-;wA1 \\wQ;bQ wQ\\;wG2 wQ/"
+    )
+    assert board.result is None
+
+    board.push_str("bA1 /wQ")
+
+    assert board.result == GameState.BlackWins
+    assert board.legal_moves() == []
+    assert board.count_moves() == 0
+    assert board.sample_move(random.Random(0)) is None
+    with pytest.raises(GameTerminatedError):
+        board.push(PASS_MOVE)
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from honeycomb import records
+from honeycomb.engine import Engine, book
+from honeycomb.engine.game import Game
+
+
+@pytest.fixture
+def corpus(write_corpus):
+    return write_corpus(3)
+
+
+@pytest.fixture
+def opening_book(tmp_path, corpus):
+    path = tmp_path / "book.hcb"
+    book.build_book(records.read_corpus([corpus]), path, max_plies=4)
+    with book.OpeningBook(path) as opening_book:
+        yield opening_book
+
+
+def test_book_counts_the_games_of_every_move(opening_book: book.OpeningBook):
+    game = Game()
+
+    first_moves = opening_book.moves(game)
+
+    # The unfinished game is left out.
+    assert [(entry.games, entry.points) for entry in first_moves] == [(3, 6)]
+    assert game.move_str(first_moves[0].move) == "wG1"
+    game.push(first_moves[0].move)
+    replies = opening_book.moves(game)
+    assert [(e.games, e.points, e.score) for e in replies] == [(3, 0, 0.0)]
+    # The six replies around the first piece are one move up to symmetry.
+    assert game.move_str(replies[0].move) == "bQ \\wG1"
+
+
+def test_book_finds_every_position_of_the_lines(
+    opening_book: book.OpeningBook, finished_game: Game
+):
+    game = Game()
+    for move in finished_game.moves[:4]:
+        entries = opening_book.moves(game)
+        assert len(entries) == 1
+        game.push(entries[0].move)
+        book_key = book.fingerprint(game)
+        game.undo(1)
+        game.push(move)
+        assert book.fingerprint(game) == book_key
+
+    assert opening_book.moves(game) == []
+    assert len(opening_book) == 4
+
+
+def test_book_skips_other_gametypes_and_rare_moves(tmp_path, corpus):
+    path = tmp_path / "book.hcb"
+
+    entries = book.build_book(
+        records.read_corpus([corpus]), path, gametype="Base+M", max_plies=4
+    )
+    assert entries == 0
+
+    assert book.build_book(records.read_corpus([corpus]), path, min_games=4) == 0
+    assert book.build_book(records.read_corpus([corpus]), path, min_games=3) > 0
+    with book.OpeningBook(path) as opening_book:
+        assert opening_book.choose(Game(), random.Random(0), min_games=4) is None
+        assert opening_book.choose(Game(), random.Random(0)).games == 3  # type: ignore
+
+
+def test_book_finds_the_symmetric_positions(
+    opening_book: book.OpeningBook, finished_game: Game
+):
+    line = Game()
+    for move in finished_game.moves[:3]:
+        line.push(move)
+
+    for move_str in ("bQ wG1-", "bQ wG1/", "bQ wG1\\", "bQ -wG1", "bQ /wG1"):
+        game = Game()
+        game.play("wG1")
+        game.play(move_str)
+        (entry,) = opening_book.moves(game)
+        assert entry.games == 3 and entry.move in set(game.legal_moves())
+        game.push(entry.move)
+        assert book.fingerprint(game) == book.fingerprint(line)
+
+
+def test_records_build_the_same_book(tmp_path, corpus):
+    record_path = tmp_path / "games.hgr"
+    records.text_to_records(corpus, record_path)
+    text_book = tmp_path / "text.hcb"
+    record_book = tmp_path / "record.hcb"
+
+    book.build_book(records.read_corpus([corpus]), text_book)
+    book.build_book(records.read_corpus([record_path]), record_book)
+
+    assert text_book.read_bytes() == record_book.read_bytes()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param(b"", id="empty"),
+        pytest.param(b"HGR\x01", id="magic"),
+        pytest.param(book.MAGIC + bytes(12) + b"\x01", id="truncated"),
+    ],
+)
+def test_open_invalid_book_raises(tmp_path, content: bytes):
+    path = tmp_path / "book.hcb"
+    path.write_bytes(content)
+
+    with pytest.raises(book.BookFormatError):
+        book.OpeningBook(path)
+
+
+def test_bestmove_plays_book_move(opening_book: book.OpeningBook):
+    engine = Engine(book=opening_book)
+    engine.execute("options set SearchMode AlphaBeta")
+
+    for expected in ("wG1", "bQ \\wG1"):
+        move, ok = engine.execute("bestmove depth 3").splitlines()
+        assert move == expected
+        assert engine.last_search is not None and engine.last_search.nodes == 0
+        engine.execute(f"play {move}")
+
+    engine.execute("options set OwnBook False")
+    engine.execute("bestmove depth 1")
+    assert engine.last_search is not None and engine.last_search.nodes > 0
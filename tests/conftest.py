@@ -0,0 +1,45 @@
+import pathlib
+from typing import Callable
+
+import pytest
+
+from honeycomb.engine import notation
+from honeycomb.engine.game import Game
+
+MATE_IN_TWO_GAMESTRING = (
+    "Base;InProgress;White[29];wG1;bQ wG1\\;wS1 -wG1;bS1 bQ-;wS2 /wS1;"
+    "bG1 /bQ;wQ \\wS1;bB1 /bS1;wS2 /bG1;bB1 wS2-;wB1 /wQ;bA1 /bS1;"
+    "wA1 wG1/;bA1 wQ/;wA1 bA1/;bA2 bS1-;wA2 wG1/;bA3 bA2/;wG2 wA2/;"
+    "bS2 \\bA3;wB2 wA1/;bG2 bA2\\;wA3 -wQ;bG3 bG2-;wA3 wB2-;bB2 /bA2;"
+    "wA3 bA3-;bB2 bA2;wA3 -bA1;bB1 /bS1;wA3 -wB1;bB1 bG1;wA3 -wQ;bB1 wS2;"
+    "wG3 \\wB2;bB2 /bA2;wA3 \\wG3;bS2 \\bG3;wB1 wS1;bG2 -bA3;wA3 bB2\\;"
+    "bA3 bB1-;wA3 \\bS2;bA3 wA3/;wB1 -wA2;bA3 /bB1;wA3 wB2-;bA3 -wG3;"
+    "wB1 wS1;bA3 bB2\\;wA3 wG3/;bA3 /bB1;wA3 bA3\\;bB2 bA2;wG2 /wG1;"
+    "bG2 /bS2"
+)
+# The moves after MATE_IN_TWO_GAMESTRING that win it for white.
+WINNING_LINE = ("wA2 /bS1", "bB1 /wG2", "wA3 \\bS1")
+
+
+@pytest.fixture
+def finished_game() -> Game:
+    game = Game()
+    game.load_game(MATE_IN_TWO_GAMESTRING)
+    for move_str in WINNING_LINE:
+        game.play(move_str)
+    assert game.state == notation.GameState.WhiteWins
+    return game
+
+
+@pytest.fixture
+def write_corpus(tmp_path, finished_game: Game) -> Callable[[int], pathlib.Path]:
+    """Writes copies of the finished game and the unfinished one to a file."""
+
+    def write(copies: int) -> pathlib.Path:
+        path = tmp_path / "games.txt"
+        path.write_text(
+            f"{finished_game.status}\n" * copies + f"\n{MATE_IN_TWO_GAMESTRING}\n"
+        )
+        return path
+
+    return write
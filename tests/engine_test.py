@@ -0,0 +1,348 @@
+import pathlib
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from honeycomb.engine import Engine
+from honeycomb.engine.game import Game
+from honeycomb.engine.mcts import MctsSearch, add_visit
+from honeycomb.engine.parallel import ParallelMctsSearch
+from honeycomb.engine.search import SearchLimits
+from tests.conftest import MATE_IN_TWO_GAMESTRING
+
+_GAMESTRING = "Base;InProgress;White[3];wS1;bG1 -wS1;wA1 wS1/;bG2 /bG1"
+
+
+@pytest.fixture
+def engine() -> Engine:
+    return Engine()
+
+
+def test_options_lists_every_option(engine: Engine):
+    lines = engine.execute("options").splitlines()
+
+    assert "SearchMode;enum;Random;Random;Random;MCTS;AlphaBeta" in lines
+    assert lines[-1] == "ok"
+
+
+@pytest.mark.parametrize(
+    ("command", "response"),
+    [
+        pytest.param(
+            "options set SearchMode MCTS",
+            "SearchMode;enum;MCTS;Random;Random;MCTS;AlphaBeta",
+            id="set_enum",
+        ),
+        pytest.param(
+            "options set MctsPlayoutDepth 5",
+            "MctsPlayoutDepth;int;5;10;0;200",
+            id="set_int",
+        ),
+        pytest.param(
+            "options set AlphaBetaFutility True",
+            "AlphaBetaFutility;bool;True;False",
+            id="set_bool",
+        ),
+        pytest.param(
+            "options get MctsSelection",
+            "MctsSelection;enum;UCT;UCT;UCT;PUCT",
+            id="get",
+        ),
+    ],
+)
+def test_options_get_and_set(engine: Engine, command: str, response: str):
+    assert engine.execute(command) == f"{response}\nok"
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "options set SearchMode Foo",
+        "options set MctsPlayoutDepth -1",
+        "options get Foo",
+        "options foo",
+    ],
+)
+def test_options_invalid_command_returns_error(engine: Engine, command: str):
+    assert engine.execute(command).startswith("err ")
+
+
+@pytest.mark.parametrize("selection", ["UCT", "PUCT"])
+@pytest.mark.parametrize("limit", ["depth 20", "time 00:00:01"])
+def test_bestmove_mcts_returns_valid_move(engine: Engine, selection: str, limit: str):
+    engine.execute("options set SearchMode MCTS")
+    engine.execute(f"options set MctsSelection {selection}")
+    engine.execute(f"newgame {_GAMESTRING}")
+
+    move, ok = engine.execute(f"bestmove {limit}").splitlines()
+
+    assert ok == "ok"
+    assert not engine.execute(f"play {move}").startswith("err ")
+    assert engine.last_search is not None
+    assert engine.last_search.nodes_per_second > 0
+
+
+@pytest.mark.parametrize("processes", ["1", "2"])
+def test_bestmove_alphabeta_returns_valid_move(engine: Engine, processes: str):
+    engine.execute("options set SearchMode AlphaBeta")
+    engine.execute(f"options set SearchProcesses {processes}")
+    engine.execute(f"newgame {_GAMESTRING}")
+
+    move, ok = engine.execute("bestmove depth 2").splitlines()
+
+    assert ok == "ok"
+    assert not engine.execute(f"play {move}").startswith("err ")
+    assert engine.last_search is not None
+    assert engine.last_search.depth == 2
+
+
+@pytest.mark.parametrize(
+    ("gamestring", "command", "response"),
+    [
+        pytest.param(MATE_IN_TWO_GAMESTRING, "solve", "mate 2 ", id="proven"),
+        pytest.param(_GAMESTRING, "solve plies 3", "nomate 3", id="disproven"),
+        pytest.param(
+            MATE_IN_TWO_GAMESTRING, "solve nodes 10 plies 5", "nomate 1", id="budget"
+        ),
+        pytest.param(_GAMESTRING, "solve plies", "err ", id="missing_value"),
+        pytest.param(_GAMESTRING, "solve depth 3", "err ", id="invalid_limit"),
+    ],
+)
+def test_solve(engine: Engine, gamestring: str, command: str, response: str):
+    engine.execute(f"newgame {gamestring}")
+
+    assert engine.execute(command).startswith(response)
+
+
+def test_bestmove_plays_proven_win(engine: Engine):
+    engine.execute("options set ProofPreSearch True")
+    engine.execute(f"newgame {MATE_IN_TWO_GAMESTRING}")
+
+    move, ok = engine.execute("bestmove depth 1").splitlines()
+
+    assert engine.last_proof is not None
+    assert move == engine.last_proof.move_str
+    assert engine.last_search is not None and engine.last_search.depth == 3
+
+
+@pytest.mark.parametrize(
+    ("mode", "depth"),
+    [
+        pytest.param("AlphaBeta", 2, id="alphabeta"),
+        pytest.param("MCTS", 300, id="mcts"),
+    ],
+)
+def test_ponder_hit_continues_search(engine: Engine, mode: str, depth: int):
+    engine.execute(f"options set SearchMode {mode}")
+    engine.execute("options set Ponder True")
+    engine.execute(f"newgame {_GAMESTRING}")
+    engine.execute(f"bestmove depth {depth}")
+    assert engine.ponderer.pondering
+
+    game = Game()
+    game.load_game(_GAMESTRING)
+    for move in engine.ponderer.expected:
+        engine.execute(f"play {game.move_str(move)}")
+        game.push(move)
+    move, ok = engine.execute("bestmove time 00:00:01").splitlines()
+
+    assert engine.ponderer.hits == 1
+    assert move in game.valid_moves()
+    assert engine.ponderer.pondering
+
+
+def test_ponder_miss_discards_search(engine: Engine):
+    engine.execute("options set SearchMode AlphaBeta")
+    engine.execute("options set Ponder True")
+    engine.execute(f"newgame {_GAMESTRING}")
+    move = engine.execute("bestmove depth 2").splitlines()[0]
+    expected_reply = engine.ponderer.expected[1]
+
+    status = engine.execute(f"play {move}").splitlines()[0]
+    game = Game()
+    game.load_game(status)
+    other = next(m for m in game.legal_moves() if m != expected_reply)
+    engine.execute(f"play {game.move_str(other)}")
+
+    assert not engine.ponderer.pondering
+    assert engine.ponderer.misses == 1
+
+
+@pytest.mark.parametrize(
+    ("mode", "depth"),
+    [
+        pytest.param("AlphaBeta", 3, id="alphabeta"),
+        pytest.param("MCTS", 300, id="mcts"),
+    ],
+)
+def test_bestmove_reports_progress(mode: str, depth: int):
+    lines = []
+    engine = Engine(output=lines.append)
+    engine.execute(f"options set SearchMode {mode}")
+    engine.execute("options set SearchProgress True")
+    engine.execute("options set ProgressInterval 0.000001")
+    engine.execute(f"newgame {_GAMESTRING}")
+
+    move, ok = engine.execute(f"bestmove depth {depth}").splitlines()
+
+    assert lines and all(line.startswith("progress depth ") for line in lines)
+    assert engine.last_search is not None
+    assert engine.last_search.pv[0] == move
+
+
+def test_progress_lines_precede_response_without_output(engine: Engine):
+    engine.execute("options set SearchMode AlphaBeta")
+    engine.execute("options set SearchProgress True")
+    engine.execute(f"newgame {_GAMESTRING}")
+
+    *progress, move, ok = engine.execute("bestmove depth 2").splitlines()
+
+    assert [line.split()[:3] for line in progress] == [
+        ["progress", "depth", "1"],
+        ["progress", "depth", "2"],
+    ]
+    assert progress[-1].endswith(engine.last_search.pv[-1])  # type: ignore
+
+
+@pytest.mark.parametrize(
+    ("mode", "depth"),
+    [
+        pytest.param("AlphaBeta", 2, id="alphabeta"),
+        pytest.param("MCTS", 200, id="mcts"),
+    ],
+)
+def test_analyze_returns_candidates(engine: Engine, mode: str, depth: int):
+    engine.execute(f"options set SearchMode {mode}")
+    engine.execute(f"newgame {_GAMESTRING}")
+    valid_moves = engine.execute("validmoves").splitlines()[0].split(";")
+
+    *lines, ok = engine.execute(f"analyze 3 depth {depth}").splitlines()
+
+    assert len(lines) == 3
+    for line, result in zip(lines, engine.last_analysis):
+        move, score, pv = line.split(";")
+        assert move in valid_moves
+        assert move == result.move_str
+        assert pv.startswith(move)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        pytest.param("3", id="missing_limit"),
+        pytest.param("0 depth 2", id="zero_count"),
+        pytest.param("3 nodes 2", id="invalid_limit"),
+    ],
+)
+def test_analyze_invalid_parameters(engine: Engine, params: str):
+    assert engine.execute(f"analyze {params}").startswith("err ")
+
+
+def test_mcts_reuses_subtree_after_moves():
+    game = Game()
+    game.load_game(_GAMESTRING)
+    mcts = MctsSearch(seed=0)
+
+    result = mcts.search(game, SearchLimits(depth=40))
+    game.push(result.move)
+    mcts.search(game, SearchLimits(depth=0))
+
+    assert mcts._root is not None
+    assert mcts._root.move == result.move
+    assert mcts._root.visits > 0
+
+
+@pytest.mark.parametrize("parallelism", ["Tree", "Root"])
+def test_bestmove_parallel_mcts_returns_valid_move(engine: Engine, parallelism: str):
+    engine.execute("options set SearchMode MCTS")
+    engine.execute("options set SearchProcesses 2")
+    engine.execute(f"options set MctsParallelism {parallelism}")
+    engine.execute(f"newgame {_GAMESTRING}")
+
+    move, ok = engine.execute("bestmove depth 40").splitlines()
+
+    assert ok == "ok"
+    assert not engine.execute(f"play {move}").startswith("err ")
+    assert engine.last_search is not None
+    assert engine.last_search.nodes == 40
+
+
+@pytest.mark.parametrize("parallelism", ["Tree", "Root"])
+def test_parallel_mcts_survives_worker_killed_mid_search(parallelism: str):
+    game = Game()
+    game.load_game(_GAMESTRING)
+    search = ParallelMctsSearch(processes=2, parallelism=parallelism, seed=0)
+    killer = threading.Timer(0.2, search._pool.workers[1].kill)
+
+    try:
+        killer.start()
+        result = search.search(game, SearchLimits(time=1.0))
+        assert not search._pool.workers[1].is_alive()
+        # The next search runs on the remaining worker.
+        next_result = search.search(game, SearchLimits(time=0.2))
+    finally:
+        killer.cancel()
+        search.close()
+
+    assert result.nodes > 0 and next_result.nodes > 0
+    game.push(result.move)
+
+
+def test_virtual_loss_steers_selection_to_other_child():
+    game = Game()
+    game.load_game(_GAMESTRING)
+    mcts = MctsSearch(selection="PUCT", seed=0)
+    root = mcts.root(game)
+    first, depth = mcts.descend(game, root)
+    game.undo(depth)
+    add_visit(first)
+
+    second, depth = mcts.descend(game, root)
+    game.undo(depth)
+
+    assert first.parent is root
+    assert second.parent is not None and second.parent is not first
+
+
+@pytest.mark.parametrize("mode", ["AlphaBeta", "MCTS", "Random"])
+def test_bestmove_on_finished_game_fails(
+    engine: Engine, finished_game: Game, mode: str
+):
+    engine.execute(f"options set SearchMode {mode}")
+    engine.execute(f"newgame {finished_game.status}")
+
+    response = engine.execute("bestmove depth 1")
+
+    assert response.startswith("err ")
+    assert engine.last_search is None
+
+
+@pytest.mark.parametrize("mode", ["AlphaBeta", "MCTS"])
+def test_analyze_on_finished_game_fails(engine: Engine, finished_game: Game, mode: str):
+    engine.execute(f"options set SearchMode {mode}")
+    engine.execute(f"newgame {finished_game.status}")
+
+    response = engine.execute("analyze 2 depth 1")
+
+    assert response.startswith("err ")
+    assert engine.last_analysis == []
+
+
+def test_engine_runs_without_numpy():
+    # NumPy comes with the optional ml extra only.
+    code = (
+        "import sys; sys.modules['numpy'] = None; "
+        "from honeycomb.__main__ import *; from honeycomb.engine import Engine; "
+        "print(Engine().execute('bestmove depth 1'))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=pathlib.Path(__file__).parents[1],
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines()[-1] == "ok"
@@ -0,0 +1,78 @@
+import pytest
+
+from honeycomb.engine import logic
+from honeycomb.engine.game import Game
+from honeycomb.engine.mcts import MctsSearch
+from honeycomb.engine.search import SearchLimits
+
+np = pytest.importorskip("numpy")
+
+from honeycomb.engine.evaluation import EvaluationQueue  # noqa: E402
+
+_GAMESTRING = "Base;InProgress;White[3];wS1;bG1 -wS1;wA1 wS1/;bG2 /bG1"
+
+
+class _Model:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, batch):
+        self.batch_sizes.append(len(batch))
+        policy = np.ones((len(batch), 4))
+        policy[:, 0] = 3
+        return policy, np.full(len(batch), 0.5)
+
+
+@pytest.fixture
+def game() -> Game:
+    game = Game()
+    game.load_game(_GAMESTRING)
+    return game
+
+
+def test_queue_evaluates_full_batch(game: Game):
+    model = _Model()
+    queue = EvaluationQueue(model, batch_size=3)
+
+    evaluations = [queue.submit(game) for _ in range(3)]
+
+    assert model.batch_sizes == [3]
+    assert all(evaluation.done for evaluation in evaluations)
+    assert len(queue) == 0
+
+
+def test_queue_evaluates_partial_batch_after_timeout(game: Game):
+    model = _Model()
+    queue = EvaluationQueue(model, batch_size=8, timeout=0.001)
+
+    priors, value = queue.submit(game).result()
+
+    assert model.batch_sizes == [1]
+    assert priors is None
+    assert value == 0.5
+
+
+def test_queue_normalizes_policy_of_legal_moves(game: Game):
+    def move_index(game: Game, move: logic.Move) -> int:
+        return 0 if move == game.legal_moves()[0] else 1
+
+    queue = EvaluationQueue(_Model(), batch_size=1, move_index=move_index)
+
+    evaluation = queue.submit(game)
+
+    assert evaluation.priors is not None
+    assert sum(evaluation.priors) == pytest.approx(1)
+    assert evaluation.priors[0] == pytest.approx(3 * evaluation.priors[1])
+
+
+@pytest.mark.parametrize("selection", ["UCT", "PUCT"])
+def test_mcts_evaluates_leaves_in_batches(game: Game, selection: str):
+    model = _Model()
+    queue = EvaluationQueue(model, batch_size=8)
+    mcts = MctsSearch(selection=selection, seed=0, evaluator=queue)
+
+    result = mcts.search(game, SearchLimits(depth=20))
+
+    assert result.nodes == 20
+    assert model.batch_sizes == [1, 8, 8, 4]
+    game.push(result.move)
@@ -1,3 +1,4 @@
+import random
 import re
 
 import pytest
@@ -709,6 +710,51 @@ def test_undo_correctly_removes_moves(
     assert moves == result_moves
 
 
+@pytest.mark.parametrize(
+    ("gamestring", "moves"),
+    [
+        pytest.param(
+            "Base;InProgress;White[3];wS1;bG1 -wS1;wA1 wS1/;bG2 /bG1",
+            ["wQ wS1-", "bQ -bG2", "wA1 bQ\\"],
+            id="in_progress",
+        ),
+        pytest.param(
+            "Base;InProgress;Black[12];wQ;bQ -wQ;wG1 wQ-;bG1 -bQ;wG2 wG1-;bG2 -bG1;wG3 wG2-;bG3 -bG2;wS1 wG3-;bS1 -bG3;wS2 wS1-;bS2 -bS1;wB1 wS2-;bB1 -bS2;wB2 wB1-;bB2 -bB1;wA1 wB2-;bA1 -bB2;wA2 wA1-;bA2 -bA1;wA3 wA2-;bA3 -bA2;wA3 -bA3",
+            ["pass", "wA3 bA3/"],
+            id="pass",
+        ),
+    ],
+)
+def test_undo_restores_exact_position(game: Game, gamestring: str, moves: list[str]):
+    game.load_game(gamestring)
+    hash_before = game.hash
+
+    for move in moves:
+        game.play(move)
+    game.undo(len(moves))
+
+    assert game.status == gamestring
+    assert game.hash == hash_before
+    reloaded = Game()
+    reloaded.load_game(gamestring)
+    assert game.valid_moves() == reloaded.valid_moves()
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_status_of_random_game_replays_to_same_position(game: Game, seed: int):
+    rng = random.Random(seed)
+
+    for _ in range(50):
+        if _gamestate(game.status) not in ("NotStarted", "InProgress"):
+            break
+        game.push(game.sample_move(rng))
+
+        replayed = Game()
+        replayed.load_game(game.status)
+        assert replayed.hash == game.hash
+        assert replayed.valid_moves() == game.valid_moves()
+
+
 @pytest.mark.parametrize(
     ("depth", "expected_leaf_nodes"),
     [
@@ -0,0 +1,52 @@
+import pytest
+
+from honeycomb.engine.notation import (
+    PIECES_STR,
+    BasePieces,
+    InvalidMoveStringError,
+    InvalidPieceStringError,
+    MoveString,
+    PieceColor,
+    PieceString,
+)
+
+
+@pytest.mark.parametrize(
+    ("move_str", "move_str_parts"),
+    [
+        pytest.param("pass", (None,), id="pass"),
+        pytest.param("wS1", ("wS1",), id="first_move"),
+        pytest.param("bG1 -wS1", ("bG1", "-.", "wS1"), id="left_relation"),
+        pytest.param("wA1 wS1/", ("wA1", "./", "wS1"), id="right_relation"),
+        pytest.param("wB1 bQ", ("wB1", ".", "bQ"), id="on_top"),
+    ],
+)
+def test_move_string_decompose_and_build_round_trip(
+    move_str: str, move_str_parts: tuple
+):
+    assert MoveString.decompose(move_str) == move_str_parts
+    if move_str_parts[0] is not None:
+        assert MoveString.build(*move_str_parts) == move_str
+
+
+@pytest.mark.parametrize(
+    "move_str", ["", "wS4", "wS1  bG1-", "wS1 bG1|", "wS1 /bG1-", "bQ1 wS1"]
+)
+def test_move_string_decompose_invalid_raises_error(move_str: str):
+    assert not MoveString.is_valid(move_str)
+    with pytest.raises(InvalidMoveStringError):
+        MoveString.decompose(move_str)
+
+
+def test_piece_string_ids_are_unique_and_reversible():
+    assert len(set(PIECES_STR)) == len(PIECES_STR) == 28
+
+    for piece_str in PIECES_STR:
+        assert PieceString.from_id(PieceString.id(piece_str)) == piece_str
+
+
+def test_piece_string_decompose():
+    assert PieceString.decompose("wQ") == (PieceColor.WHITE, BasePieces.BEE)
+    assert PieceString.decompose("bA3") == (PieceColor.BLACK, BasePieces.ANT, 3)
+    with pytest.raises(InvalidPieceStringError):
+        PieceString.decompose("bQ1")
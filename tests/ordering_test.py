@@ -0,0 +1,64 @@
+import pytest
+
+from honeycomb.engine import hive as h
+from honeycomb.engine import logic
+from honeycomb.engine.game import Game
+from honeycomb.engine.ordering import MoveOrderer
+
+_GAMESTRING = "Base;InProgress;White[3];wQ;bQ wQ-;wB1 -wQ;bB1 bQ-"
+
+
+@pytest.fixture
+def game() -> Game:
+    game = Game()
+    game.load_game(_GAMESTRING)
+    return game
+
+
+def _is_tactical(game: Game, move: logic.Move) -> bool:
+    bee_position = game.hive.position("bQ")
+    assert bee_position is not None
+    neighbours = h.PositionsResolver.positions_around_clockwise(bee_position)
+    return (
+        move.destination in neighbours
+        and game.hive.position(move.piece_str) not in neighbours  # type: ignore
+    )
+
+
+def test_hash_move_comes_first(game: Game):
+    moves = game.legal_moves()
+    hash_move = moves[-1]
+
+    ordered = MoveOrderer().order(game, moves, 0, hash_move)
+
+    assert ordered[0] == hash_move
+
+
+def test_moves_next_to_opponent_bee_come_before_quiet_moves(game: Game):
+    ordered = MoveOrderer().order(game, game.legal_moves(), 0)
+    tactical = [_is_tactical(game, move) for move in ordered]
+
+    assert any(tactical)
+    assert tactical == sorted(tactical, reverse=True)
+
+
+def test_killer_move_comes_first_among_quiet_moves(game: Game):
+    orderer = MoveOrderer()
+    quiet = [move for move in game.legal_moves() if not _is_tactical(game, move)]
+    killer = quiet[-1]
+
+    orderer.cutoff(killer, depth=2, ply=3)
+    ordered = orderer.order(game, game.legal_moves(), 3)
+
+    assert ordered.index(killer) == sum(_is_tactical(game, move) for move in ordered)
+
+
+def test_history_is_halved_by_age(game: Game):
+    orderer = MoveOrderer()
+    move = game.legal_moves()[0]
+    orderer.cutoff(move, depth=4, ply=0)
+
+    orderer.age()
+
+    assert orderer._history == {(move.piece_str[1], move.destination): 8}
+    assert orderer._killers == []
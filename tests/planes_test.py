@@ -0,0 +1,87 @@
+import pytest
+
+from honeycomb.engine import hive as h
+from honeycomb.engine import notation
+from honeycomb.engine.game import Game
+
+np = pytest.importorskip("numpy")
+
+from honeycomb.engine import planes  # noqa: E402
+
+_STACKED_GAMESTRING = "Base;InProgress;Black[3];wQ;bQ wQ-;wB1 -wQ;bB1 bQ-;wB1 wQ"
+_AXIAL_DIRECTIONS = {(1, -1), (1, 0), (0, 1), (-1, 1), (-1, 0), (0, -1)}
+
+
+def _game(gamestring: str) -> Game:
+    game = Game()
+    game.load_game(gamestring)
+    return game
+
+
+def _plane(color: str, piece_type: str, level: int) -> int:
+    piece_type_index = [t.value for t in planes.PIECE_TYPES].index(piece_type)
+    return (
+        "wb".index(color) * len(planes.PIECE_TYPES) + piece_type_index
+    ) * planes.LEVELS + level
+
+
+@pytest.mark.parametrize("position", [(0, 0), (1, 0), (-1, 3), (2, -2), (-3, -1)])
+def test_axial_neighbours_differ_by_one_direction(position: tuple[int, int]):
+    q, r = h.axial(position)
+
+    directions = {
+        (nq - q, nr - r)
+        for nq, nr in map(
+            h.axial, h.PositionsResolver.positions_around_clockwise(position)
+        )
+    }
+
+    assert directions == _AXIAL_DIRECTIONS
+
+
+def test_to_planes_encodes_pieces_by_type_color_and_level():
+    game = _game(_STACKED_GAMESTRING)
+
+    out = game.hive.to_planes(size=7, turn_color=game.turn_color)
+
+    assert out.shape == (planes.PLANES_NUM, 7, 7)
+    assert out[: planes.BOARD_PLANES].sum() == 4
+    assert out[_plane("w", "B", 1)].sum() == 1
+    assert out[_plane("w", "Q", 0)].sum() == 1
+    assert out[_plane("w", "B", 0)].sum() == 0
+    assert out[_plane("b", "Q", 0), 3, 3] == 1
+    assert out[-1].sum() == 0
+
+
+def test_to_planes_counts_pieces_in_hand():
+    game = Game()
+    game.new_game()
+
+    out = game.hive.to_planes(size=3, turn_color=notation.PieceColor.WHITE)
+    hand = out[planes.BOARD_PLANES : -1, 0, 0]
+
+    assert hand.tolist() == [1, 2, 2, 3, 3, 0, 0, 0] * 2
+    assert out[-1].all()
+
+
+def test_to_planes_leaves_out_pieces_outside_of_the_board():
+    game = _game(_STACKED_GAMESTRING)
+
+    out = game.hive.to_planes(size=3, center=(0, 5))
+
+    assert out[: planes.BOARD_PLANES].sum() == 0
+
+
+def test_encode_many_writes_into_preallocated_buffer():
+    games = [_game(_STACKED_GAMESTRING), Game()]
+    games[1].new_game()
+    out = np.full((3, *planes.planes_shape(9)), -1, dtype=np.float32)
+
+    written = planes.encode_many(games, out)
+
+    assert written.base is out
+    assert len(written) == 2
+    for row, game in zip(written, games):
+        expected = game.hive.to_planes(size=9, turn_color=game.turn_color)
+        assert np.array_equal(row, expected)
+    assert (out[2] == -1).all()
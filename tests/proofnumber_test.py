@@ -0,0 +1,53 @@
+from honeycomb.engine import notation
+from honeycomb.engine.game import Game
+from honeycomb.engine.proofnumber import ProofNumberSearch, ProofStatus
+from tests.conftest import MATE_IN_TWO_GAMESTRING
+
+_OPENING_GAMESTRING = "Base;InProgress;White[3];wS1;bG1 -wS1;wA1 wS1/;bG2 /bG1"
+
+
+def _game(gamestring: str) -> Game:
+    game = Game()
+    game.load_game(gamestring)
+    return game
+
+
+def test_proves_mate_in_two_with_a_winning_line():
+    game = _game(MATE_IN_TWO_GAMESTRING)
+
+    result = ProofNumberSearch().solve(game, max_nodes=20000, max_plies=5)
+
+    assert result.status == ProofStatus.PROVEN
+    assert result.moves_to_win == 2
+    assert game.status == _game(MATE_IN_TWO_GAMESTRING).status
+    for move_str in result.line:
+        game.play(move_str)
+    assert game.state == notation.GameState.WhiteWins
+    assert str(result) == f"mate 2 {' '.join(result.line)}"
+
+
+def test_disproves_mate_within_the_plies():
+    result = ProofNumberSearch().solve(_game(_OPENING_GAMESTRING), max_plies=3)
+
+    assert result.status == ProofStatus.DISPROVEN
+    assert result.plies == 3
+    assert str(result) == "nomate 3"
+
+
+def test_node_budget_keeps_the_last_disproved_plies():
+    game = _game(MATE_IN_TWO_GAMESTRING)
+
+    result = ProofNumberSearch().solve(game, max_nodes=10, max_plies=5)
+
+    assert result.status == ProofStatus.DISPROVEN
+    assert result.plies == 1
+    assert result.nodes <= 10 + 2 * len(game.legal_moves())
+
+
+def test_time_limit_stops_without_an_answer():
+    game = _game(MATE_IN_TWO_GAMESTRING)
+
+    result = ProofNumberSearch().solve(game, max_plies=5, time_limit=0.0)
+
+    assert result.status == ProofStatus.UNKNOWN
+    assert str(result) == "unknown"
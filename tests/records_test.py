@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+from honeycomb import records
+from honeycomb.engine.game import Game
+
+_GAMESTRINGS = [
+    "Base;NotStarted;White[1]",
+    "Base;InProgress;White[3];wS1;bG1 -wS1;wA1 wS1/;bG2 /bG1",
+    "Base;InProgress;Black[3];wQ;bQ wQ-;wB1 -wQ;bB1 bQ-;wB1 wQ",
+]
+
+
+def _random_game(seed: int) -> Game:
+    rng = random.Random(seed)
+    game = Game()
+    game.new_game()
+    while not game.is_over and game.turn_num < 50:
+        game.push(game.sample_move(rng))
+    return game
+
+
+@pytest.mark.parametrize("gamestring", _GAMESTRINGS)
+def test_gamestring_roundtrip(tmp_path, gamestring: str):
+    path = tmp_path / "games.hgr"
+    with records.RecordWriter(path) as writer:
+        writer.write_gamestring(gamestring)
+
+    with records.RecordReader(path) as reader:
+        (record,) = list(reader)
+        assert record.to_gamestring() == gamestring
+
+
+def test_writer_appends_to_existing_file(tmp_path):
+    path = tmp_path / "games.hgr"
+    games = [_random_game(seed) for seed in range(5)]
+
+    for game in games:
+        with records.RecordWriter(path) as writer:
+            writer.write(game)
+
+    with records.RecordReader(path) as reader:
+        assert len(reader) == 5
+        assert reader[3].to_gamestring() == games[3].status
+        for record, game in zip(reader, games):
+            assert list(record.moves()) == game.moves
+            assert record.state == game.state
+            assert len(record) == len(game.moves)
+
+
+def test_record_is_smaller_than_gamestring():
+    game = _random_game(0)
+
+    assert len(records.encode_game(game)) * 2 < len(game.status)
+
+
+def test_text_and_record_files_convert_both_ways(tmp_path):
+    text_path = tmp_path / "games.txt"
+    text_path.write_text("\n".join(_GAMESTRINGS) + "\n")
+
+    records.text_to_records(text_path, tmp_path / "games.hgr")
+    records.records_to_text(tmp_path / "games.hgr", tmp_path / "back.txt")
+
+    assert (tmp_path / "back.txt").read_text() == text_path.read_text()
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "games.txt"
+    path.write_text(_GAMESTRINGS[0])
+
+    with pytest.raises(records.RecordFormatError):
+        records.RecordReader(path)
+
+
+def test_reader_rejects_empty_file(tmp_path):
+    path = tmp_path / "games.hgr"
+    path.write_bytes(b"")
+
+    with pytest.raises(records.RecordFormatError):
+        records.RecordReader(path)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param(records.MAGIC + b"\x00\x01", id="header"),
+        pytest.param(records.MAGIC + b"\x00\x01\x02\x00" + bytes(3), id="moves"),
+    ],
+)
+@pytest.mark.parametrize(
+    "read", [pytest.param(len, id="len"), pytest.param(list, id="iter")]
+)
+def test_reader_rejects_truncated_file(tmp_path, content: bytes, read):
+    path = tmp_path / "games.hgr"
+    path.write_bytes(content)
+
+    with records.RecordReader(path) as reader, pytest.raises(records.RecordFormatError):
+        read(reader)
@@ -0,0 +1,133 @@
+import multiprocessing
+import random
+
+import pytest
+
+from honeycomb.engine.game import Game
+
+np = pytest.importorskip("numpy")
+
+from honeycomb.engine import planes  # noqa: E402
+from honeycomb.engine.actions import action_space  # noqa: E402
+from honeycomb.replay import ReplayBuffer  # noqa: E402
+
+_SIZE = 7
+
+
+def _games(number: int, seed: int = 0) -> list[Game]:
+    rng = random.Random(seed)
+    game = Game()
+    game.new_game()
+    games = []
+    for _ in range(number):
+        game.push(game.sample_move(rng))
+        games.append(Game())
+        games[-1].load_game(game.status)
+    return games
+
+
+def _policy() -> np.ndarray:
+    return np.full(len(action_space(_SIZE)), 0.5, dtype=np.float32)
+
+
+def _append_games(directory: str, lock, seed: int) -> None:
+    buffer = ReplayBuffer(directory, capacity=64, size=_SIZE, lock=lock)
+    for game in _games(8, seed):
+        buffer.append(game, _policy(), seed)
+    buffer.flush()
+
+
+def test_append_stores_encoded_position_and_targets(tmp_path):
+    buffer = ReplayBuffer(tmp_path, capacity=4, size=_SIZE)
+    game = _games(3)[-1]
+
+    slot = buffer.append(game, _policy(), -1.0)
+
+    assert len(buffer) == 1
+    expected = game.hive.to_planes(size=_SIZE, turn_color=game.turn_color)
+    assert np.array_equal(buffer.positions[slot], expected)
+    assert buffer.masks[slot].sum() == game.count_moves()
+    assert buffer.values[slot] == -1.0
+
+
+def test_ring_overwrites_oldest_positions(tmp_path):
+    buffer = ReplayBuffer(tmp_path, capacity=4, size=_SIZE)
+
+    slots = [buffer.append(game, _policy(), i) for i, game in enumerate(_games(6))]
+
+    assert slots == [0, 1, 2, 3, 0, 1]
+    assert len(buffer) == 4
+    assert buffer.total == 6
+    assert buffer.values.tolist() == [4, 5, 2, 3]
+
+
+def test_sample_fills_preallocated_batch(tmp_path):
+    buffer = ReplayBuffer(tmp_path, capacity=8, size=_SIZE)
+    for i, game in enumerate(_games(5)):
+        buffer.append(game, _policy(), i)
+    out = (
+        np.zeros((16, *planes.planes_shape(_SIZE)), dtype=np.uint8),
+        np.zeros((16, len(action_space(_SIZE))), dtype=bool),
+        np.zeros((16, len(action_space(_SIZE))), dtype=np.float32),
+        np.zeros(16, dtype=np.float32),
+    )
+
+    positions, masks, policies, values = buffer.sample(
+        16, np.random.default_rng(0), out
+    )
+
+    assert positions is out[0]
+    assert set(values.tolist()) <= {0, 1, 2, 3, 4}
+    assert masks.any(axis=1).all()
+
+
+def _start_append(buffer: ReplayBuffer) -> int:
+    """Reserves the next slot like an append whose writer dies before the rows."""
+    slot = buffer.total % buffer.capacity
+    buffer._meta[0] += 1
+    buffer._versions[slot] += 1
+    return slot
+
+
+def test_sample_skips_slots_being_written(tmp_path):
+    buffer = ReplayBuffer(tmp_path, capacity=4, size=_SIZE)
+    for i, game in enumerate(_games(4)):
+        buffer.append(game, _policy(), i)
+    _start_append(buffer)
+
+    *_, values = buffer.sample(64, np.random.default_rng(0))
+
+    # The reserved slot 0 still holds the value 0 of the overwritten position.
+    assert set(values.tolist()) == {1, 2, 3}
+
+
+def test_sample_from_slots_never_written_raises(tmp_path):
+    buffer = ReplayBuffer(tmp_path, capacity=4, size=_SIZE)
+    _start_append(buffer)
+
+    with pytest.raises(RuntimeError):
+        buffer.sample(1, np.random.default_rng(0))
+
+
+def test_processes_append_to_shared_buffer(tmp_path):
+    ReplayBuffer(tmp_path, capacity=64, size=_SIZE)
+    lock = multiprocessing.Lock()
+    processes = [
+        multiprocessing.Process(target=_append_games, args=(str(tmp_path), lock, seed))
+        for seed in range(3)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    buffer = ReplayBuffer(tmp_path, capacity=64, size=_SIZE)
+    assert len(buffer) == 24
+    assert sorted(buffer.values[:24].tolist()) == [0] * 8 + [1] * 8 + [2] * 8
+
+
+def test_reopening_with_other_capacity_fails(tmp_path):
+    ReplayBuffer(tmp_path, capacity=4, size=_SIZE)
+
+    with pytest.raises(ValueError):
+        ReplayBuffer(tmp_path, capacity=8, size=_SIZE)
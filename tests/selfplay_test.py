@@ -0,0 +1,60 @@
+import pytest
+
+from honeycomb import records, selfplay
+from honeycomb.__main__ import main
+from honeycomb.engine.game import Game
+from honeycomb.engine.search import SearchLimits
+
+
+def _shard_games(path) -> list[Game]:
+    games = []
+    with open(path) as shard:
+        for line in shard:
+            game = Game()
+            game.load_game(line.strip())
+            games.append(game)
+    return games
+
+
+@pytest.mark.parametrize(
+    ("policy", "limits"),
+    [
+        pytest.param("random", None, id="random"),
+        pytest.param("mcts", SearchLimits(depth=5), id="mcts"),
+        pytest.param("alphabeta", SearchLimits(depth=1), id="alphabeta"),
+    ],
+)
+def test_selfplay_writes_games_to_worker_shards(tmp_path, policy, limits):
+    stats = selfplay.selfplay(
+        str(tmp_path),
+        games=2,
+        workers=2,
+        policy=policy,
+        limits=limits,
+        max_turns=10,
+        seed=0,
+    )
+
+    assert stats.games == 4
+    assert len(stats.shards) == 2
+    games = [game for shard in stats.shards for game in _shard_games(shard)]
+    assert len(games) == 4
+    assert stats.moves == sum(len(game.moves) for game in games)
+    assert all(game.is_over or game.turn_num == 11 for game in games)
+
+
+def test_selfplay_command_reports_games_per_second(tmp_path, capsys):
+    main(["selfplay", str(tmp_path), "-n", "1", "-w", "1", "--max-turns", "3"])
+
+    assert "games/s" in capsys.readouterr().err
+    assert len(_shard_games(tmp_path / "games-000.txt")) == 1
+
+
+def test_selfplay_writes_binary_records(tmp_path):
+    stats = selfplay.selfplay(
+        str(tmp_path), games=2, workers=1, max_turns=5, fmt="binary", seed=0
+    )
+
+    with records.RecordReader(stats.shards[0]) as reader:
+        assert len(reader) == 2
+        assert sum(len(record) for record in reader) == stats.moves
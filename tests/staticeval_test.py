@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from honeycomb.engine import logic, staticeval
+from honeycomb.engine.game import Game
+
+_GAMESTRING = "Base;InProgress;White[3];wQ;bQ wQ-;wB1 -wQ;bB1 bQ-"
+
+
+def _random_games(seed: int, games: int = 5, turns: int = 30):
+    """Yields the positions of random games, taking back some of the moves."""
+    rng = random.Random(seed)
+    for _ in range(games):
+        game = Game()
+        game.new_game()
+        while not game.is_over and game.turn_num <= turns:
+            game.push(game.sample_move(rng), validate=False)
+            if rng.random() < 0.2:
+                game.undo(1)
+            yield game
+
+
+def _fresh_values(game: Game) -> list[tuple[int, ...]]:
+    attached = game.hive.accumulator
+    fresh = staticeval.FeatureAccumulator(game.hive)
+    game.hive.attach(attached)  # type: ignore
+    return [fresh.values(color) for color in staticeval.COLORS]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_incremental_features_match_recomputed_ones(seed: int):
+    for game in _random_games(seed):
+        accumulator = staticeval.accumulator(game.hive)
+
+        values = [accumulator.values(color) for color in staticeval.COLORS]
+
+        assert values == _fresh_values(game)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_pinned_count_covers_pieces_that_cannot_leave_the_hive(seed: int):
+    for game in _random_games(seed):
+        if len(game.hive.positions()) < 2:
+            continue
+        provider = logic.MovesProvider(game.hive)
+        accumulator = staticeval.accumulator(game.hive)
+        for color in staticeval.COLORS:
+            pinned = sum(
+                piece.piece_above is not None or provider.is_onehive_broken(piece)
+                for piece in game.hive.pieces(color)
+            )
+
+            assert accumulator.values(color)[1] >= pinned
+
+
+def test_features_are_from_the_view_of_the_side_to_move():
+    game = Game()
+    game.load_game(_GAMESTRING)
+    accumulator = staticeval.accumulator(game.hive)
+    white, black = staticeval.COLORS
+
+    features = staticeval.features(game)
+
+    assert features == accumulator.features(white)
+    assert features == tuple(-f for f in accumulator.features(black))
+
+
+def test_evaluator_weights_the_features():
+    game = Game()
+    game.load_game(_GAMESTRING)
+    game.play("wB1 wQ")
+    evaluator = staticeval.StaticEvaluator(
+        {name: 0.0 for name in staticeval.FEATURES} | {"beetle_on_bee": 7.0}
+    )
+
+    # Black is to move and the white bee is covered.
+    assert staticeval.features(game)[3] == -1
+    assert evaluator.evaluate(game) == -7
+
+
+def test_weights_file_round_trip(tmp_path):
+    path = tmp_path / "weights.json"
+    weights = {"bee_liberties": 80.0, "mobility": 12.5}
+
+    staticeval.save_weights(weights, path)
+
+    assert staticeval.load_weights(path) == weights
+    assert staticeval.StaticEvaluator(weights).weights["pinned"] == (
+        staticeval.DEFAULT_WEIGHTS["pinned"]
+    )
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param('{"queen": 1}', id="unknown_feature"),
+        pytest.param('{"mobility": "high"}', id="not_a_number"),
+        pytest.param("[1, 2]", id="not_an_object"),
+    ],
+)
+def test_invalid_weights_file_raises(tmp_path, content: str):
+    path = tmp_path / "weights.json"
+    path.write_text(content)
+
+    with pytest.raises(ValueError):
+        staticeval.load_weights(path)
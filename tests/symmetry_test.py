@@ -0,0 +1,96 @@
+import itertools
+
+import pytest
+
+from honeycomb.engine import symmetry
+from honeycomb.engine.game import Game
+from tests.conftest import MATE_IN_TWO_GAMESTRING
+
+_SYMMETRIES = [
+    pytest.param(
+        rotation, reflected, id=f"{rotation}-{'mirrored' if reflected else 'plain'}"
+    )
+    for rotation, reflected in itertools.product(
+        range(symmetry.ROTATIONS), (False, True)
+    )
+]
+
+
+@pytest.fixture
+def game() -> Game:
+    game = Game()
+    game.load_game(MATE_IN_TWO_GAMESTRING)
+    return game
+
+
+def _transformed(game: Game, transform: symmetry.Transform) -> Game:
+    transformed = Game()
+    for move in game.moves:
+        transformed.push(transform.move(move))
+    return transformed
+
+
+@pytest.mark.parametrize("rotation, reflected", _SYMMETRIES)
+def test_symmetric_games_have_the_same_fingerprint(
+    game: Game, rotation: int, reflected: bool
+):
+    # The first piece stays at the origin, so every symmetric game is legal.
+    transformed = _transformed(game, symmetry.Transform(rotation, reflected))
+
+    key, transform = symmetry.canonical(game)
+    transformed_key, transformed_transform = symmetry.canonical(transformed)
+
+    assert transformed_key == key
+    assert {
+        (piece.piece_str, transform.position(piece.position))
+        for piece in game.hive.pieces()
+    } == {
+        (piece.piece_str, transformed_transform.position(piece.position))
+        for piece in transformed.hive.pieces()
+    }
+
+
+def test_fingerprint_tells_positions_apart(game: Game):
+    keys = set()
+    hashes = set()
+    while game.moves:
+        keys.add(symmetry.canonical(game)[0])
+        hashes.add(game.hash)
+        game.undo(1)
+
+    assert len(keys) == len(hashes)
+
+
+def test_fingerprint_is_the_hash_of_the_canonical_placement():
+    game = Game()
+    assert symmetry.canonical(game) == (game.hash, symmetry.Transform())
+
+    # A lone piece is its own canonical form at the origin.
+    game.play("wG1")
+    key, transforms = symmetry.canonical_transforms(game)
+    assert key == game.hash
+    assert len(transforms) == 2 * symmetry.ROTATIONS
+
+
+def test_canonical_move_is_the_same_for_symmetric_moves():
+    game = Game()
+    game.play("wG1")
+    _, transforms = symmetry.canonical_transforms(game)
+
+    moves = list(game.legal_moves())
+    assert len(moves) == 6 * len({move.piece_str for move in moves})
+    canonical_moves = {symmetry.canonical_move(transforms, move) for move in moves}
+    assert len(canonical_moves) == len({move.piece_str for move in moves})
+
+
+@pytest.mark.parametrize("rotation, reflected", _SYMMETRIES)
+@pytest.mark.parametrize("translation", [(0, 0), (3, -2), (-5, 1)])
+def test_inverse_maps_positions_back(
+    rotation: int, reflected: bool, translation: tuple[int, int]
+):
+    transform = symmetry.Transform(rotation, reflected, translation)
+    inverse = transform.inverse()
+
+    for position in [(0, 0), (1, 2), (-3, 5), (4, -1), (-2, -7)]:
+        assert inverse.position(transform.position(position)) == position
+        assert transform.position(inverse.position(position)) == position
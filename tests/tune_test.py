@@ -0,0 +1,91 @@
+import pytest
+
+from honeycomb import records
+from honeycomb.engine import staticeval
+from honeycomb.engine.game import Game
+from tests.conftest import MATE_IN_TWO_GAMESTRING
+
+np = pytest.importorskip("numpy")
+tune = pytest.importorskip("honeycomb.tune")
+
+
+@pytest.fixture
+def corpus(write_corpus):
+    return write_corpus(1)
+
+
+def test_extract_samples_positions_of_finished_games(corpus, finished_game: Game):
+    features, targets = tune.extract(
+        tune.read_corpus([corpus]), sample=1.0, skip_plies=0, workers=1
+    )
+
+    plies = len(finished_game.moves)
+    assert features.shape == (plies, len(staticeval.FEATURES))
+    assert features.dtype == np.float32
+    # White moves first and wins.
+    assert targets.tolist() == [1.0, 0.0] * (plies // 2) + [1.0] * (plies % 2)
+    finished_game.undo(1)
+    assert tuple(features[-1]) == staticeval.features(finished_game)
+
+
+def test_records_give_the_same_rows_as_gamestrings(tmp_path, corpus, finished_game):
+    record_path = tmp_path / "games.hgr"
+    records.text_to_records(corpus, record_path)
+
+    text_rows = tune.extract(tune.read_corpus([corpus]), skip_plies=4, workers=1)
+    record_rows = tune.extract(tune.read_corpus([record_path]), skip_plies=4, workers=1)
+
+    for text, record in zip(text_rows, record_rows):
+        assert np.array_equal(text, record)
+
+
+def test_unique_merges_the_positions_of_repeated_games(write_corpus, finished_game):
+    path = write_corpus(3)
+
+    features, targets = tune.extract(
+        tune.read_corpus([path]), sample=1.0, skip_plies=0, workers=1
+    )
+    unique_features, unique_targets = tune.extract(
+        tune.read_corpus([path]), sample=1.0, skip_plies=0, workers=1, unique=True
+    )
+
+    plies = len(finished_game.moves)
+    assert len(targets) == 3 * plies
+    assert np.array_equal(unique_features, features[:plies])
+    assert np.array_equal(unique_targets, targets[:plies])
+
+
+def test_fit_recovers_the_weights_of_the_results():
+    rng = np.random.default_rng(0)
+    features = rng.integers(-6, 7, size=(20000, 3)).astype(np.float32)
+    true_weights = np.array([100.0, -40.0, 10.0])
+    probabilities = 1 / (1 + np.exp(-features @ true_weights / 200))
+    targets = (rng.random(20000) < probabilities).astype(np.float32)
+
+    weights = tune.fit(features, targets, np.zeros(3), scale=200, epochs=800)
+
+    assert np.allclose(weights, true_weights, rtol=0.15, atol=5)
+    assert tune.fit_scale(features, targets, true_weights) == pytest.approx(
+        200, rel=0.15
+    )
+    assert tune.loss(features, targets, weights, 200) < tune.loss(
+        features, targets, np.zeros(3), 200
+    )
+
+
+def test_tune_writes_weights_the_engine_loads(tmp_path, corpus):
+    output = tmp_path / "weights.json"
+
+    result = tune.tune([corpus], output, sample=1.0, epochs=10, workers=1)
+
+    assert result.positions > 0
+    assert staticeval.load_weights(output) == result.weights
+    assert set(result.weights) == set(staticeval.FEATURES)
+
+
+def test_tune_without_finished_games_raises(tmp_path):
+    path = tmp_path / "games.txt"
+    path.write_text(MATE_IN_TWO_GAMESTRING + "\n")
+
+    with pytest.raises(ValueError):
+        tune.tune([path], workers=1)